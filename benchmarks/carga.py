@@ -0,0 +1,345 @@
+"""
+Prueba de carga con varios escritores simultáneos
+
+Uso:
+    python -m benchmarks.carga                                  # copia de asignaciones.db
+    python -m benchmarks.carga --procesos 3 --hilos 4 --duracion 20
+    python -m benchmarks.carga --modo directo --journal delete --espera 0.1
+    python -m benchmarks.carga --modo escritor --max-lote 1     # sin group commit
+    python -m benchmarks.carga --sintetico mediano --salida carga.json
+
+Cada proceso simula una persona con la aplicación abierta y cada hilo una
+ventana que escribe sin parar (o con --pausa entre operaciones) durante la
+duración indicada. Las operaciones son las de la interfaz: guardar una
+asignación, editar una celda, desactivar a alguien y reiniciar la lista. Se
+trabaja siempre sobre una copia de la BD (la original no se toca).
+
+Perillas:
+    --modo escritor   las escrituras de cada proceso pasan por el EscritorUnico
+                      (--max-lote pedidos por transacción; 1 = sin agrupar)
+    --modo directo    cada escritura abre su propia conexión y transacción
+    --journal         wal o delete (el escritor único siempre activa WAL)
+    --espera          busy timeout en segundos antes de "database is locked"
+
+Se informa, por operación y en total: operaciones por segundo, latencia
+p50/p99 y errores de lock (el resto de los errores se cuenta aparte).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from src.config import settings
+from src.database.escritor import EscritorUnico
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.database.repositories.persona_repository import PersonaRepository
+from src.models.persona import TipoPersona
+from src.services.acomodador_service import AcomodadorService
+from src.services.asignacion_service import AsignacionService
+from src.services.fecha_service import FechaService
+from src.services.vigilancia_service import VigilanciaService
+
+OPERACIONES = ("guardar", "actualizar", "desactivar", "reiniciar")
+
+# Proporción de cada operación (parecida al uso real: se guarda y edita mucho más de lo que se reinicia)
+MEZCLA = {"guardar": 4, "actualizar": 4, "desactivar": 1, "reiniciar": 1}
+
+LOCK = "lock"
+OTRO = "otro"
+
+@dataclass
+class Escenario:
+    """Configuración de una corrida"""
+    db_path: str
+    procesos: int = 1
+    hilos: int = 4
+    duracion: float = 5.0
+    modo: str = "escritor"
+    max_lote: int = EscritorUnico.MAX_LOTE
+    journal: str = "wal"
+    espera: float = settings.DB_ESPERA
+    pausa_ms: float = 0.0
+    mezcla: Dict[str, int] = field(default_factory=lambda: dict(MEZCLA))
+
+@dataclass
+class Medicion:
+    """Resultados crudos de un proceso"""
+    segundos: float = 0.0
+    # (operacion, ms, error): error es None, LOCK u OTRO
+    registros: List[Tuple[str, float, Optional[str]]] = field(default_factory=list)
+    escrituras: int = 0
+    confirmaciones: int = 0
+    errores: Dict[str, str] = field(default_factory=dict)
+
+def _tipo_error(error: BaseException) -> str:
+    texto = str(error).lower()
+    return LOCK if "locked" in texto or "busy" in texto else OTRO
+
+class _Carga:
+    """Las operaciones de un proceso, con sus servicios y repositorios"""
+    
+    def __init__(self, escenario: Escenario, rng: random.Random):
+        self.escenario = escenario
+        self.rng = rng
+        # Todos los hilos del proceso comparten el escritor, como las ventanas de la aplicación
+        self.escritor = None
+        if escenario.modo == "escritor":
+            self.escritor = EscritorUnico(escenario.db_path, escenario.max_lote, escenario.espera)
+        personas = PersonaRepository(escenario.db_path, self.escritor)
+        self.asignaciones = AsignacionRepository(escenario.db_path, self.escritor)
+        self.acomodador_service = AcomodadorService(personas)
+        self.vigilancia_service = VigilanciaService(personas)
+        self.asignacion_service = AsignacionService(self.asignaciones)
+        
+        # Las lecturas se hacen una vez: se mide la contención de las escrituras
+        self.acomodadores = personas.obtener_todos(TipoPersona.ACOMODADOR, incluir_inactivos=True)
+        self.vigilantes = personas.obtener_todos(TipoPersona.VIGILANTE, incluir_inactivos=True)
+        if len(self.acomodadores) < 5 or len(self.vigilantes) < 3:
+            raise ValueError("La BD necesita al menos 5 acomodadores y 3 vigilantes")
+        with sqlite3.connect(escenario.db_path) as conn:
+            self.ids_asignaciones = [fila[0] for fila in conn.execute("SELECT id FROM asignaciones")]
+        self.semanas = FechaService().generar_semanas(date(2030, 1, 6), 52)
+    
+    def guardar(self):
+        rng = self.rng
+        asignacion = self.asignacion_service.crear_asignacion(
+            rng.choice(self.semanas),
+            rng.sample(self.acomodadores, 5),
+            rng.sample(self.vigilantes, 3),
+            rng.choice(("entre_semana", "fin_semana"))
+        )
+        exito, mensaje = self.asignacion_service.guardar_asignacion(asignacion)
+        if not exito:
+            # El servicio no propaga el error: lo devuelve como mensaje
+            raise sqlite3.OperationalError(mensaje)
+    
+    def actualizar(self):
+        if not self.ids_asignaciones:
+            return self.guardar()
+        columna = self.rng.choice(self.asignaciones.COLUMNAS_PERSONAS)
+        self.asignaciones.actualizar(
+            self.rng.choice(self.ids_asignaciones), columna, str(self.rng.choice(self.acomodadores))
+        )
+    
+    def desactivar(self):
+        if self.rng.random() < 0.5:
+            self.acomodador_service.desactivar_acomodador(self.rng.choice(self.acomodadores).id)
+        else:
+            self.vigilancia_service.remover_vigilante_de_grupo(self.rng.choice(self.vigilantes).id)
+    
+    def reiniciar(self):
+        # Los servicios releen la lista después de reactivar, como la interfaz
+        if self.rng.random() < 0.5:
+            self.acomodador_service.reiniciar_todos()
+        else:
+            self.vigilancia_service.reiniciar_todos()
+
+def _correr_proceso(escenario: Escenario, semilla: int) -> Medicion:
+    """Corre los hilos de un proceso hasta que se cumple la duración"""
+    settings.DB_ESPERA = escenario.espera
+    carga = _Carga(escenario, random.Random(semilla))
+    medicion = Medicion()
+    nombres = list(escenario.mezcla)
+    pesos = [escenario.mezcla[nombre] for nombre in nombres]
+    operaciones: Dict[str, Callable[[], object]] = {nombre: getattr(carga, nombre) for nombre in nombres}
+    lock = threading.Lock()
+    
+    def hilo(numero: int):
+        rng = random.Random(semilla * 1000 + numero)
+        registros = []
+        fin = time.perf_counter() + escenario.duracion
+        while time.perf_counter() < fin:
+            nombre = rng.choices(nombres, pesos)[0]
+            inicio = time.perf_counter()
+            error = None
+            try:
+                operaciones[nombre]()
+            except Exception as e:
+                error = _tipo_error(e)
+                with lock:
+                    medicion.errores.setdefault(error, f"{type(e).__name__}: {e}")
+            registros.append((nombre, (time.perf_counter() - inicio) * 1000, error))
+            if escenario.pausa_ms:
+                time.sleep(rng.uniform(0, 2 * escenario.pausa_ms) / 1000)
+        with lock:
+            medicion.registros.extend(registros)
+    
+    hilos = [threading.Thread(target=hilo, args=(i,)) for i in range(escenario.hilos)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    if carga.escritor is not None:
+        carga.escritor.cerrar()
+        medicion.escrituras = carga.escritor.escrituras
+        medicion.confirmaciones = carga.escritor.confirmaciones
+    medicion.segundos = time.perf_counter() - inicio
+    return medicion
+
+def _percentil(valores: List[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    return valores[min(int(len(valores) * p), len(valores) - 1)]
+
+def resumir(mediciones: List[Medicion]) -> dict:
+    """
+    Junta las mediciones de todos los procesos
+    Returns: {"operaciones": {nombre: estadisticas}, "total": estadisticas, "confirmaciones", ...}
+    """
+    segundos = max((m.segundos for m in mediciones), default=0.0) or 1.0
+    por_operacion: Dict[str, list] = {}
+    for medicion in mediciones:
+        for registro in medicion.registros:
+            por_operacion.setdefault(registro[0], []).append(registro)
+    
+    def estadisticas(registros: list) -> dict:
+        correctas = sorted(ms for _, ms, error in registros if error is None)
+        return {
+            "operaciones": len(registros),
+            "por_segundo": round(len(correctas) / segundos, 1),
+            "p50_ms": round(_percentil(correctas, 0.50), 2),
+            "p99_ms": round(_percentil(correctas, 0.99), 2),
+            "max_ms": round(correctas[-1], 2) if correctas else 0.0,
+            "errores_lock": sum(1 for _, _, error in registros if error == LOCK),
+            "otros_errores": sum(1 for _, _, error in registros if error == OTRO),
+        }
+    
+    errores: Dict[str, str] = {}
+    for medicion in mediciones:
+        for tipo, ejemplo in medicion.errores.items():
+            errores.setdefault(tipo, ejemplo)
+    return {
+        "segundos": round(segundos, 2),
+        "operaciones": {nombre: estadisticas(por_operacion[nombre])
+                        for nombre in OPERACIONES if nombre in por_operacion},
+        "total": estadisticas([r for registros in por_operacion.values() for r in registros]),
+        "escrituras_por_commit": round(
+            sum(m.escrituras for m in mediciones) / max(sum(m.confirmaciones for m in mediciones), 1), 1
+        ),
+        "ejemplos_error": errores,
+    }
+
+def preparar_copia(origen: Optional[str], carpeta: str, journal: str,
+                   sintetico: Optional[str] = None) -> str:
+    """
+    Crea la BD de la prueba en `carpeta`
+    Args:
+        origen: BD a copiar (con la API de respaldo de SQLite)
+        journal: Modo de journal de la copia ("wal" o "delete")
+        sintetico: En vez de copiar, genera una congregación de este tamaño
+    Returns:
+        Ruta de la copia
+    """
+    destino = os.path.join(carpeta, "carga.db")
+    if sintetico:
+        from benchmarks.datos_sinteticos import TAMANOS, crear_congregacion
+        contexto = crear_congregacion(destino, TAMANOS[sintetico])
+        contexto.escritor.cerrar()
+    else:
+        if not os.path.exists(origen):
+            raise FileNotFoundError(f"No existe la BD {origen}")
+        with sqlite3.connect(origen) as fuente, sqlite3.connect(destino) as copia:
+            fuente.backup(copia)
+    with sqlite3.connect(destino) as conn:
+        conn.execute(f"PRAGMA journal_mode={journal}")
+    return destino
+
+def ejecutar(escenario: Escenario) -> dict:
+    """Corre el escenario (un proceso o varios) y devuelve el resumen"""
+    semillas = range(1, escenario.procesos + 1)
+    if escenario.procesos == 1:
+        mediciones = [_correr_proceso(escenario, 1)]
+    else:
+        with multiprocessing.Pool(escenario.procesos) as pool:
+            mediciones = pool.starmap(_correr_proceso, [(escenario, s) for s in semillas])
+    resumen = resumir(mediciones)
+    configuracion = asdict(escenario)
+    del configuracion["db_path"]
+    resumen["escenario"] = configuracion
+    resumen["fecha"] = datetime.now().isoformat(timespec="seconds")
+    return resumen
+
+def imprimir(resumen: dict):
+    e = resumen["escenario"]
+    modo = f"escritor (lote {e['max_lote']})" if e["modo"] == "escritor" else "directo"
+    print(f"{e['procesos']} procesos x {e['hilos']} hilos, modo {modo}, journal {e['journal']}, "
+          f"espera {e['espera']} s, {resumen['segundos']} s")
+    print(f"  {'operación':<12} {'ops':>7} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'máx ms':>8} {'lock':>6} {'otros':>6}")
+    filas = list(resumen["operaciones"].items()) + [("total", resumen["total"])]
+    for nombre, est in filas:
+        print(f"  {nombre:<12} {est['operaciones']:7} {est['por_segundo']:8.1f} {est['p50_ms']:8.2f} "
+              f"{est['p99_ms']:8.2f} {est['max_ms']:8.2f} {est['errores_lock']:6} {est['otros_errores']:6}")
+    if e["modo"] == "escritor":
+        print(f"  Escrituras por commit: {resumen['escrituras_por_commit']}")
+    for tipo, ejemplo in resumen["ejemplos_error"].items():
+        print(f"  Ejemplo de error ({tipo}): {ejemplo}")
+
+def _mezcla(texto: str) -> Dict[str, int]:
+    """Convierte 'guardar=4,actualizar=1' a dict (para argparse)"""
+    mezcla = {}
+    try:
+        for parte in texto.split(","):
+            nombre, peso = parte.split("=")
+            mezcla[nombre.strip()] = int(peso)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Mezcla inválida: '{texto}' (formato guardar=4,actualizar=1)")
+    desconocidas = set(mezcla) - set(OPERACIONES)
+    if desconocidas:
+        raise argparse.ArgumentTypeError(f"Operaciones desconocidas: {', '.join(sorted(desconocidas))}")
+    return mezcla
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.carga", description=__doc__.split("\n")[1])
+    parser.add_argument("--db", default=settings.DB_PATH, help="BD a copiar (default: %(default)s)")
+    parser.add_argument("--sintetico", choices=["chico", "mediano", "grande"], default=None,
+                        help="Usa una congregación sintética en vez de copiar --db")
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--hilos", type=int, default=4, help="Hilos por proceso")
+    parser.add_argument("--duracion", type=float, default=5.0, help="Segundos de carga")
+    parser.add_argument("--modo", choices=["escritor", "directo"], default="escritor")
+    parser.add_argument("--max-lote", type=int, default=EscritorUnico.MAX_LOTE,
+                        help="Pedidos por transacción del escritor (default: %(default)s)")
+    parser.add_argument("--journal", choices=["wal", "delete"], default="wal")
+    parser.add_argument("--espera", type=float, default=settings.DB_ESPERA,
+                        help="Busy timeout en segundos (default: %(default)s)")
+    parser.add_argument("--pausa", type=float, default=0.0, metavar="MS",
+                        help="Pausa promedio entre operaciones de cada hilo")
+    parser.add_argument("--mezcla", type=_mezcla, default=dict(MEZCLA),
+                        help="Peso de cada operación, p.ej. guardar=4,actualizar=4,desactivar=1,reiniciar=1")
+    parser.add_argument("--salida", default=None, help="Guarda el resumen en este JSON")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as carpeta:
+        try:
+            db_path = preparar_copia(args.db, carpeta, args.journal, args.sintetico)
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        try:
+            resumen = ejecutar(Escenario(
+                db_path, args.procesos, args.hilos, args.duracion, args.modo, args.max_lote,
+                args.journal, args.espera, args.pausa, args.mezcla
+            ))
+        except ValueError as e:
+            # P.ej. la BD por defecto vacía: la congregación sintética trae plantel de sobra
+            print(f"Error: {e} ({args.db}). Pruebe con --sintetico chico "
+                  f"(congregación de benchmarks.datos_sinteticos)", file=sys.stderr)
+            return 1
+    
+    imprimir(resumen)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resumen, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Congregaciones sintéticas para los benchmarks
+
+Genera personas y un historial de asignaciones con nombres realistas (los
+vigilantes incluyen a los de los grupos configurados) en una BD nueva.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date
+from src.contexto_aplicacion import ContextoAplicacion
+from src.models.persona import Persona, TipoPersona
+
+NOMBRES = ["Ana", "Juan", "María", "Pedro", "Lucía", "Carlos", "Sofía", "Miguel",
+           "Elena", "Jorge", "Laura", "Diego", "Paula", "Andrés", "Rosa", "Pablo"]
+APELLIDOS = ["Gómez", "Pérez", "López", "Díaz", "Martínez", "Romero", "Sosa", "Torres",
+             "Ruiz", "Acosta", "Benítez", "Medina", "Herrera", "Suárez", "Aguirre", "Rojas"]
+
+@dataclass(frozen=True)
+class Tamano:
+    """Tamaño de una congregación sintética"""
+    nombre: str
+    personas: int
+    semanas: int
+
+TAMANOS = {
+    "chico": Tamano("chico", 50, 52),
+    "mediano": Tamano("mediano", 500, 520),
+    "grande": Tamano("grande", 5000, 5200),
+}
+
+# Fecha desde la que se genera el historial (siempre la misma: datos reproducibles)
+INICIO_HISTORIAL = date(2000, 1, 3)
+
+def generar_personas(contexto: ContextoAplicacion, cantidad: int, rng: random.Random):
+    """
+    Agrega `cantidad` personas: 30% vigilantes (repartidos en los 6 grupos) y el resto acomodadores
+    """
+    grupos = contexto.vigilancia_service.grupos_config
+    vigilantes = max(int(cantidad * 0.3), 3)
+    personas = []
+    
+    # Primero los nombres de los grupos configurados, luego nombres inventados
+    configurados = [(numero, nombre) for numero, nombres in grupos.items() for nombre in nombres]
+    for i in range(vigilantes):
+        if i < len(configurados):
+            numero, completo = configurados[i]
+            apellido, nombre = completo.split(" ", 1)
+        else:
+            numero = i % len(grupos) + 1
+            nombre, apellido = rng.choice(NOMBRES), f"{rng.choice(APELLIDOS)}{i}"
+        personas.append(Persona(nombre=nombre, apellido=apellido,
+                                tipo=TipoPersona.VIGILANTE, grupo=numero))
+    
+    for i in range(cantidad - vigilantes):
+        personas.append(Persona(nombre=rng.choice(NOMBRES), apellido=f"{rng.choice(APELLIDOS)}{i}",
+                                tipo=TipoPersona.ACOMODADOR))
+    
+    contexto.persona_repository.agregar_lote(personas)
+
+def generar_historial(contexto: ContextoAplicacion, semanas: int, rng: random.Random):
+    """Agrega dos asignaciones (entre semana y fin de semana) por cada semana del historial"""
+    acomodadores = contexto.acomodador_service.obtener_acomodadores_activos()
+    vigilantes = contexto.vigilancia_service.obtener_vigilantes_activos()
+    servicio = contexto.asignacion_service
+    
+    def filas():
+        for semana in contexto.fecha_service.generar_semanas(INICIO_HISTORIAL, semanas):
+            for reunion in ("entre_semana", "fin_semana"):
+                asignacion = servicio.crear_asignacion(
+                    semana, rng.sample(acomodadores, 5), rng.sample(vigilantes, 3), reunion
+                )
+                yield asignacion.to_tuple()
+    
+    contexto.asignacion_repository.guardar_lote(filas())
+
+def crear_congregacion(db_path: str, tamano: Tamano, semilla: int = 0) -> ContextoAplicacion:
+    """
+    Crea una BD con una congregación sintética
+    Args:
+        db_path: Archivo de la BD (debe ser nuevo)
+        tamano: Cantidad de personas y semanas de historial
+        semilla: Semilla de los datos (mismo valor, mismos datos)
+    """
+    rng = random.Random(semilla)
+    contexto = ContextoAplicacion(db_path)
+    generar_personas(contexto, tamano.personas, rng)
+    generar_historial(contexto, tamano.semanas, rng)
+    return contexto
@@ -0,0 +1,174 @@
+"""
+Benchmarks de servicios y repositorios con datos sintéticos
+
+Uso:
+    python -m benchmarks.suite                                  # chico y mediano
+    python -m benchmarks.suite --tamanos chico mediano grande --salida resultados.json
+    python -m benchmarks.suite --guardar-linea-base             # registra la referencia
+    python -m benchmarks.suite --tolerancia 0.3                 # compara con la referencia
+
+Cada caso se mide como timeit: se elige la cantidad de llamadas por
+repetición para que dure al menos 0,2 s y se toma la mejor y la mediana
+de varias repeticiones (ms por llamada). Si existe la línea base, los casos
+cuyo mejor tiempo empeoró más que la tolerancia se informan como regresiones
+y el comando termina con código 1 (el mejor tiempo es menos sensible al ruido
+de la máquina que la mediana).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from benchmarks.datos_sinteticos import TAMANOS, Tamano, crear_congregacion
+from src.contexto_aplicacion import ContextoAplicacion
+from src.models.persona import TipoPersona
+
+LINEA_BASE = os.path.join(os.path.dirname(__file__), "linea_base.json")
+
+# Diferencias por debajo de esto (ms por llamada) son ruido, no regresiones
+PISO_MS = 0.05
+
+def casos(contexto: ContextoAplicacion, tamano: Tamano) -> List[Tuple[str, Callable[[], object]]]:
+    """Caminos calientes a medir (nombre, función sin argumentos)"""
+    fechas = contexto.fecha_service
+    vigilancia = contexto.vigilancia_service
+    acomodadores = contexto.acomodador_service
+    asignaciones = contexto.asignacion_service
+    seleccion = contexto.seleccion_service
+    
+    vigilante = vigilancia.obtener_vigilantes_activos()[-1]
+    semanas = fechas.generar_semanas(date(2030, 1, 7), 52)
+    rng = random.Random(1)
+    
+    def guardar():
+        asignacion = asignaciones.crear_asignacion(
+            rng.choice(semanas),
+            acomodadores.seleccionar_aleatorios(5)[0],
+            vigilancia.seleccionar_aleatorios(3)[0]
+        )
+        asignaciones.guardar_asignacion(asignacion)
+    
+    return [
+        ("generar_semanas", lambda: fechas.generar_semanas(date(2025, 1, 6), tamano.semanas)),
+        ("obtener_grupos", vigilancia.obtener_grupos),
+        ("obtener_grupo_de_persona", lambda: vigilancia.obtener_grupo_de_persona(vigilante)),
+        ("seleccionar_acomodadores", lambda: acomodadores.seleccionar_aleatorios(5)),
+        ("seleccionar_vigilantes", lambda: vigilancia.seleccionar_aleatorios(3)),
+        ("candidatos_busqueda", lambda: seleccion.obtener_candidatos(TipoPersona.ACOMODADOR, "go")),
+        ("obtener_por_mes", lambda: asignaciones.obtener_asignaciones_por_mes(3)),
+        ("historial_completo", asignaciones.obtener_todas_asignaciones),
+        ("contar_turnos", contexto.asignacion_repository.contar_turnos_por_persona),
+        ("estadisticas_historial", contexto.estadisticas_service.calcular),
+        ("estadisticas_anio", lambda: contexto.estadisticas_service.calcular(date(2005, 1, 1), date(2005, 12, 31))),
+        # Último: agrega filas, que cambiarían los tiempos de las lecturas
+        ("guardar_asignacion", guardar),
+    ]
+
+def medir(funcion: Callable[[], object], repeticiones: int = 5) -> Dict[str, float]:
+    """Mide una función: mejor y mediana en ms por llamada"""
+    temporizador = timeit.Timer(funcion)
+    numero = 1
+    while True:
+        if temporizador.timeit(numero) >= 0.2 or numero >= 10000:
+            break
+        numero *= 2
+    tiempos = [t / numero * 1000 for t in temporizador.repeat(repeticiones, numero)]
+    return {
+        "min_ms": round(min(tiempos), 4),
+        "mediana_ms": round(statistics.median(tiempos), 4),
+        "llamadas": numero,
+    }
+
+def ejecutar(tamanos: List[str], repeticiones: int = 5, semilla: int = 0,
+             filtro: Optional[str] = None, progreso=print) -> dict:
+    """
+    Corre la suite completa
+    Returns: {"fecha", "python", "plataforma", "casos": {"tamano/caso": medicion}}
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        for nombre in tamanos:
+            tamano = TAMANOS[nombre]
+            progreso(f"Generando {nombre}: {tamano.personas} personas, {tamano.semanas} semanas...")
+            contexto = crear_congregacion(os.path.join(carpeta, f"{nombre}.db"), tamano, semilla)
+            random.seed(semilla)
+            for caso, funcion in casos(contexto, tamano):
+                if filtro and filtro not in caso:
+                    continue
+                clave = f"{nombre}/{caso}"
+                resultados[clave] = medir(funcion, repeticiones)
+                progreso(f"  {clave:<40} {resultados[clave]['min_ms']:10.3f} ms "
+                         f"(mediana {resultados[clave]['mediana_ms']:.3f})")
+            contexto.escritor.cerrar()
+    
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "casos": resultados,
+    }
+
+def comparar(actual: dict, base: dict, tolerancia: float) -> List[str]:
+    """
+    Compara con la línea base
+    Returns: Descripción de cada caso cuyo mejor tiempo empeoró más que la tolerancia
+    """
+    regresiones = []
+    for clave, medicion in actual["casos"].items():
+        anterior = base.get("casos", {}).get(clave)
+        if anterior is None:
+            continue
+        antes, ahora = anterior["min_ms"], medicion["min_ms"]
+        if ahora > antes * (1 + tolerancia) and ahora - antes > PISO_MS:
+            regresiones.append(
+                f"{clave}: {antes:.3f} ms -> {ahora:.3f} ms (+{(ahora / antes - 1) * 100:.0f}%)"
+            )
+    return regresiones
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n")[1])
+    parser.add_argument("--tamanos", nargs="+", choices=list(TAMANOS), default=["chico", "mediano"])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de los datos sintéticos")
+    parser.add_argument("--solo", default=None, help="Solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--salida", default=None, help="Guarda los resultados en este JSON")
+    parser.add_argument("--linea-base", default=LINEA_BASE, help="JSON de referencia (default: %(default)s)")
+    parser.add_argument("--guardar-linea-base", action="store_true",
+                        help="Guarda los resultados como nueva línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.5,
+                        help="Empeoramiento admitido, 0.5 = 50%% (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    actual = ejecutar(args.tamanos, args.repeticiones, args.semilla, args.solo)
+    
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(actual, f, ensure_ascii=False, indent=2)
+    if args.guardar_linea_base:
+        with open(args.linea_base, "w", encoding="utf-8") as f:
+            json.dump(actual, f, ensure_ascii=False, indent=2)
+        print(f"Línea base guardada en {args.linea_base}")
+        return 0
+    
+    if not os.path.exists(args.linea_base):
+        print("Sin línea base para comparar (usar --guardar-linea-base)")
+        return 0
+    with open(args.linea_base, encoding="utf-8") as f:
+        base = json.load(f)
+    regresiones = comparar(actual, base, args.tolerancia)
+    if regresiones:
+        print(f"Regresiones respecto de la línea base ({base.get('fecha', '?')}):")
+        for linea in regresiones:
+            print(f"  {linea}")
+        return 1
+    print("Sin regresiones respecto de la línea base")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
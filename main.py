@@ -1,35 +1,66 @@
+import time
+_inicio = time.perf_counter()
+
+import sys
 import tkinter as tk
-from src.ui.components.vigilancia_panel import VigilanciaPanel
-from src.ui.components.acomodador_panel import AcomodadoresPanel
+from src.contexto_aplicacion import ContextoAplicacion
+
+# python main.py --perfilar: mide cada manejador de la interfaz y sus consultas
+PERFILAR = "--perfilar" in sys.argv
+if PERFILAR:
+    from src.database.instrumentacion import INSTRUMENTACION
+    from src.ui.perfilador import PERFILADOR
+    INSTRUMENTACION.activar()
+    PERFILADOR.activar()
 
 def on_vigilantes_seleccionados(seleccionados):
     print(f"Vigilantes seleccionados: {[str(v) for v in seleccionados]}")
 
+contexto = ContextoAplicacion(inicio=_inicio)
+
 root = tk.Tk()
 root.title("Sistema de Asignaciones")
 root.geometry("800x600")
+contexto.registrar_etapa("ventana")
+
+# Menú
+barra_menu = tk.Menu(root)
+menu_ver = tk.Menu(barra_menu, tearoff=0)
+menu_ver.add_command(label="Estadísticas", command=lambda: contexto.crear_ventana_estadisticas(root))
+barra_menu.add_cascade(label="Ver", menu=menu_ver)
+root.config(menu=barra_menu)
 
 # Crear frame para ambos paneles
 frame_principal = tk.Frame(root)
 frame_principal.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-# Panel de acomodadores (columna 0)
-panel_acomodadores = AcomodadoresPanel(frame_principal)
-panel_acomodadores.grid(row=0, column=0, sticky="nsew", padx=5)
-
-# Panel de vigilancia (columna 1)
-panel_vigilancia = VigilanciaPanel(
-    frame_principal,
-    on_seleccion_callback=on_vigilantes_seleccionados
-)
-panel_vigilancia.grid(row=0, column=1, sticky="nsew", padx=5)
-
 # Configurar expansión
 frame_principal.grid_columnconfigure(0, weight=1)
 frame_principal.grid_columnconfigure(1, weight=1)
 frame_principal.grid_rowconfigure(0, weight=1)
 
-# Ejemplo: Establecer grupo de limpieza (semana 3 = grupo 3)
-# panel_vigilancia.set_grupo_limpieza(3)
+def construir_paneles():
+    """Construye los paneles una vez que la ventana ya está en pantalla"""
+    # Panel de acomodadores (columna 0)
+    panel_acomodadores = contexto.crear_panel_acomodadores(frame_principal)
+    panel_acomodadores.grid(row=0, column=0, sticky="nsew", padx=5)
+    
+    # Panel de vigilancia (columna 1)
+    panel_vigilancia = contexto.crear_panel_vigilancia(
+        frame_principal,
+        on_seleccion_callback=on_vigilantes_seleccionados
+    )
+    panel_vigilancia.grid(row=0, column=1, sticky="nsew", padx=5)
+    
+    # Ejemplo: Establecer grupo de limpieza (semana 3 = grupo 3)
+    # panel_vigilancia.set_grupo_limpieza(3)
+    
+    print(contexto.reporte_inicio())
+
+root.after_idle(construir_paneles)
+
+root.mainloop()
 
-root.mainloop()
\ No newline at end of file
+if PERFILAR:
+    print(PERFILADOR.reporte())
+    print(INSTRUMENTACION.reporte())
@@ -0,0 +1,227 @@
+"""
+BD central de sincronización (y un servidor HTTP de prueba para usarla)
+
+Cada fila sincronizada tiene un uid global y un número de versión que asigna
+la central (crece con cada cambio aceptado). Los clientes envían sus cambios
+indicando la versión sobre la que editaron y reciben solo las filas con
+versión mayor a la última que ya tienen.
+
+Conflictos: si la versión base no es la actual, gana el cambio con mayor
+(modificado, origen). Todos los clientes terminan con la misma fila.
+"""
+import json
+import sqlite3
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+class CentralSync:
+    """Almacenamiento y reglas de la central (un archivo SQLite)"""
+    
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS filas (
+            uid TEXT PRIMARY KEY,
+            tabla TEXT NOT NULL,
+            datos TEXT NOT NULL,
+            borrado INTEGER NOT NULL DEFAULT 0,
+            version INTEGER NOT NULL,
+            modificado TEXT NOT NULL,
+            origen TEXT NOT NULL
+        );
+        
+        CREATE INDEX IF NOT EXISTS filas_version ON filas (version);
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executescript(self.ESQUEMA)
+    
+    def enviar(self, origen: str, cambios: List[dict]) -> List[dict]:
+        """
+        Recibe un lote de cambios de un cliente
+        Args:
+            origen: Identificador de la instalación que envía
+            cambios: Dicts con uid, tabla, datos, borrado, version_base y modificado
+        Returns:
+            Por cada cambio: {"uid", "aceptado", "conflicto", "fila"} donde
+            "fila" es el estado final de la fila en la central
+        """
+        respuestas = []
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            # Un solo escritor a la vez: las versiones quedan en orden
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("SELECT COALESCE(MAX(version), 0) FROM filas").fetchone()[0]
+            
+            for cambio in cambios:
+                actual = self._obtener(conn, cambio["uid"])
+                conflicto = actual is not None and actual["version"] != cambio["version_base"]
+                aceptado = not conflicto or (
+                    (cambio["modificado"], origen) > (actual["modificado"], actual["origen"])
+                )
+                
+                if aceptado:
+                    version += 1
+                    fila = {
+                        "uid": cambio["uid"],
+                        "tabla": cambio["tabla"],
+                        "datos": cambio["datos"],
+                        "borrado": bool(cambio["borrado"]),
+                        "version": version,
+                        "modificado": cambio["modificado"],
+                        "origen": origen,
+                    }
+                    conn.execute(
+                        "INSERT OR REPLACE INTO filas "
+                        "(uid, tabla, datos, borrado, version, modificado, origen) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (fila["uid"], fila["tabla"], json.dumps(fila["datos"], ensure_ascii=False),
+                         int(fila["borrado"]), version, fila["modificado"], origen)
+                    )
+                else:
+                    fila = actual
+                
+                respuestas.append({
+                    "uid": cambio["uid"], "aceptado": aceptado,
+                    "conflicto": conflicto, "fila": fila,
+                })
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return respuestas
+    
+    def recibir(self, desde: int, limite: int = 200) -> Tuple[List[dict], int]:
+        """
+        Filas cambiadas después de una versión
+        Returns: (filas ordenadas por versión, última versión incluida)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "SELECT uid, tabla, datos, borrado, version, modificado, origen "
+                "FROM filas WHERE version > ? ORDER BY version LIMIT ?",
+                (desde, limite)
+            )
+            filas = [self._row_to_fila(row) for row in cursor.fetchall()]
+        return filas, (filas[-1]["version"] if filas else desde)
+    
+    def _obtener(self, conn: sqlite3.Connection, uid: str):
+        row = conn.execute(
+            "SELECT uid, tabla, datos, borrado, version, modificado, origen FROM filas WHERE uid = ?",
+            (uid,)
+        ).fetchone()
+        return self._row_to_fila(row) if row else None
+    
+    @staticmethod
+    def _row_to_fila(row) -> dict:
+        return {
+            "uid": row[0],
+            "tabla": row[1],
+            "datos": json.loads(row[2]),
+            "borrado": bool(row[3]),
+            "version": row[4],
+            "modificado": row[5],
+            "origen": row[6],
+        }
+
+class ServidorCentral:
+    """
+    Servidor HTTP de prueba para la central
+        POST /enviar   {"origen": ..., "cambios": [...]}
+        GET  /recibir?desde=N&limite=M
+    """
+    
+    def __init__(self, central: CentralSync):
+        self.central = central
+        self._servidor = None
+    
+    def _crear_manejador(self):
+        central = self.central
+        
+        class Manejador(BaseHTTPRequestHandler):
+            def _responder(self, estado: int, datos):
+                cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+                self.send_response(estado)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+            
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path != "/recibir":
+                    return self._responder(404, {"error": "Ruta desconocida"})
+                parametros = parse_qs(url.query)
+                try:
+                    desde = int(parametros.get("desde", ["0"])[0])
+                    limite = int(parametros.get("limite", ["200"])[0])
+                except ValueError:
+                    return self._responder(400, {"error": "Parámetros inválidos"})
+                filas, ultima = central.recibir(desde, limite)
+                self._responder(200, {"filas": filas, "ultima": ultima})
+            
+            def do_POST(self):
+                if self.path != "/enviar":
+                    return self._responder(404, {"error": "Ruta desconocida"})
+                largo = int(self.headers.get("Content-Length", 0))
+                try:
+                    pedido = json.loads(self.rfile.read(largo))
+                    respuestas = central.enviar(pedido["origen"], pedido["cambios"])
+                except (ValueError, KeyError) as e:
+                    return self._responder(400, {"error": f"Pedido inválido: {e}"})
+                self._responder(200, respuestas)
+            
+            def log_message(self, formato, *args):
+                pass
+        
+        return Manejador
+    
+    def iniciar(self, host: str = "127.0.0.1", puerto: int = 8081) -> int:
+        """Arranca en un hilo aparte; devuelve el puerto (útil con puerto=0)"""
+        self._servidor = ThreadingHTTPServer((host, puerto), self._crear_manejador())
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self._servidor.server_address[1]
+    
+    def servir(self, host: str = "127.0.0.1", puerto: int = 8081):
+        """Atiende pedidos hasta que se interrumpa (Ctrl+C)"""
+        self._servidor = ThreadingHTTPServer((host, puerto), self._crear_manejador())
+        try:
+            self._servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._servidor.server_close()
+    
+    def detener(self):
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+class ClienteCentral:
+    """Cliente HTTP con la misma interfaz que CentralSync"""
+    
+    def __init__(self, url: str, tiempo_espera: float = 30):
+        self.url = url.rstrip("/")
+        self.tiempo_espera = tiempo_espera
+    
+    def enviar(self, origen: str, cambios: List[dict]) -> List[dict]:
+        cuerpo = json.dumps({"origen": origen, "cambios": cambios}, ensure_ascii=False).encode("utf-8")
+        pedido = urllib.request.Request(
+            f"{self.url}/enviar", data=cuerpo,
+            headers={"Content-Type": "application/json; charset=utf-8"}
+        )
+        with urllib.request.urlopen(pedido, timeout=self.tiempo_espera) as respuesta:
+            return json.loads(respuesta.read())
+    
+    def recibir(self, desde: int, limite: int = 200) -> Tuple[List[dict], int]:
+        url = f"{self.url}/recibir?{urlencode({'desde': desde, 'limite': limite})}"
+        with urllib.request.urlopen(url, timeout=self.tiempo_espera) as respuesta:
+            datos = json.loads(respuesta.read())
+        return datos["filas"], datos["ultima"]
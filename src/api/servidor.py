@@ -0,0 +1,291 @@
+"""
+API HTTP de solo lectura para consultar las asignaciones publicadas
+
+Rutas (solo GET/HEAD):
+    /semanas?desde=AAAA-MM-DD&cantidad=8
+    /asignaciones?mes=3  |  /asignaciones?desde=AAAA-MM-DD&hasta=AAAA-MM-DD
+    /turnos?persona=Apellido Nombre&desde=AAAA-MM-DD   (como Persona.nombre_completo)
+
+Las respuestas se guardan en caché junto con la versión de datos de la BD
+(PRAGMA data_version). Mientras nadie escriba en la BD, cada pedido cuesta
+una consulta PRAGMA y, si el cliente manda If-None-Match, un 304 sin cuerpo.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit
+from src.config.settings import DB_PATH
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.services.asignacion_service import AsignacionService
+from src.services.fecha_service import FechaService
+from src.utils.date_utils import DateUtils
+
+CAMPOS_ASIGNACION = ("semana", *AsignacionRepository.COLUMNAS_PERSONAS, "dia_reunion")
+
+class PedidoInvalido(ValueError):
+    """Parámetros inválidos en un pedido (se responde 400)"""
+
+class ServidorConsulta:
+    """Servidor HTTP asyncio de solo lectura (biblioteca estándar)"""
+    
+    MAX_CACHE = 256
+    MAX_ENCABEZADOS = 100
+    TIEMPO_ESPERA = 30
+    MAX_SEMANAS = 104
+    
+    MENSAJES = {200: "OK", 304: "Not Modified", 400: "Bad Request",
+                404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+    
+    def __init__(self, asignacion_service: AsignacionService = None,
+                 fecha_service: FechaService = None, db_path: str = DB_PATH):
+        self.asignacion_service = asignacion_service or AsignacionService()
+        self.fecha_service = fecha_service or FechaService()
+        self.db_path = db_path
+        
+        self._rutas: Dict[str, Callable[[Dict[str, List[str]]], object]] = {
+            "/semanas": self._semanas,
+            "/asignaciones": self._asignaciones,
+            "/turnos": self._turnos,
+        }
+        # clave -> (version, etag, cuerpo)
+        self._cache: Dict[str, Tuple[int, str, bytes]] = {}
+        # Pedidos en curso: los iguales esperan el mismo resultado
+        self._pendientes: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._conexion_version: Optional[sqlite3.Connection] = None
+    
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8080) -> asyncio.AbstractServer:
+        """Empieza a escuchar (no bloquea)"""
+        return await asyncio.start_server(self._atender, host, puerto)
+    
+    def servir(self, host: str = "127.0.0.1", puerto: int = 8080):
+        """Atiende pedidos hasta que se interrumpa (Ctrl+C)"""
+        async def principal():
+            servidor = await self.iniciar(host, puerto)
+            async with servidor:
+                await servidor.serve_forever()
+        
+        try:
+            asyncio.run(principal())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.cerrar()
+    
+    def cerrar(self):
+        if self._conexion_version is not None:
+            self._conexion_version.close()
+            self._conexion_version = None
+    
+    def version_datos(self) -> int:
+        """
+        Versión de los datos de la BD
+        Cambia cada vez que otra conexión confirma una escritura (la propia
+        conexión nunca escribe, así que ve todas las escrituras)
+        """
+        if self._conexion_version is None:
+            self._conexion_version = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._conexion_version.execute("PRAGMA data_version").fetchone()[0]
+    
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende una conexión (con keep-alive)"""
+        try:
+            while True:
+                linea = await asyncio.wait_for(reader.readline(), self.TIEMPO_ESPERA)
+                if not linea:
+                    break
+                partes = linea.decode("latin-1").split()
+                encabezados = await self._leer_encabezados(reader)
+                if len(partes) != 3 or encabezados is None:
+                    self._escribir(writer, 400, self._json({"error": "Pedido mal formado"}), {}, False)
+                    await writer.drain()
+                    break
+                
+                metodo, destino, protocolo = partes
+                mantener = (protocolo == "HTTP/1.1"
+                            and encabezados.get("connection", "").lower() != "close")
+                estado, cuerpo, extra = await self.procesar(metodo, destino, encabezados)
+                self._escribir(writer, estado, cuerpo, extra, mantener, solo_encabezados=metodo == "HEAD")
+                await writer.drain()
+                if not mantener:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _leer_encabezados(self, reader: asyncio.StreamReader) -> Optional[Dict[str, str]]:
+        encabezados = {}
+        for _ in range(self.MAX_ENCABEZADOS):
+            linea = await asyncio.wait_for(reader.readline(), self.TIEMPO_ESPERA)
+            if linea in (b"\r\n", b"\n", b""):
+                return encabezados
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            encabezados[nombre.strip().lower()] = valor.strip()
+        return None
+    
+    def _escribir(self, writer: asyncio.StreamWriter, estado: int, cuerpo: bytes,
+                  extra: Dict[str, str], mantener: bool, solo_encabezados: bool = False):
+        lineas = [f"HTTP/1.1 {estado} {self.MENSAJES.get(estado, '')}"]
+        if estado != 304:
+            lineas.append("Content-Type: application/json; charset=utf-8")
+            lineas.append(f"Content-Length: {len(cuerpo)}")
+        lineas.extend(f"{nombre}: {valor}" for nombre, valor in extra.items())
+        lineas.append(f"Connection: {'keep-alive' if mantener else 'close'}")
+        writer.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1"))
+        if cuerpo and estado != 304 and not solo_encabezados:
+            writer.write(cuerpo)
+    
+    async def procesar(self, metodo: str, destino: str,
+                       encabezados: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        Resuelve un pedido
+        Returns: (estado, cuerpo, encabezados extra)
+        """
+        if metodo not in ("GET", "HEAD"):
+            return 405, self._json({"error": "Solo lectura"}), {"Allow": "GET, HEAD"}
+        
+        url = urlsplit(destino)
+        ruta = url.path.rstrip("/")
+        manejador = self._rutas.get(ruta)
+        if manejador is None:
+            return 404, self._json({"error": f"Ruta desconocida: {url.path}", "rutas": sorted(self._rutas)}), {}
+        
+        # Incluye la fecha: los valores por defecto ("desde hoy") cambian cada día
+        clave = f"{date.today()}|{ruta}?{urlencode(sorted(parse_qsl(url.query)))}"
+        version = self.version_datos()
+        entrada = self._cache.get(clave)
+        if entrada is None or entrada[0] != version:
+            try:
+                entrada = await self._calcular(clave, version, manejador, parse_qs(url.query))
+            except PedidoInvalido as e:
+                return 400, self._json({"error": str(e)}), {}
+            except Exception as e:
+                return 500, self._json({"error": f"Error al consultar: {e}"}), {}
+        
+        _, etag, cuerpo = entrada
+        extra = {"ETag": etag, "Cache-Control": "no-cache"}
+        solicitados = encabezados.get("if-none-match", "")
+        if solicitados and (solicitados == "*" or etag in (e.strip() for e in solicitados.split(","))):
+            return 304, b"", extra
+        return 200, cuerpo, extra
+    
+    async def _calcular(self, clave: str, version: int, manejador,
+                        parametros: Dict[str, List[str]]) -> Tuple[int, str, bytes]:
+        """Genera la respuesta fuera del loop y la guarda en caché"""
+        pendiente = self._pendientes.get((clave, version))
+        if pendiente is not None:
+            return await asyncio.shield(pendiente)
+        
+        loop = asyncio.get_running_loop()
+        pendiente = loop.run_in_executor(None, self._generar, version, manejador, parametros)
+        self._pendientes[(clave, version)] = pendiente
+        try:
+            entrada = await pendiente
+        finally:
+            del self._pendientes[(clave, version)]
+        
+        if len(self._cache) >= self.MAX_CACHE:
+            self._cache.clear()
+        self._cache[clave] = entrada
+        return entrada
+    
+    def _generar(self, version: int, manejador, parametros) -> Tuple[int, str, bytes]:
+        cuerpo = self._json(manejador(parametros))
+        etag = '"' + hashlib.sha1(cuerpo).hexdigest()[:16] + '"'
+        return version, etag, cuerpo
+    
+    @staticmethod
+    def _json(datos) -> bytes:
+        return json.dumps(datos, ensure_ascii=False).encode("utf-8")
+    
+    # ------------------------------------------------------------------
+    # Rutas
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _parametro(parametros: Dict[str, List[str]], nombre: str) -> Optional[str]:
+        valores = parametros.get(nombre)
+        return valores[0] if valores else None
+    
+    def _fecha(self, parametros, nombre: str) -> Optional[date]:
+        texto = self._parametro(parametros, nombre)
+        if texto is None:
+            return None
+        try:
+            return date.fromisoformat(texto)
+        except ValueError:
+            raise PedidoInvalido(f"'{nombre}' debe tener el formato AAAA-MM-DD")
+    
+    def _entero(self, parametros, nombre: str, defecto: int, minimo: int, maximo: int) -> int:
+        texto = self._parametro(parametros, nombre)
+        if texto is None:
+            return defecto
+        try:
+            valor = int(texto)
+        except ValueError:
+            raise PedidoInvalido(f"'{nombre}' debe ser un número")
+        if not minimo <= valor <= maximo:
+            raise PedidoInvalido(f"'{nombre}' debe estar entre {minimo} y {maximo}")
+        return valor
+    
+    def _semanas(self, parametros) -> List[dict]:
+        desde = self._fecha(parametros, "desde")
+        cantidad = self._entero(parametros, "cantidad", 8, 1, self.MAX_SEMANAS)
+        semanas = self.fecha_service.generar_semanas(desde, cantidad)
+        return [
+            {
+                "semana": str(semana),
+                "lunes": semana.lunes.isoformat(),
+                "grupo_limpieza": semana.grupo_limpieza,
+                "tipo": semana.tipo.value,
+                "evento": semana.nombre_evento,
+                "entre_semana": self.fecha_service.formatear_dia_reunion(semana, "entre_semana"),
+                "fin_semana": self.fecha_service.formatear_dia_reunion(semana, "fin_semana"),
+            }
+            for semana in semanas
+        ]
+    
+    def _asignaciones(self, parametros) -> List[dict]:
+        if self._parametro(parametros, "mes") is not None:
+            filas = self.asignacion_service.obtener_asignaciones_por_mes(
+                self._entero(parametros, "mes", 0, 1, 12)
+            )
+        else:
+            desde = self._fecha(parametros, "desde")
+            hasta = self._fecha(parametros, "hasta")
+            if desde is None and hasta is None:
+                filas = self.asignacion_service.obtener_todas_asignaciones()
+            else:
+                try:
+                    filas = self.asignacion_service.obtener_asignaciones_por_rango(desde, hasta)
+                except ValueError as e:
+                    raise PedidoInvalido(str(e))
+        
+        resultado = []
+        for fila in filas:
+            asignacion = dict(zip(CAMPOS_ASIGNACION, fila))
+            lunes = DateUtils.parsear_semana(fila[0])
+            asignacion["lunes"] = lunes.isoformat() if lunes else None
+            resultado.append(asignacion)
+        return resultado
+    
+    def _turnos(self, parametros) -> List[dict]:
+        persona = self._parametro(parametros, "persona")
+        if not persona:
+            raise PedidoInvalido("Falta el parámetro 'persona'")
+        turnos = self.asignacion_service.proximos_turnos(persona, self._fecha(parametros, "desde"))
+        return [
+            {"semana": semana, "dia_reunion": dia, "puesto": puesto}
+            for semana, dia, puesto in turnos
+        ]
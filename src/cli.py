@@ -0,0 +1,436 @@
+"""
+Modo línea de comandos (sin interfaz gráfica)
+
+Uso:
+    python -m src.cli generar --desde 2025-01-06 --semanas 8 --guardar --exportar plan.csv
+    python -m src.cli generar --desde 2025-01-06 --semanas 8 --comparar
+    python -m src.cli exportar historial.xlsx
+    python -m src.cli exportar marzo.pdf --mes 3
+    python -m src.cli importar personas plantel.xlsx --tipo vigilante
+    python -m src.cli importar asignaciones historial.csv
+    python -m src.cli respaldar --retener 5
+    python -m src.cli migrar destino.db
+    python -m src.cli servir --puerto 8080
+    python -m src.cli publicar --carpeta publicado
+    python -m src.cli cambios --desde 120
+    python -m src.cli central central.db --puerto 8081
+    python -m src.cli sincronizar http://servidor:8081
+    python -m src.cli esquema
+    python -m src.cli estadisticas --desde 2024-01-01 --hasta 2024-12-31
+    python -m src.cli reemplazos 42 vigilante_final
+    python -m src.cli plantel --tipo vigilante --al 2024-03-01
+    python -m src.cli --consultas 50 generar --semanas 8
+
+No importa tkinter, así que puede correr en un servidor (p.ej. desde cron).
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date
+from typing import List, Optional
+from src.config.settings import DB_PATH, BACKUP_DIR, BACKUP_RETENCION, PUBLICACION_DIR
+from src.contexto_aplicacion import ContextoAplicacion
+from src.database.copiador_tablas import CopiadorTablas
+from src.database.instrumentacion import INSTRUMENTACION
+from src.database.repositories.base import COLUMNAS_PERSONAS
+from src.models.persona import TipoPersona
+from src.services.backup_service import BackupService
+
+def _fecha(texto: str) -> date:
+    """Convierte 'AAAA-MM-DD' a date (para argparse)"""
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fecha inválida: '{texto}' (formato AAAA-MM-DD)")
+
+def _comando_generar(args, contexto: ContextoAplicacion, medir) -> int:
+    """Genera, valida y opcionalmente guarda/exporta un plan"""
+    if args.semilla is not None:
+        random.seed(args.semilla)
+    
+    planificacion = contexto.planificacion_service
+    try:
+        plan = planificacion.generar_plan(
+            args.desde, args.semanas,
+            reuniones=args.reuniones,
+            omitir_especiales=not args.incluir_especiales
+        )
+    except ValueError as e:
+        print(f"Error al generar: {e}", file=sys.stderr)
+        return 1
+    medir("generar")
+    
+    errores = planificacion.validar_plan(plan)
+    medir("validar")
+    if errores:
+        for error in errores:
+            print(f"Inválida: {error}", file=sys.stderr)
+        return 1
+    print(f"Plan generado: {len(plan)} asignaciones")
+    
+    if args.comparar:
+        # Antes de guardar: contra lo que había
+        diferencia = contexto.diferencias_service.comparar_con_guardado(a.to_tuple() for a in plan)
+        medir("comparar")
+        _imprimir_diferencia(diferencia)
+    
+    if args.guardar:
+        guardadas, errores = planificacion.guardar_plan(plan)
+        medir("guardar")
+        for error in errores:
+            print(error, file=sys.stderr)
+        print(f"Guardadas: {guardadas}")
+        if errores:
+            return 1
+    
+    if args.exportar:
+        try:
+            cantidad = contexto.export_service.exportar_filas(
+                (a.to_tuple() for a in plan), args.exportar, args.formato
+            )
+        except ValueError as e:
+            print(f"Error al exportar: {e}", file=sys.stderr)
+            return 1
+        medir("exportar")
+        print(f"Exportadas {cantidad} filas a {args.exportar}")
+    
+    return 0
+
+def _imprimir_diferencia(diferencia):
+    """Resumen de una DiferenciaPlanes y los turnos que gana/pierde cada persona"""
+    print(diferencia)
+    for nombre in diferencia.afectados():
+        cambios = diferencia.por_persona[nombre]
+        print(f"  {nombre}:")
+        for signo, turnos in (("+", cambios.altas), ("-", cambios.bajas)):
+            for semana, dia_reunion, columna in turnos:
+                print(f"    {signo} {semana} ({dia_reunion}) {columna}")
+
+def _comando_exportar(args, contexto: ContextoAplicacion, medir) -> int:
+    """Exporta las asignaciones guardadas"""
+    try:
+        cantidad = contexto.export_service.exportar(args.archivo, args.formato, args.mes)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    medir("exportar")
+    print(f"Exportadas {cantidad} filas a {args.archivo}")
+    return 0
+
+def _comando_importar(args, contexto: ContextoAplicacion, medir) -> int:
+    """Importa un plantel o una planilla de asignaciones"""
+    servicio = contexto.importacion_service
+    try:
+        if args.que == "personas":
+            tipo = TipoPersona(args.tipo) if args.tipo else None
+            resultado = servicio.importar_personas(args.archivo, tipo)
+        else:
+            resultado = servicio.importar_asignaciones(args.archivo)
+    except (ValueError, OSError) as e:
+        print(f"Error al importar: {e}", file=sys.stderr)
+        return 1
+    medir("importar")
+    
+    for conflicto in resultado.conflictos:
+        print(f"Conflicto: {conflicto}", file=sys.stderr)
+    for error in resultado.errores:
+        print(f"Error: {error}", file=sys.stderr)
+    print(resultado)
+    return 1 if resultado.errores and not resultado.insertados else 0
+
+def _comando_respaldar(args, contexto: ContextoAplicacion, medir) -> int:
+    """Crea un respaldo con fecha y hora"""
+    servicio = BackupService(contexto.db_path, args.carpeta, args.retener)
+    ruta = servicio.crear_respaldo()
+    medir("respaldar")
+    if not servicio.verificar(ruta):
+        print(f"El respaldo {ruta} no pasó la verificación de integridad", file=sys.stderr)
+        return 1
+    print(f"Respaldo creado: {ruta}")
+    return 0
+
+def _comando_migrar(args, contexto: ContextoAplicacion, medir) -> int:
+    """Copia las tablas a otra BD SQLite (se puede retomar si se corta)"""
+    if os.path.abspath(args.destino) == os.path.abspath(contexto.db_path):
+        print("El destino no puede ser la misma BD", file=sys.stderr)
+        return 1
+    
+    contexto.db_manager.inicializar_esquema()
+    estado = args.estado or args.destino + ".estado.json"
+    destino = sqlite3.connect(args.destino)
+    try:
+        copiador = CopiadorTablas(destino, estado, contexto.db_path, args.lote)
+        copiador.crear_tablas()
+        copiadas = copiador.copiar()
+    finally:
+        destino.close()
+    medir("migrar")
+    
+    for tabla, cantidad in copiadas.items():
+        print(f"{tabla}: {cantidad} filas copiadas")
+    return 0
+
+def _comando_servir(args, contexto: ContextoAplicacion, medir) -> int:
+    """Inicia la API HTTP de solo lectura"""
+    from src.api.servidor import ServidorConsulta
+    
+    servidor = ServidorConsulta(contexto.asignacion_service, contexto.fecha_service, contexto.db_path)
+    medir("servidor")
+    print(f"Sirviendo en http://{args.host}:{args.puerto} (Ctrl+C para salir)")
+    servidor.servir(args.host, args.puerto)
+    return 0
+
+def _comando_publicar(args, contexto: ContextoAplicacion, medir) -> int:
+    """Publica las asignaciones como archivos estáticos"""
+    servicio = contexto.publicacion_service
+    servicio.carpeta = args.carpeta
+    resultado = servicio.publicar()
+    medir("publicar")
+    print(resultado)
+    return 0
+
+def _comando_cambios(args, contexto: ContextoAplicacion, medir) -> int:
+    """Muestra los cambios posteriores a un número de secuencia (una línea JSON por cambio)"""
+    cambios = contexto.cambios_repository.cambios_desde(args.desde, args.tabla, args.limite)
+    medir("cambios")
+    for cambio in cambios:
+        print(json.dumps(vars(cambio), ensure_ascii=False))
+    return 0
+
+def _comando_central(args, contexto: ContextoAplicacion, medir) -> int:
+    """Inicia el servidor central de sincronización (de prueba)"""
+    from src.api.central import CentralSync, ServidorCentral
+    
+    servidor = ServidorCentral(CentralSync(args.archivo))
+    print(f"Central en http://{args.host}:{args.puerto} (Ctrl+C para salir)")
+    servidor.servir(args.host, args.puerto)
+    return 0
+
+def _comando_sincronizar(args, contexto: ContextoAplicacion, medir) -> int:
+    """Sincroniza la BD local con la central"""
+    from src.api.central import CentralSync, ClienteCentral
+    from src.services.sync_service import SyncService
+    
+    if args.central.startswith(("http://", "https://")):
+        central = ClienteCentral(args.central)
+    else:
+        central = CentralSync(args.central)
+    servicio = SyncService(
+        central, contexto.db_path, contexto.cambios_repository, args.lote, contexto.escritor
+    )
+    try:
+        resultado = servicio.sincronizar()
+    except OSError as e:
+        print(f"Error al sincronizar: {e}", file=sys.stderr)
+        return 1
+    medir("sincronizar")
+    print(resultado)
+    return 0
+
+def _comando_esquema(args, contexto: ContextoAplicacion, medir) -> int:
+    """Muestra la versión del esquema y aplica las migraciones pendientes"""
+    from src.database.migraciones import Migrador
+    
+    migrador = Migrador(contexto.db_path)
+    version = migrador.version_actual()
+    print(f"Versión del esquema: {version} (última: {migrador.ultima_version})")
+    pendientes = migrador.pendientes(version)
+    if args.solo_ver:
+        for migracion in pendientes:
+            print(f"  pendiente {migracion.version}: {migracion.descripcion}")
+        return 0
+    
+    aplicadas = migrador.migrar(
+        progreso=lambda m: print(f"  aplicando {m.version}: {m.descripcion}")
+    )
+    medir("esquema")
+    print(f"Migraciones aplicadas: {aplicadas}")
+    return 0
+
+def _comando_estadisticas(args, contexto: ContextoAplicacion, medir) -> int:
+    """Muestra los turnos por puesto, grupo y persona de un rango de fechas"""
+    try:
+        estadisticas = contexto.estadisticas_service.calcular(args.desde, args.hasta)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    medir("estadisticas")
+    
+    if args.json:
+        print(json.dumps(estadisticas.to_dict(), ensure_ascii=False, indent=2))
+        return 0
+    
+    print(f"Asignaciones: {estadisticas.total_asignaciones}")
+    print("Turnos por puesto:")
+    for columna, cantidad in estadisticas.por_rol.items():
+        print(f"  {columna:<20} {cantidad:6}")
+    print("Turnos de vigilancia por grupo:")
+    for grupo, cantidad in sorted(estadisticas.por_grupo.items()):
+        print(f"  {'Sin grupo' if grupo == 0 else f'Grupo {grupo}':<20} {cantidad:6}")
+    print("Turnos por persona:")
+    for nombre, cantidad in estadisticas.ranking()[:args.limite]:
+        print(f"  {nombre:<30} {cantidad:6}")
+    return 0
+
+def _comando_reemplazos(args, contexto: ContextoAplicacion, medir) -> int:
+    """Sugiere reemplazos para un puesto de una asignación guardada"""
+    try:
+        candidatos = contexto.reemplazo_service.sugerir(args.id, args.columna, args.limite)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    medir("reemplazos")
+    
+    if not candidatos:
+        print("No hay candidatos disponibles")
+    for posicion, candidato in enumerate(candidatos, 1):
+        print(f"{posicion:3}. {candidato}")
+    return 0
+
+def _comando_plantel(args, contexto: ContextoAplicacion, medir) -> int:
+    """Lista el plantel de hoy o el que regía en una fecha"""
+    personas = contexto.persona_repository.obtener_todos(
+        TipoPersona(args.tipo), incluir_inactivos=args.inactivos, as_of=args.al
+    )
+    medir("plantel")
+    for persona in personas:
+        estado = "" if persona.activo else " (inactiva)"
+        grupo = f" - grupo {persona.grupo}" if persona.grupo else ""
+        print(f"{persona}{grupo}{estado}")
+    print(f"Total: {len(personas)}")
+    return 0
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Crea el parser de argumentos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Sistema de Asignaciones - modo sin interfaz"
+    )
+    parser.add_argument("--db", default=DB_PATH, help="Ruta de la BD (default: %(default)s)")
+    parser.add_argument("--tiempos", action="store_true", help="Muestra el tiempo de cada etapa")
+    parser.add_argument("--consultas", type=float, nargs="?", const=100, default=None, metavar="UMBRAL_MS",
+                        help="Cuenta las consultas a la BD e informa las más lentas que UMBRAL_MS (default: 100)")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    
+    generar = subparsers.add_parser("generar", help="Genera un plan para un rango de semanas")
+    generar.add_argument("--desde", type=_fecha, default=None,
+                         help="Fecha de inicio AAAA-MM-DD (default: hoy)")
+    generar.add_argument("--semanas", type=int, default=4, help="Cantidad de semanas")
+    generar.add_argument("--reuniones", nargs="+", default=["entre_semana", "fin_semana"],
+                         choices=["entre_semana", "fin_semana"],
+                         help="Reuniones a cubrir por semana")
+    generar.add_argument("--incluir-especiales", action="store_true",
+                         help="No saltear semanas de asamblea/convención")
+    generar.add_argument("--semilla", type=int, default=None,
+                         help="Semilla aleatoria (resultados reproducibles)")
+    generar.add_argument("--guardar", action="store_true", help="Guarda el plan en la BD")
+    generar.add_argument("--comparar", action="store_true",
+                         help="Muestra qué cambia respecto de lo guardado para esas semanas")
+    generar.add_argument("--exportar", metavar="ARCHIVO",
+                         help="Exporta el plan (.csv, .xlsx o .pdf)")
+    generar.add_argument("--formato", choices=["csv", "xlsx", "pdf"], default=None,
+                         help="Formato de exportación (default: según la extensión)")
+    generar.set_defaults(funcion=_comando_generar)
+    
+    exportar = subparsers.add_parser("exportar", help="Exporta las asignaciones guardadas")
+    exportar.add_argument("archivo", help="Archivo de salida (.csv, .xlsx o .pdf)")
+    exportar.add_argument("--formato", choices=["csv", "xlsx", "pdf"], default=None,
+                          help="Formato de exportación (default: según la extensión)")
+    exportar.add_argument("--mes", type=int, default=None, help="Solo un mes (1-12)")
+    exportar.set_defaults(funcion=_comando_exportar)
+    
+    importar = subparsers.add_parser("importar", help="Importa personas o asignaciones (.csv o .xlsx)")
+    importar.add_argument("que", choices=["personas", "asignaciones"], help="Qué se importa")
+    importar.add_argument("archivo", help="Archivo de entrada (.csv o .xlsx)")
+    importar.add_argument("--tipo", choices=[t.value for t in TipoPersona], default=None,
+                          help="Tipo de todas las personas (si el archivo no tiene columna tipo)")
+    importar.set_defaults(funcion=_comando_importar)
+    
+    respaldar = subparsers.add_parser("respaldar", help="Crea un respaldo de la BD")
+    respaldar.add_argument("--carpeta", default=BACKUP_DIR, help="Carpeta de respaldos (default: %(default)s)")
+    respaldar.add_argument("--retener", type=int, default=BACKUP_RETENCION,
+                           help="Respaldos a conservar, 0 = todos (default: %(default)s)")
+    respaldar.set_defaults(funcion=_comando_respaldar)
+    
+    migrar = subparsers.add_parser("migrar", help="Copia las tablas a otra BD por lotes")
+    migrar.add_argument("destino", help="BD SQLite de destino")
+    migrar.add_argument("--estado", default=None,
+                        help="Archivo de avance (default: DESTINO.estado.json)")
+    migrar.add_argument("--lote", type=int, default=500, help="Filas por lote")
+    migrar.set_defaults(funcion=_comando_migrar)
+    
+    servir = subparsers.add_parser("servir", help="API HTTP de solo lectura")
+    servir.add_argument("--host", default="127.0.0.1", help="Dirección (default: %(default)s)")
+    servir.add_argument("--puerto", type=int, default=8080, help="Puerto (default: %(default)s)")
+    servir.set_defaults(funcion=_comando_servir)
+    
+    publicar = subparsers.add_parser("publicar", help="Publica páginas estáticas JSON/HTML")
+    publicar.add_argument("--carpeta", default=PUBLICACION_DIR, help="Carpeta de salida (default: %(default)s)")
+    publicar.set_defaults(funcion=_comando_publicar)
+    
+    cambios = subparsers.add_parser("cambios", help="Lista el registro de cambios")
+    cambios.add_argument("--desde", type=int, default=0, help="Último seq ya procesado")
+    cambios.add_argument("--tabla", choices=["personas", "asignaciones"], default=None)
+    cambios.add_argument("--limite", type=int, default=1000, help="Máximo de cambios")
+    cambios.set_defaults(funcion=_comando_cambios)
+    
+    central = subparsers.add_parser("central", help="Servidor central de sincronización (prueba)")
+    central.add_argument("archivo", help="BD SQLite de la central")
+    central.add_argument("--host", default="127.0.0.1", help="Dirección (default: %(default)s)")
+    central.add_argument("--puerto", type=int, default=8081, help="Puerto (default: %(default)s)")
+    central.set_defaults(funcion=_comando_central)
+    
+    sincronizar = subparsers.add_parser("sincronizar", help="Sincroniza con la central")
+    sincronizar.add_argument("central", help="URL de la central o ruta a su BD")
+    sincronizar.add_argument("--lote", type=int, default=200, help="Cambios por envío")
+    sincronizar.set_defaults(funcion=_comando_sincronizar)
+    
+    esquema = subparsers.add_parser("esquema", help="Versión del esquema y migraciones pendientes")
+    esquema.add_argument("--solo-ver", action="store_true", help="No aplica las migraciones")
+    esquema.set_defaults(funcion=_comando_esquema)
+    
+    estadisticas = subparsers.add_parser("estadisticas", help="Turnos por puesto, grupo y persona")
+    estadisticas.add_argument("--desde", type=_fecha, default=None, help="Primer día (AAAA-MM-DD)")
+    estadisticas.add_argument("--hasta", type=_fecha, default=None, help="Último día (AAAA-MM-DD)")
+    estadisticas.add_argument("--limite", type=int, default=20, help="Personas a mostrar")
+    estadisticas.add_argument("--json", action="store_true", help="Salida completa en JSON")
+    estadisticas.set_defaults(funcion=_comando_estadisticas)
+    
+    reemplazos = subparsers.add_parser("reemplazos", help="Candidatos para cubrir un puesto")
+    reemplazos.add_argument("id", type=int, help="Id de la asignación")
+    reemplazos.add_argument("columna", choices=COLUMNAS_PERSONAS, help="Puesto a cubrir")
+    reemplazos.add_argument("--limite", type=int, default=10, help="Candidatos a mostrar")
+    reemplazos.set_defaults(funcion=_comando_reemplazos)
+    
+    plantel = subparsers.add_parser("plantel", help="Personas activas hoy o en una fecha")
+    plantel.add_argument("--tipo", choices=[t.value for t in TipoPersona], default=TipoPersona.ACOMODADOR.value)
+    plantel.add_argument("--al", type=_fecha, default=None, help="Fecha (AAAA-MM-DD; default: hoy)")
+    plantel.add_argument("--inactivos", action="store_true", help="Incluye las inactivas")
+    plantel.set_defaults(funcion=_comando_plantel)
+    
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada del modo línea de comandos"""
+    inicio = time.perf_counter()
+    args = crear_parser().parse_args(argv)
+    contexto = ContextoAplicacion(args.db, inicio=inicio)
+    
+    if args.consultas is not None:
+        INSTRUMENTACION.activar(args.consultas)
+    with INSTRUMENTACION.accion(f"cli {args.comando}"):
+        resultado = args.funcion(args, contexto, contexto.registrar_etapa)
+    
+    if args.consultas is not None:
+        print(INSTRUMENTACION.reporte(), file=sys.stderr)
+    
+    if args.tiempos:
+        print(contexto.reporte_inicio("Tiempos por etapa"), file=sys.stderr)
+    return resultado
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,4 +13,16 @@ COLORES = {
 FUENTES = {
     'titulo': ('Arial', 15, 'bold'),
     'listbox': ('Arial', 10)
-    }
\ No newline at end of file
+    }
+
+# Encabezados de una asignación (mismo orden que Asignacion.to_tuple)
+ENCABEZADOS_ASIGNACION = [
+    'Semanas',
+    'Acomodadores 1° hora',
+    'Acomodadores 2° hora',
+    'Acomodador final',
+    'Vigilancia 1° hora',
+    'Vigilancia 2° hora',
+    'Vigilancia final',
+    'Días de reunión'
+]
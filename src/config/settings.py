@@ -0,0 +1,22 @@
+# ============================================================================
+# UBICACIÓN: src/config/settings.py
+# ============================================================================
+
+# Base de datos
+DB_PATH = "asignaciones.db"
+# Segundos que una conexión espera el lock de otra antes de "database is locked"
+DB_ESPERA = 5.0
+
+# Cantidad de ediciones que se pueden deshacer (se guardan en la BD)
+HISTORIAL_PROFUNDIDAD = 100
+
+# Semanas antes y después de la semana a cubrir que cuentan como carga
+# reciente al sugerir reemplazos
+REEMPLAZO_SEMANAS_CARGA = 8
+
+# Respaldos
+BACKUP_DIR = "respaldos"
+BACKUP_RETENCION = 10
+
+# Publicación estática
+PUBLICACION_DIR = "publicado"
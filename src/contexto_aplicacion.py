@@ -0,0 +1,302 @@
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from src.config.settings import DB_PATH
+from src.database.db_manager import DBManager
+from src.database.escritor import EscritorUnico
+
+if TYPE_CHECKING:
+    from src.database.repositories.cambios_repository import CambiosRepository
+    from src.database.repositories.base import AsignacionRepositoryBase, PersonaRepositoryBase
+    from src.services.acomodador_service import AcomodadorService
+    from src.services.vigilancia_service import VigilanciaService
+    from src.services.asignacion_service import AsignacionService
+    from src.services.fecha_service import FechaService
+    from src.services.seleccion_service import SeleccionService
+    from src.services.planificacion_service import PlanificacionService
+    from src.services.export_service import ExportService
+    from src.services.importacion_service import ImportacionService
+    from src.services.backup_service import BackupService
+    from src.services.publicacion_service import PublicacionService
+    from src.services.estadisticas_service import EstadisticasService
+    from src.services.historial_service import HistorialService
+    from src.services.reemplazo_service import ReemplazoService
+    from src.services.diferencias_service import DiferenciasService
+
+class ContextoAplicacion:
+    """
+    Contexto único de la aplicación
+    Es dueño de los repositorios y servicios compartidos (se crean al primer
+    uso), verifica el esquema una sola vez y construye los paneles a pedido.
+    No importa tkinter: los paneles se importan recién al construirlos.
+    """
+    
+    def __init__(self, db_path: str = DB_PATH, inicio: Optional[float] = None):
+        """
+        Args:
+            db_path: Ruta de la BD
+            inicio: Instante (time.perf_counter) desde el que se mide el arranque
+        """
+        self.db_path = db_path
+        self.db_manager = DBManager(db_path)
+        self._inicio = inicio if inicio is not None else time.perf_counter()
+        self._etapas: List[Tuple[str, float]] = []
+        
+        self._persona_repository: Optional["PersonaRepositoryBase"] = None
+        self._asignacion_repository: Optional["AsignacionRepositoryBase"] = None
+        self._cambios_repository: Optional["CambiosRepository"] = None
+        self._acomodador_service: Optional["AcomodadorService"] = None
+        self._vigilancia_service: Optional["VigilanciaService"] = None
+        self._asignacion_service: Optional["AsignacionService"] = None
+        self._fecha_service: Optional["FechaService"] = None
+        self._seleccion_service: Optional["SeleccionService"] = None
+        self._planificacion_service: Optional["PlanificacionService"] = None
+        self._export_service: Optional["ExportService"] = None
+        self._importacion_service: Optional["ImportacionService"] = None
+        self._backup_service: Optional["BackupService"] = None
+        self._publicacion_service: Optional["PublicacionService"] = None
+        self._estadisticas_service: Optional["EstadisticasService"] = None
+        self._historial_service: Optional["HistorialService"] = None
+        self._reemplazo_service: Optional["ReemplazoService"] = None
+        self._diferencias_service: Optional["DiferenciasService"] = None
+    
+    @classmethod
+    def en_memoria(cls, copiar_de: Optional["ContextoAplicacion"] = None) -> "ContextoAplicacion":
+        """
+        Contexto con repositorios en memoria (sin disco), para simulaciones
+        Args:
+            copiar_de: Si se indica, parte de una copia de sus personas y asignaciones
+        """
+        from src.database.repositories.memoria import AsignacionRepositoryMemoria, PersonaRepositoryMemoria
+        contexto = cls(db_path=":memory:")
+        if copiar_de is not None:
+            contexto._persona_repository = PersonaRepositoryMemoria.copiar_de(copiar_de.persona_repository)
+            contexto._asignacion_repository = AsignacionRepositoryMemoria.copiar_de(copiar_de.asignacion_repository)
+        else:
+            contexto._persona_repository = PersonaRepositoryMemoria()
+            contexto._asignacion_repository = AsignacionRepositoryMemoria()
+        return contexto
+    
+    # ------------------------------------------------------------------
+    # Repositorios y servicios (perezosos y compartidos)
+    # ------------------------------------------------------------------
+    
+    def _asegurar_esquema(self):
+        """Verifica el esquema antes del primer acceso a la BD"""
+        if self.db_manager.inicializar_esquema():
+            self.registrar_etapa("esquema")
+    
+    @property
+    def escritor(self) -> EscritorUnico:
+        """Escritor único de la BD (uno por archivo y por proceso)"""
+        return EscritorUnico.para(self.db_path)
+    
+    @property
+    def persona_repository(self) -> "PersonaRepositoryBase":
+        if self._persona_repository is None:
+            from src.database.repositories.persona_repository import PersonaRepository
+            self._asegurar_esquema()
+            self._persona_repository = PersonaRepository(self.db_path, self.escritor)
+        return self._persona_repository
+    
+    @property
+    def asignacion_repository(self) -> "AsignacionRepositoryBase":
+        if self._asignacion_repository is None:
+            from src.database.repositories.asignacion_repository import AsignacionRepository
+            self._asegurar_esquema()
+            self._asignacion_repository = AsignacionRepository(self.db_path, self.escritor)
+        return self._asignacion_repository
+    
+    @property
+    def cambios_repository(self) -> "CambiosRepository":
+        if self._cambios_repository is None:
+            from src.database.repositories.cambios_repository import CambiosRepository
+            self._asegurar_esquema()
+            self._cambios_repository = CambiosRepository(self.db_path, self.escritor)
+        return self._cambios_repository
+    
+    @property
+    def acomodador_service(self) -> "AcomodadorService":
+        if self._acomodador_service is None:
+            from src.services.acomodador_service import AcomodadorService
+            self._acomodador_service = AcomodadorService(self.persona_repository)
+        return self._acomodador_service
+    
+    @property
+    def vigilancia_service(self) -> "VigilanciaService":
+        if self._vigilancia_service is None:
+            from src.services.vigilancia_service import VigilanciaService
+            self._vigilancia_service = VigilanciaService(self.persona_repository)
+        return self._vigilancia_service
+    
+    @property
+    def asignacion_service(self) -> "AsignacionService":
+        if self._asignacion_service is None:
+            from src.services.asignacion_service import AsignacionService
+            self._asignacion_service = AsignacionService(self.asignacion_repository)
+        return self._asignacion_service
+    
+    @property
+    def fecha_service(self) -> "FechaService":
+        if self._fecha_service is None:
+            from src.services.fecha_service import FechaService
+            self._fecha_service = FechaService()
+        return self._fecha_service
+    
+    @property
+    def seleccion_service(self) -> "SeleccionService":
+        if self._seleccion_service is None:
+            from src.services.seleccion_service import SeleccionService
+            self._seleccion_service = SeleccionService(
+                self.persona_repository, self.asignacion_repository
+            )
+        return self._seleccion_service
+    
+    @property
+    def planificacion_service(self) -> "PlanificacionService":
+        if self._planificacion_service is None:
+            from src.services.planificacion_service import PlanificacionService
+            self._planificacion_service = PlanificacionService(
+                self.fecha_service, self.acomodador_service,
+                self.vigilancia_service, self.asignacion_service
+            )
+        return self._planificacion_service
+    
+    @property
+    def export_service(self) -> "ExportService":
+        if self._export_service is None:
+            from src.services.export_service import ExportService
+            self._export_service = ExportService(self.asignacion_repository)
+        return self._export_service
+    
+    @property
+    def importacion_service(self) -> "ImportacionService":
+        if self._importacion_service is None:
+            from src.services.importacion_service import ImportacionService
+            self._importacion_service = ImportacionService(
+                self.persona_repository, self.asignacion_repository
+            )
+        return self._importacion_service
+    
+    @property
+    def backup_service(self) -> "BackupService":
+        if self._backup_service is None:
+            from src.services.backup_service import BackupService
+            self._backup_service = BackupService(self.db_path)
+        return self._backup_service
+    
+    @property
+    def publicacion_service(self) -> "PublicacionService":
+        if self._publicacion_service is None:
+            from src.services.publicacion_service import PublicacionService
+            self._publicacion_service = PublicacionService(
+                self.asignacion_repository, cambios_repository=self.cambios_repository
+            )
+        return self._publicacion_service
+    
+    @property
+    def estadisticas_service(self) -> "EstadisticasService":
+        if self._estadisticas_service is None:
+            from src.services.estadisticas_service import EstadisticasService
+            self._estadisticas_service = EstadisticasService(
+                self.asignacion_repository, self.vigilancia_service
+            )
+        return self._estadisticas_service
+    
+    @property
+    def historial_service(self) -> "HistorialService":
+        if self._historial_service is None:
+            from src.services.historial_service import HistorialService
+            repository = None
+            if self.db_path != ":memory:":
+                from src.database.repositories.historial_repository import HistorialRepository
+                self._asegurar_esquema()
+                repository = HistorialRepository(self.db_path, self.escritor)
+            self._historial_service = HistorialService(self.asignacion_repository, repository)
+        return self._historial_service
+    
+    @property
+    def reemplazo_service(self) -> "ReemplazoService":
+        if self._reemplazo_service is None:
+            from src.services.reemplazo_service import ReemplazoService
+            self._reemplazo_service = ReemplazoService(
+                self.persona_repository, self.asignacion_repository, self.vigilancia_service,
+                cambios_repository=self.cambios_repository
+            )
+        return self._reemplazo_service
+    
+    @property
+    def diferencias_service(self) -> "DiferenciasService":
+        if self._diferencias_service is None:
+            from src.services.diferencias_service import DiferenciasService
+            self._diferencias_service = DiferenciasService(self.asignacion_repository)
+        return self._diferencias_service
+    
+    # ------------------------------------------------------------------
+    # Paneles (se importan y construyen a pedido)
+    # ------------------------------------------------------------------
+    
+    def crear_panel_acomodadores(self, parent, **kwargs):
+        """Construye el panel de acomodadores con el servicio compartido"""
+        from src.ui.components.acomodador_panel import AcomodadoresPanel
+        from src.ui.perfilador import PERFILADOR
+        panel = AcomodadoresPanel(parent, service=PERFILADOR.servicio(self.acomodador_service), **kwargs)
+        self.registrar_etapa("panel acomodadores")
+        return panel
+    
+    def crear_panel_vigilancia(self, parent, **kwargs):
+        """Construye el panel de vigilancia con el servicio compartido"""
+        from src.ui.components.vigilancia_panel import VigilanciaPanel
+        from src.ui.perfilador import PERFILADOR
+        panel = VigilanciaPanel(parent, service=PERFILADOR.servicio(self.vigilancia_service), **kwargs)
+        self.registrar_etapa("panel vigilancia")
+        return panel
+    
+    def crear_panel_fechas(self, parent, **kwargs):
+        """Construye el panel de fechas con el servicio compartido"""
+        from src.ui.components.fechas_panel import FechasPanel
+        from src.ui.perfilador import PERFILADOR
+        panel = FechasPanel(parent, service=PERFILADOR.servicio(self.fecha_service), **kwargs)
+        self.registrar_etapa("panel fechas")
+        return panel
+    
+    def crear_tabla_asignaciones(self, parent, **kwargs):
+        """Construye la tabla de asignaciones con los servicios compartidos"""
+        from src.ui.components.asignaciones_table import AsignacionesTable
+        from src.ui.perfilador import PERFILADOR
+        tabla = AsignacionesTable(
+            parent,
+            asignacion_service=PERFILADOR.servicio(self.asignacion_service),
+            acomodador_service=PERFILADOR.servicio(self.acomodador_service),
+            vigilancia_service=PERFILADOR.servicio(self.vigilancia_service),
+            seleccion_service=PERFILADOR.servicio(self.seleccion_service),
+            historial_service=PERFILADOR.servicio(self.historial_service),
+            reemplazo_service=PERFILADOR.servicio(self.reemplazo_service),
+            **kwargs
+        )
+        self.registrar_etapa("tabla asignaciones")
+        return tabla
+    
+    def crear_ventana_estadisticas(self, parent, **kwargs):
+        """Abre la ventana de estadísticas con el servicio compartido"""
+        from src.ui.components.estadisticas_ventana import VentanaEstadisticas
+        from src.ui.perfilador import PERFILADOR
+        return VentanaEstadisticas(parent, service=PERFILADOR.servicio(self.estadisticas_service), **kwargs)
+    
+    # ------------------------------------------------------------------
+    # Reporte de arranque
+    # ------------------------------------------------------------------
+    
+    def registrar_etapa(self, nombre: str):
+        """Registra el tiempo transcurrido desde el inicio hasta esta etapa"""
+        self._etapas.append((nombre, time.perf_counter() - self._inicio))
+    
+    def reporte_inicio(self, titulo: str = "Tiempos de arranque") -> str:
+        """Devuelve el reporte de tiempos por etapa (en milisegundos)"""
+        lineas = [f"{titulo}:"]
+        anterior = 0.0
+        for nombre, transcurrido in self._etapas:
+            lineas.append(
+                f"  {nombre:<22} {transcurrido * 1000:8.1f} ms  (+{(transcurrido - anterior) * 1000:.1f} ms)"
+            )
+            anterior = transcurrido
+        return "\n".join(lineas)
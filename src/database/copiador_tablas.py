@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from typing import Callable, Dict, List, Optional, Sequence
+from src.config.settings import DB_PATH
+
+log = logging.getLogger(__name__)
+
+class CopiadorTablas:
+    """
+    Copia las tablas de la BD SQLite a otra BD (cualquier conexión DB-API)
+    Lee por id en lotes, inserta con executemany y confirma cada lote. Una
+    copia interrumpida se retoma desde el mayor id del destino; el archivo
+    de estado registra el avance, pero no se le cree más que al destino.
+    """
+    
+    TABLAS = ("personas", "asignaciones")
+    
+    # Marcador de parámetros según el paramstyle del módulo DB-API destino
+    MARCADORES = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+    
+    def __init__(self, destino, archivo_estado: str, db_path: str = DB_PATH,
+                 tamano_lote: int = 500, paramstyle: str = "qmark"):
+        """
+        Args:
+            destino: Conexión DB-API abierta (las tablas deben existir, ver crear_tablas)
+            archivo_estado: Archivo JSON con el avance de la copia
+            db_path: BD SQLite de origen
+            tamano_lote: Filas por lote
+            paramstyle: paramstyle del módulo del destino ("qmark", "format" o "pyformat")
+        """
+        if paramstyle not in self.MARCADORES:
+            raise ValueError(f"paramstyle '{paramstyle}' no soportado")
+        self.destino = destino
+        self.archivo_estado = archivo_estado
+        self.db_path = db_path
+        self.tamano_lote = tamano_lote
+        self.marcador = self.MARCADORES[paramstyle]
+    
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+    
+    def leer_estado(self) -> Dict[str, int]:
+        """Último id copiado por tabla"""
+        if not os.path.exists(self.archivo_estado):
+            return {}
+        with open(self.archivo_estado, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    
+    def _guardar_estado(self, estado: Dict[str, int]):
+        """Escribe el estado de forma atómica (nunca queda a medio escribir)"""
+        temporal = self.archivo_estado + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(estado, archivo)
+        os.replace(temporal, self.archivo_estado)
+    
+    # ------------------------------------------------------------------
+    # Copia
+    # ------------------------------------------------------------------
+    
+    def crear_tablas(self):
+        """Crea en el destino las tablas del origen (sirve para otro SQLite)"""
+        with closing(sqlite3.connect(self.db_path)) as origen:
+            sentencias = [
+                sql for (sql,) in origen.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+                    self.TABLAS
+                )
+            ]
+        cursor = self.destino.cursor()
+        for sql in sentencias:
+            cursor.execute(sql.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+        self.destino.commit()
+    
+    def copiar(self, tablas: Sequence[str] = TABLAS,
+               progreso: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """
+        Copia (o retoma la copia de) las tablas indicadas
+        Args:
+            tablas: Tablas a copiar, en orden
+            progreso: Callback(tabla, filas_copiadas) después de cada lote
+        Returns:
+            Filas copiadas por tabla en esta ejecución
+        """
+        estado = self.leer_estado()
+        copiadas = {}
+        
+        origen = sqlite3.connect(self.db_path)
+        try:
+            for tabla in tablas:
+                copiadas[tabla] = self._copiar_tabla(origen, tabla, estado, progreso)
+        finally:
+            origen.close()
+        return copiadas
+    
+    def _copiar_tabla(self, origen: sqlite3.Connection, tabla: str,
+                      estado: Dict[str, int], progreso) -> int:
+        """Copia una tabla lote por lote, desde el último id confirmado"""
+        if tabla not in self.TABLAS:
+            raise ValueError(f"Tabla desconocida: '{tabla}'")
+        
+        columnas = self._columnas(origen, tabla)
+        insertar = (
+            f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+            f"VALUES ({', '.join([self.marcador] * len(columnas))})"
+        )
+        # El destino manda: si el estado quedó atrasado (corte entre el commit y
+        # la escritura del estado) no se reinserta lo confirmado, y si quedó
+        # adelantado (destino recreado o vaciado) no se saltea lo que falta
+        ultimo_id = self._maximo_id_destino(tabla)
+        if estado.get(tabla, 0) > ultimo_id:
+            log.warning(
+                "El estado de la copia de %s (id %s) está adelantado respecto del destino (id %s): "
+                "se retoma desde el destino", tabla, estado[tabla], ultimo_id
+            )
+        estado[tabla] = ultimo_id
+        total = 0
+        cursor = self.destino.cursor()
+        
+        while True:
+            lote = origen.execute(
+                f"SELECT {', '.join(columnas)} FROM {tabla} WHERE id > ? ORDER BY id LIMIT ?",
+                (ultimo_id, self.tamano_lote)
+            ).fetchall()
+            if not lote:
+                break
+            
+            cursor.executemany(insertar, lote)
+            self.destino.commit()
+            
+            ultimo_id = lote[-1][0]
+            estado[tabla] = ultimo_id
+            self._guardar_estado(estado)
+            total += len(lote)
+            if progreso:
+                progreso(tabla, total)
+        
+        return total
+    
+    @staticmethod
+    def _columnas(origen: sqlite3.Connection, tabla: str) -> List[str]:
+        """Columnas de la tabla, con id primero"""
+        columnas = [fila[1] for fila in origen.execute(f"PRAGMA table_info({tabla})")]
+        columnas.remove("id")
+        return ["id"] + columnas
+    
+    def _maximo_id_destino(self, tabla: str) -> int:
+        cursor = self.destino.cursor()
+        cursor.execute(f"SELECT MAX(id) FROM {tabla}")
+        fila = cursor.fetchone()
+        return (fila[0] if fila else None) or 0
@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import threading
+from src.config.settings import DB_PATH
+from src.database.instrumentacion import conectar
+from src.database.migraciones import COLUMNAS_CAMBIOS, Migrador
+
+class DBManager:
+    """
+    Gestor principal de la BD
+    Verifica el esquema una sola vez por archivo y por proceso: una lectura
+    de PRAGMA user_version y, solo si hace falta, las migraciones pendientes
+    """
+    
+    _inicializadas: set = set()
+    _lock = threading.Lock()
+    
+    # Columnas que se copian al registro de cambios (ver migraciones.py)
+    COLUMNAS_CAMBIOS = COLUMNAS_CAMBIOS
+    
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+    
+    def conectar(self) -> sqlite3.Connection:
+        """Abre una conexión nueva a la BD"""
+        return conectar(self.db_path)
+    
+    @property
+    def _clave(self) -> str:
+        return os.path.abspath(self.db_path)
+    
+    @property
+    def inicializada(self) -> bool:
+        """Indica si el esquema ya fue verificado en este proceso"""
+        return self._clave in self._inicializadas
+    
+    def inicializar_esquema(self) -> bool:
+        """
+        Aplica las migraciones pendientes (solo la primera vez por archivo)
+        Returns: True si se ejecutó la verificación, False si ya estaba hecha
+        """
+        if self.inicializada:
+            return False
+        
+        with self._lock:
+            if self.inicializada:
+                return False
+            
+            Migrador(self.db_path).migrar()
+            self._inicializadas.add(self._clave)
+            return True
@@ -0,0 +1,220 @@
+"""
+Escritor único de la BD
+
+Varias ventanas, la CLI y el servidor HTTP pueden usar el mismo archivo.
+Si cada uno abre su conexión y escribe por su cuenta, las escrituras
+compiten por el lock y aparece "database is locked". Aquí todas las
+escrituras del proceso pasan por una cola que atiende un solo hilo con una
+sola conexión. Los pedidos que esperan en la cola se confirman juntos en una
+transacción (group commit), cada uno dentro de su SAVEPOINT: si uno falla,
+solo se deshace ese. Con la BD en modo WAL los lectores usan sus propias
+conexiones y leen una instantánea consistente sin esperar al escritor.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future, InvalidStateError
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, TypeVar
+from src.database.instrumentacion import INSTRUMENTACION, conectar
+
+T = TypeVar("T")
+
+class EscritorUnico:
+    """Serializa las escrituras de un archivo SQLite en un hilo propio"""
+    
+    MAX_LOTE = 100
+    
+    _instancias: Dict[str, "EscritorUnico"] = {}
+    _lock_instancias = threading.Lock()
+    
+    def __init__(self, db_path: str, max_lote: int = MAX_LOTE, espera: float = 5.0):
+        """
+        Args:
+            db_path: Ruta de la BD
+            max_lote: Máximo de pedidos confirmados en una misma transacción
+            espera: Segundos que se espera si otro proceso tiene el lock
+        """
+        self.db_path = db_path
+        self.max_lote = max_lote
+        self.espera = espera
+        self._cola: "queue.Queue" = queue.Queue()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Estadísticas (pedidos atendidos y transacciones confirmadas)
+        self.escrituras = 0
+        self.confirmaciones = 0
+    
+    @classmethod
+    def para(cls, db_path: str) -> "EscritorUnico":
+        """Escritor compartido de un archivo (uno por archivo y por proceso)"""
+        clave = os.path.abspath(db_path)
+        with cls._lock_instancias:
+            if clave not in cls._instancias:
+                cls._instancias[clave] = cls(db_path)
+            return cls._instancias[clave]
+    
+    # ------------------------------------------------------------------
+    # Escrituras
+    # ------------------------------------------------------------------
+    
+    def enviar(self, funcion: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """
+        Encola una escritura sin esperar a que termine
+        Args:
+            funcion: Recibe la conexión del escritor y ejecuta sus sentencias
+                (sin BEGIN/COMMIT: la transacción la maneja el escritor)
+        Returns:
+            Future con lo que devuelva la función, resuelto tras el COMMIT
+        """
+        futuro: "Future[T]" = Future()
+        with self._lock:
+            # Bajo el mismo lock que _detener: el pedido no queda en la cola de un hilo muerto
+            self._iniciar()
+            # La función corre en el contexto del llamador (acción y servicio que la pidieron)
+            self._cola.put((INSTRUMENTACION.contexto_llamador(), funcion, futuro))
+        return futuro
+    
+    def escribir(self, funcion: Callable[[sqlite3.Connection], T]) -> T:
+        """Encola una escritura y espera a que quede confirmada"""
+        if threading.current_thread() is self._hilo:
+            raise RuntimeError("Una escritura no puede encolar otra escritura")
+        return self.enviar(funcion).result()
+    
+    def cerrar(self):
+        """Atiende lo que quede en la cola y detiene el hilo"""
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+            if hilo is not None:
+                self._cola.put(None)
+        if hilo is not None:
+            hilo.join()
+    
+    def _iniciar(self):
+        """Arranca el hilo si no está corriendo (se llama con self._lock tomado)"""
+        if self._hilo is None:
+            self._hilo = threading.Thread(
+                target=self._bucle, name="escritor-bd", daemon=True
+            )
+            self._hilo.start()
+    
+    def _bucle(self):
+        lote: list = []
+        try:
+            conn = conectar(self.db_path, timeout=self.espera, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                terminar = False
+                while not terminar:
+                    pedido = self._cola.get()
+                    if pedido is None:
+                        break
+                    lote = [pedido]
+                    # Todo lo que ya está esperando se confirma en la misma transacción
+                    while len(lote) < self.max_lote:
+                        try:
+                            pedido = self._cola.get_nowait()
+                        except queue.Empty:
+                            break
+                        if pedido is None:
+                            terminar = True
+                            break
+                        lote.append(pedido)
+                    self._ejecutar_lote(conn, lote)
+                    lote = []
+            finally:
+                conn.close()
+        except Exception as e:
+            # Sin conexión usable (p.ej. falló connect, el modo WAL o el ROLLBACK)
+            self._detener(e, lote)
+    
+    def _detener(self, error: Exception, lote: list):
+        """
+        Da por muerto el hilo actual: falla su lote y lo que quedó en la cola
+        El próximo enviar arranca un hilo nuevo, con una conexión nueva.
+        """
+        with self._lock:
+            if self._hilo is threading.current_thread():
+                self._hilo = None
+            while True:
+                try:
+                    pedido = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if pedido is not None:
+                    lote.append(pedido)
+        for _, _, futuro in lote:
+            self._resolver(futuro, error=error)
+    
+    def _ejecutar_lote(self, conn: sqlite3.Connection, lote: list):
+        resultados = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for contexto, funcion, futuro in lote:
+                if not futuro.set_running_or_notify_cancel():
+                    continue  # Cancelado mientras esperaba en la cola: no se ejecuta
+                conn.execute("SAVEPOINT pedido")
+                try:
+                    resultados.append((futuro, contexto.run(funcion, conn), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO pedido")
+                    resultados.append((futuro, None, e))
+                conn.execute("RELEASE pedido")
+            conn.execute("COMMIT")
+        except Exception as e:
+            # Falló la transacción entera (p.ej. otro proceso tiene el lock)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, _, futuro in lote:
+                self._resolver(futuro, error=e)
+            return
+        
+        self.escrituras += len(lote)
+        self.confirmaciones += 1
+        # Los resultados se entregan recién después del COMMIT
+        for futuro, resultado, error in resultados:
+            self._resolver(futuro, resultado, error)
+    
+    @staticmethod
+    def _resolver(futuro: Future, resultado=None, error: Optional[Exception] = None):
+        """Entrega el resultado de un pedido (si quien lo pidió lo canceló, se ignora)"""
+        try:
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+        except InvalidStateError:
+            pass
+    
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+    
+    @contextmanager
+    def lector(self):
+        """
+        Conexión de solo lectura con una instantánea consistente
+        Todas las consultas hechas dentro del bloque ven el mismo estado de
+        la BD, aunque el escritor confirme cambios mientras tanto.
+        """
+        conn = conectar(self.db_path, timeout=self.espera, isolation_level=None)
+        try:
+            conn.execute("PRAGMA query_only = 1")
+            conn.execute("BEGIN")
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.close()
+
+def escribir(db_path: str, funcion: Callable[[sqlite3.Connection], T],
+             escritor: Optional[EscritorUnico] = None) -> T:
+    """
+    Ejecuta una escritura por el escritor único o, si no hay, en una conexión propia
+    En ambos casos la función corre dentro de una transacción: o se guarda todo o nada.
+    """
+    if escritor is not None:
+        return escritor.escribir(funcion)
+    with conectar(db_path) as conn:
+        return funcion(conn)
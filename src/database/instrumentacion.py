@@ -0,0 +1,286 @@
+"""
+Instrumentación opcional de las consultas a la BD
+
+Desactivada no cuesta nada: conectar() devuelve una conexión común. Activada,
+cada conexión abierta por los repositorios cuenta sentencias, filas devueltas
+y tiempo por sentencia, agrupados por acción (lo que hizo el usuario, p.ej.
+"VigilanciaPanel.actualizar_lista") y por la llamada al servicio que originó
+la consulta (p.ej. "VigilanciaService.obtener_grupos"). Las sentencias que
+superan el umbral se informan con logging como consultas lentas.
+
+Uso:
+    INSTRUMENTACION.activar(umbral_lento_ms=50)
+    with INSTRUMENTACION.accion("VigilanciaPanel.actualizar_lista"):
+        panel.actualizar_lista()
+    print(INSTRUMENTACION.reporte())
+"""
+import contextvars
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+from src.config import settings
+
+log = logging.getLogger(__name__)
+
+SIN_ACCION = "(sin acción)"
+SIN_SERVICIO = "(directo)"
+
+_ACCION: contextvars.ContextVar = contextvars.ContextVar("accion", default=None)
+_SERVICIO: contextvars.ContextVar = contextvars.ContextVar("servicio", default=None)
+
+_CARPETA_SERVICIOS = os.path.join("src", "services") + os.sep
+
+@dataclass
+class Contadores:
+    """Contadores de una acción, servicio o sentencia"""
+    conexiones: int = 0
+    consultas: int = 0
+    filas: int = 0
+    segundos: float = 0.0
+    
+    def sumar(self, conexiones: int = 0, consultas: int = 0, filas: int = 0, segundos: float = 0.0):
+        self.conexiones += conexiones
+        self.consultas += consultas
+        self.filas += filas
+        self.segundos += segundos
+
+@dataclass
+class ResumenAccion(Contadores):
+    """Totales de una acción, con el detalle por servicio y por sentencia"""
+    nombre: str = ""
+    veces: int = 0
+    servicios: Dict[str, Contadores] = field(default_factory=dict)
+    sentencias: Dict[str, Contadores] = field(default_factory=dict)
+    
+    def __str__(self) -> str:
+        veces = max(self.veces, 1)
+        lineas = [
+            f"{self.nombre}: {self.veces} veces - {self.consultas} consultas "
+            f"({self.consultas / veces:.1f} por vez), {self.conexiones} conexiones, "
+            f"{self.filas} filas, {self.segundos * 1000:.1f} ms"
+        ]
+        for servicio, c in sorted(self.servicios.items(), key=lambda x: -x[1].segundos):
+            lineas.append(
+                f"    {servicio:<45} {c.consultas:6} consultas {c.filas:8} filas {c.segundos * 1000:9.1f} ms"
+            )
+        return "\n".join(lineas)
+
+class Instrumentacion:
+    """Estado de la instrumentación (una instancia por proceso: INSTRUMENTACION)"""
+    
+    UMBRAL_LENTO_MS = 100
+    
+    def __init__(self):
+        self.activa = False
+        self.umbral_lento = self.UMBRAL_LENTO_MS / 1000
+        self._lock = threading.Lock()
+        self._acciones: Dict[str, ResumenAccion] = {}
+    
+    def activar(self, umbral_lento_ms: float = UMBRAL_LENTO_MS):
+        """Empieza a medir las conexiones abiertas desde ahora"""
+        self.umbral_lento = umbral_lento_ms / 1000
+        self.activa = True
+    
+    def desactivar(self):
+        self.activa = False
+    
+    def reiniciar(self):
+        """Descarta lo medido hasta ahora"""
+        with self._lock:
+            self._acciones.clear()
+    
+    # ------------------------------------------------------------------
+    # Acciones
+    # ------------------------------------------------------------------
+    
+    @contextmanager
+    def accion(self, nombre: str):
+        """
+        Agrupa bajo `nombre` las consultas hechas dentro del bloque
+        Si ya hay una acción en curso, las consultas siguen contando para
+        ella (la acción es lo que inició el usuario, no cada paso interno).
+        """
+        if not self.activa or _ACCION.get() is not None:
+            yield
+            return
+        token = _ACCION.set(nombre)
+        with self._lock:
+            self._resumen(nombre).veces += 1
+        try:
+            yield
+        finally:
+            _ACCION.reset(token)
+    
+    def contexto_llamador(self) -> contextvars.Context:
+        """
+        Copia del contexto actual con el servicio que llama ya resuelto
+        Sirve para ejecutar en otro hilo (p.ej. el escritor único) y seguir
+        atribuyendo las consultas a la acción y al servicio que las pidieron.
+        """
+        contexto = contextvars.copy_context()
+        if self.activa and _SERVICIO.get() is None:
+            contexto.run(_SERVICIO.set, self._servicio_llamador())
+        return contexto
+    
+    @staticmethod
+    def _servicio_llamador() -> str:
+        """Primer método de servicio de la pila (el punto de entrada a la capa de servicios)"""
+        servicio = _SERVICIO.get()
+        if servicio is not None:
+            return servicio
+        servicio = SIN_SERVICIO
+        frame = sys._getframe(1)
+        while frame is not None:
+            if _CARPETA_SERVICIOS in frame.f_code.co_filename:
+                servicio = frame.f_code.co_qualname
+            frame = frame.f_back
+        return servicio
+    
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    
+    def _resumen(self, accion: str) -> ResumenAccion:
+        resumen = self._acciones.get(accion)
+        if resumen is None:
+            resumen = self._acciones[accion] = ResumenAccion(nombre=accion)
+        return resumen
+    
+    def _clave(self, sql: str = "") -> Tuple[str, str, str]:
+        return (_ACCION.get() or SIN_ACCION, self._servicio_llamador(), " ".join(sql.split()))
+    
+    def registrar(self, clave: Tuple[str, str, str], conexiones: int = 0, consultas: int = 0,
+                  filas: int = 0, segundos: float = 0.0):
+        accion, servicio, sql = clave
+        with self._lock:
+            resumen = self._resumen(accion)
+            resumen.sumar(conexiones, consultas, filas, segundos)
+            resumen.servicios.setdefault(servicio, Contadores()).sumar(conexiones, consultas, filas, segundos)
+            if sql:
+                resumen.sentencias.setdefault(sql, Contadores()).sumar(0, consultas, filas, segundos)
+    
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    
+    def resumen(self) -> Dict[str, ResumenAccion]:
+        """Totales por acción (copia: se puede leer mientras se sigue midiendo)"""
+        with self._lock:
+            return {
+                nombre: ResumenAccion(
+                    r.conexiones, r.consultas, r.filas, r.segundos, r.nombre, r.veces,
+                    {k: Contadores(**vars(v)) for k, v in r.servicios.items()},
+                    {k: Contadores(**vars(v)) for k, v in r.sentencias.items()},
+                )
+                for nombre, r in self._acciones.items()
+            }
+    
+    def reporte(self, sentencias: int = 5) -> str:
+        """
+        Reporte legible por acción
+        Args:
+            sentencias: Cantidad de sentencias más costosas a mostrar por acción
+        """
+        lineas = ["Consultas por acción:"]
+        for resumen in sorted(self.resumen().values(), key=lambda r: -r.segundos):
+            lineas.append(f"  {resumen}")
+            costosas = sorted(resumen.sentencias.items(), key=lambda x: -x[1].segundos)[:sentencias]
+            for sql, c in costosas:
+                lineas.append(f"      {c.consultas:6}x {c.segundos * 1000:9.1f} ms  {sql[:90]}")
+        return "\n".join(lineas)
+
+INSTRUMENTACION = Instrumentacion()
+
+class _CursorMedido(sqlite3.Cursor):
+    """Cursor que anota cada sentencia y las filas que devuelve"""
+    
+    _clave = None
+    _segundos = 0.0
+    _informada = False
+    
+    def _medir(self, inicio: float, filas: int = 0, consultas: int = 0):
+        if self._clave is None:
+            return
+        segundos = time.perf_counter() - inicio
+        self._segundos += segundos
+        INSTRUMENTACION.registrar(self._clave, consultas=consultas, filas=filas, segundos=segundos)
+        if not self._informada and self._segundos >= INSTRUMENTACION.umbral_lento:
+            self._informada = True
+            accion, servicio, sql = self._clave
+            log.warning("Consulta lenta (%.1f ms) en %s / %s: %s",
+                        self._segundos * 1000, accion, servicio, sql)
+    
+    def execute(self, sql, parametros=()):
+        self._clave, self._segundos, self._informada = INSTRUMENTACION._clave(sql), 0.0, False
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parametros)
+        finally:
+            self._medir(inicio, consultas=1)
+    
+    def executemany(self, sql, parametros):
+        self._clave, self._segundos, self._informada = INSTRUMENTACION._clave(sql), 0.0, False
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, parametros)
+        finally:
+            self._medir(inicio, consultas=1)
+    
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = super().fetchone()
+        self._medir(inicio, filas=int(fila is not None))
+        return fila
+    
+    def fetchmany(self, *args, **kwargs):
+        inicio = time.perf_counter()
+        filas = super().fetchmany(*args, **kwargs)
+        self._medir(inicio, filas=len(filas))
+        return filas
+    
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = super().fetchall()
+        self._medir(inicio, filas=len(filas))
+        return filas
+    
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            fila = super().__next__()
+        except StopIteration:
+            self._medir(inicio)
+            raise
+        self._medir(inicio, filas=1)
+        return fila
+
+class _ConexionMedida(sqlite3.Connection):
+    """Conexión cuyos cursores son _CursorMedido (también los de conn.execute)"""
+    
+    def cursor(self, factory=_CursorMedido):
+        return super().cursor(factory)
+    
+    # sqlite3.Connection.execute crea su cursor sin pasar por cursor()
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+    
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+def conectar(db_path: str, **kwargs) -> sqlite3.Connection:
+    """
+    Abre una conexión a la BD (medida si la instrumentación está activa)
+    Acepta los mismos argumentos que sqlite3.connect; si no se indica
+    timeout, espera el lock de otra conexión settings.DB_ESPERA segundos.
+    """
+    kwargs.setdefault("timeout", settings.DB_ESPERA)
+    if not INSTRUMENTACION.activa:
+        return sqlite3.connect(db_path, **kwargs)
+    INSTRUMENTACION.registrar(INSTRUMENTACION._clave(), conexiones=1)
+    return sqlite3.connect(db_path, factory=_ConexionMedida, **kwargs)
@@ -0,0 +1,474 @@
+"""
+Migraciones del esquema, numeradas y aplicadas una sola vez
+
+La versión del esquema se guarda en PRAGMA user_version (en el encabezado
+del archivo): comprobar si hay algo pendiente es una sola lectura barata.
+Cada migración de esquema corre en una transacción junto con el cambio de
+versión. Las migraciones de datos procesan las filas en lotes, cada uno en
+su propia transacción, para no bloquear la BD mientras transforman filas.
+"""
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+from src.utils.date_utils import DateUtils
+
+# Columnas que se copian al registro de cambios (como JSON)
+COLUMNAS_CAMBIOS = {
+    "personas": ["nombre", "apellido", "tipo", "activo", "grupo"],
+    "asignaciones": [
+        "semana", "acomodadores_1hora", "acomodadores_2hora", "acomodador_final",
+        "vigilante_1hora", "vigilante_2hora", "vigilante_final", "dia_reunion"
+    ],
+}
+
+@dataclass
+class Migracion:
+    """Un paso de migración"""
+    version: int
+    descripcion: str
+    # Cambios de esquema (script SQL o función sobre la conexión)
+    esquema: Optional[object] = None
+    # Transformación de datos por lotes: recibe (conexión, último id, tamaño)
+    # y devuelve el último id procesado, o None cuando no quedan filas
+    datos: Optional[Callable[[sqlite3.Connection, int, int], Optional[int]]] = None
+
+# ----------------------------------------------------------------------
+# Pasos
+# ----------------------------------------------------------------------
+
+_ESQUEMA_INICIAL = """
+    CREATE TABLE IF NOT EXISTS personas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL,
+        apellido TEXT NOT NULL,
+        tipo TEXT NOT NULL,
+        activo INTEGER DEFAULT 1,
+        grupo INTEGER
+    );
+    
+    CREATE TABLE IF NOT EXISTS asignaciones (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        semana TEXT NOT NULL,
+        acomodadores_1hora TEXT NOT NULL,
+        acomodadores_2hora TEXT NOT NULL,
+        acomodador_final TEXT NOT NULL,
+        vigilante_1hora TEXT NOT NULL,
+        vigilante_2hora TEXT NOT NULL,
+        vigilante_final TEXT NOT NULL,
+        dia_reunion TEXT NOT NULL,
+        fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+def _registro_cambios(conn: sqlite3.Connection):
+    """
+    Tabla 'cambios' y los triggers que anotan cada escritura
+    Insertar y actualizar guardan la fila nueva; borrar guarda la anterior.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cambios (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabla TEXT NOT NULL,
+            fila_id INTEGER NOT NULL,
+            operacion TEXT NOT NULL,
+            datos TEXT,
+            fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    for tabla, columnas in COLUMNAS_CAMBIOS.items():
+        for evento, operacion, fila in (("INSERT", "insertar", "NEW"),
+                                        # Solo las columnas que viajan: las derivadas no son cambios
+                                        (f"UPDATE OF {', '.join(columnas)}", "actualizar", "NEW"),
+                                        ("DELETE", "borrar", "OLD")):
+            datos = ", ".join(f"'{c}', {fila}.{c}" for c in columnas)
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {tabla}_{operacion}_cambios
+                AFTER {evento} ON {tabla}
+                BEGIN
+                    INSERT INTO cambios (tabla, fila_id, operacion, datos)
+                    VALUES ('{tabla}', {fila}.id, '{operacion}', json_object({datos}));
+                END
+            """)
+
+def _cambios_solo_columnas_registradas(conn: sqlite3.Connection):
+    """
+    Rehace los triggers de UPDATE del registro de cambios como UPDATE OF
+    Las BD creadas antes anotaban cualquier UPDATE, también los que solo
+    tocan columnas derivadas (p.ej. completar semana_lunes): cada uno era un
+    cambio falso que la sincronización volvía a enviar.
+    """
+    for tabla in COLUMNAS_CAMBIOS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {tabla}_actualizar_cambios")
+    _registro_cambios(conn)
+
+_SINCRONIZACION = """
+    CREATE TABLE IF NOT EXISTS sync_filas (
+        tabla TEXT NOT NULL,
+        fila_id INTEGER NOT NULL,
+        uid TEXT NOT NULL UNIQUE,
+        version INTEGER NOT NULL DEFAULT 0,
+        huella TEXT,
+        PRIMARY KEY (tabla, fila_id)
+    );
+    
+    CREATE TABLE IF NOT EXISTS sync_estado (
+        clave TEXT PRIMARY KEY,
+        valor TEXT NOT NULL
+    );
+"""
+
+def _agregar_columna(conn: sqlite3.Connection, tabla: str, columna: str, tipo: str):
+    """ALTER TABLE ADD COLUMN que se puede repetir sin error"""
+    existentes = {fila[1] for fila in conn.execute(f"PRAGMA table_info({tabla})")}
+    if columna not in existentes:
+        conn.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}")
+
+def _columna_semana_lunes(conn: sqlite3.Connection):
+    """Fecha (ISO) del lunes de cada asignación, para filtrar por rango con un índice"""
+    _agregar_columna(conn, "asignaciones", "semana_lunes", "TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS asignaciones_semana_lunes ON asignaciones (semana_lunes)")
+    # Antes de completar la columna: que esos UPDATE no queden en el registro de cambios
+    _cambios_solo_columnas_registradas(conn)
+
+def _completar_semana_lunes(conn: sqlite3.Connection, ultimo_id: int, tamano: int) -> Optional[int]:
+    """Completa semana_lunes a partir del texto de la semana (un lote)"""
+    filas = conn.execute(
+        "SELECT id, semana FROM asignaciones WHERE id > ? AND semana_lunes IS NULL ORDER BY id LIMIT ?",
+        (ultimo_id, tamano)
+    ).fetchall()
+    if not filas:
+        return None
+    
+    valores = []
+    for fila_id, semana in filas:
+        lunes = DateUtils.parsear_semana(semana)
+        if lunes:
+            valores.append((lunes.isoformat(), fila_id))
+    conn.executemany("UPDATE asignaciones SET semana_lunes = ? WHERE id = ?", valores)
+    return filas[-1][0]
+
+# Columnas de asignaciones con nombres de personas; las de acomodadores tienen "A / B"
+_COLUMNAS_TURNOS = COLUMNAS_CAMBIOS["asignaciones"][1:7]
+
+def _personas_de(fila: str) -> List[str]:
+    """
+    Expresiones (columna, nombre) de cada persona de una fila de asignaciones
+    Args:
+        fila: Cómo se nombra la fila en el SQL ("NEW" en un trigger o un alias)
+    """
+    nombres = []
+    for columna in _COLUMNAS_TURNOS:
+        valor = f"{fila}.{columna}"
+        if columna.startswith("acomodadores_"):
+            corte = f"instr({valor}, ' / ')"
+            nombres.append((columna, f"TRIM(CASE WHEN {corte} > 0 THEN substr({valor}, 1, {corte} - 1) ELSE {valor} END)"))
+            nombres.append((columna, f"CASE WHEN {corte} > 0 THEN TRIM(substr({valor}, {corte} + 3)) ELSE '' END"))
+        else:
+            nombres.append((columna, f"TRIM({valor})"))
+    return [f"'{columna}' AS columna, {nombre} AS nombre" for columna, nombre in nombres]
+
+def _tabla_turnos(conn: sqlite3.Connection):
+    """
+    Tabla 'turnos': una fila por persona y asignación, mantenida por triggers
+    Permite contar turnos por persona y puesto con un GROUP BY sobre índices
+    en vez de partir los textos "A / B" de cada asignación.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS turnos (
+            asignacion_id INTEGER NOT NULL,
+            columna TEXT NOT NULL,
+            nombre TEXT NOT NULL,
+            semana_lunes TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS turnos_asignacion ON turnos (asignacion_id)")
+    # Cubren los conteos (todo el historial / un rango): no hace falta leer la tabla
+    conn.execute("CREATE INDEX IF NOT EXISTS turnos_persona ON turnos (nombre, columna, semana_lunes)")
+    conn.execute("CREATE INDEX IF NOT EXISTS turnos_semana ON turnos (semana_lunes, nombre, columna)")
+    
+    insertar = " UNION ALL ".join(
+        f"SELECT NEW.id, {expresion}, NEW.semana_lunes" for expresion in _personas_de("NEW")
+    )
+    insertar = f"INSERT INTO turnos SELECT * FROM ({insertar}) WHERE nombre <> '';"
+    borrar = "DELETE FROM turnos WHERE asignacion_id = OLD.id;"
+    columnas = ", ".join(_COLUMNAS_TURNOS + ["semana_lunes"])
+    for nombre, evento, cuerpo in (("insertar", "INSERT", insertar),
+                                   ("actualizar", f"UPDATE OF {columnas}", borrar + insertar),
+                                   ("borrar", "DELETE", borrar)):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS asignaciones_{nombre}_turnos
+            AFTER {evento} ON asignaciones
+            BEGIN
+                {cuerpo}
+            END
+        """)
+
+def _completar_turnos(conn: sqlite3.Connection, ultimo_id: int, tamano: int) -> Optional[int]:
+    """Carga los turnos de las asignaciones existentes (un lote)"""
+    fila = conn.execute(
+        "SELECT MAX(id) FROM (SELECT id FROM asignaciones WHERE id > ? ORDER BY id LIMIT ?)",
+        (ultimo_id, tamano)
+    ).fetchone()
+    if fila[0] is None:
+        return None
+    
+    hasta = fila[0]
+    conn.execute("DELETE FROM turnos WHERE asignacion_id > ? AND asignacion_id <= ?", (ultimo_id, hasta))
+    expresiones = _personas_de("a")
+    seleccion = " UNION ALL ".join(
+        f"SELECT a.id, {expresion}, a.semana_lunes FROM asignaciones a WHERE a.id > ? AND a.id <= ?"
+        for expresion in expresiones
+    )
+    conn.execute(
+        f"INSERT INTO turnos SELECT * FROM ({seleccion}) WHERE nombre <> ''",
+        (ultimo_id, hasta) * len(expresiones)
+    )
+    return hasta
+
+_HISTORIAL = """
+    CREATE TABLE IF NOT EXISTS historial_comandos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        descripcion TEXT NOT NULL,
+        deshecho INTEGER NOT NULL DEFAULT 0,
+        fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    CREATE TABLE IF NOT EXISTS historial_ediciones (
+        comando_id INTEGER NOT NULL,
+        orden INTEGER NOT NULL,
+        fila_id INTEGER NOT NULL,
+        columna TEXT NOT NULL,
+        anterior TEXT NOT NULL,
+        nuevo TEXT NOT NULL,
+        PRIMARY KEY (comando_id, orden)
+    ) WITHOUT ROWID
+"""
+
+def _revision_de_filas(conn: sqlite3.Connection):
+    """
+    Revisión de cada persona y asignación para el control optimista
+    Las escrituras la incrementan; una edición que leyó otra revisión falla
+    en lugar de pisar el cambio ajeno.
+    """
+    for tabla in ("personas", "asignaciones"):
+        _agregar_columna(conn, tabla, "revision", "INTEGER NOT NULL DEFAULT 0")
+
+# Comienzo de los períodos anteriores al registro de cambios ("desde siempre")
+FECHA_INICIAL = "0001-01-01"
+
+def _membresias(conn: sqlite3.Connection):
+    """
+    Períodos de actividad de cada persona (y su grupo en cada período)
+    Cada período es [desde, hasta) con hasta NULL mientras sigue vigente. No
+    se superponen, así que el que rige en una fecha es el de mayor `desde`
+    anterior a ella: una búsqueda en la clave primaria. Los triggers cierran
+    y abren períodos cuando cambian activo o grupo.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS membresias (
+            persona_id INTEGER NOT NULL,
+            desde TEXT NOT NULL,
+            hasta TEXT,
+            grupo INTEGER,
+            PRIMARY KEY (persona_id, desde)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS membresias_grupo ON membresias (grupo, desde)")
+    # Cambios de cada fila en orden: cada lote de _completar_membresias lee solo los suyos
+    conn.execute("CREATE INDEX IF NOT EXISTS cambios_fila ON cambios (tabla, fila_id, seq)")
+    
+    hoy = "date('now', 'localtime')"
+    abrir = f"INSERT INTO membresias (persona_id, desde, grupo) SELECT NEW.id, {hoy}, NEW.grupo WHERE NEW.activo = 1;"
+    cerrar = (
+        f"UPDATE membresias SET hasta = {hoy} WHERE persona_id = NEW.id AND hasta IS NULL;"
+        # Un período abierto y cerrado el mismo día no rigió nunca
+        "DELETE FROM membresias WHERE persona_id = NEW.id AND hasta = desde;"
+    )
+    for nombre, evento, condicion, cuerpo in (
+        ("insertar", "INSERT", "", abrir),
+        ("actualizar", "UPDATE OF activo, grupo",
+         "WHEN OLD.activo IS NOT NEW.activo OR OLD.grupo IS NOT NEW.grupo", cerrar + abrir),
+        ("borrar", "DELETE", "", "DELETE FROM membresias WHERE persona_id = OLD.id;"),
+    ):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS personas_{nombre}_membresias
+            AFTER {evento} ON personas {condicion}
+            BEGIN
+                {cuerpo}
+            END
+        """)
+
+def _completar_membresias(conn: sqlite3.Connection, ultimo_id: int, tamano: int) -> Optional[int]:
+    """Reconstruye los períodos de las personas existentes (un lote)"""
+    fila = conn.execute(
+        "SELECT MAX(id) FROM (SELECT id FROM personas WHERE id > ? ORDER BY id LIMIT ?)",
+        (ultimo_id, tamano)
+    ).fetchone()
+    if fila[0] is None:
+        return None
+    
+    hasta = fila[0]
+    # Reemplaza lo del lote: también lo que abrieron los triggers mientras tanto
+    # (esos cambios ya están en el registro y se vuelven a reconstruir)
+    conn.execute("DELETE FROM membresias WHERE persona_id > ? AND persona_id <= ?", (ultimo_id, hasta))
+    conn.executemany(
+        "INSERT INTO membresias (persona_id, desde, hasta, grupo) VALUES (?, ?, ?, ?)",
+        list(_periodos_registrados(conn, ultimo_id, hasta))
+    )
+    return hasta
+
+def _periodos_registrados(conn: sqlite3.Connection, desde_id: int, hasta_id: int) -> Iterator[tuple]:
+    """
+    Reconstruye los períodos de las personas con id en (desde_id, hasta_id]
+    Lo anterior al primer cambio registrado se toma como vigente desde
+    siempre (FECHA_INICIAL); una persona sin cambios hereda su estado actual.
+    """
+    eventos: Dict[int, List[tuple]] = {}
+    for fila_id, operacion, datos, fecha in conn.execute(
+        "SELECT fila_id, operacion, datos, fecha FROM cambios "
+        "WHERE tabla = 'personas' AND fila_id > ? AND fila_id <= ? ORDER BY fila_id, seq",
+        (desde_id, hasta_id)
+    ):
+        eventos.setdefault(fila_id, []).append((operacion, json.loads(datos or "{}"), (fecha or "")[:10]))
+    
+    hoy = conn.execute("SELECT date('now', 'localtime')").fetchone()[0]
+    for persona_id, activo, grupo in conn.execute(
+        "SELECT id, activo, grupo FROM personas WHERE id > ? AND id <= ?", (desde_id, hasta_id)
+    ).fetchall():
+        historia = eventos.get(persona_id, [])
+        abierto = None  # (desde, grupo) del período vigente
+        if not historia:
+            abierto = (FECHA_INICIAL, grupo) if activo else None
+        elif historia[0][0] != "insertar":
+            abierto = (FECHA_INICIAL, historia[0][1].get("grupo"))
+        
+        for operacion, datos, fecha in historia:
+            fecha = fecha or hoy
+            sigue_activo = operacion != "borrar" and bool(datos.get("activo"))
+            if abierto is not None and (not sigue_activo or abierto[1] != datos.get("grupo")):
+                if abierto[0] < fecha:
+                    yield (persona_id, abierto[0], fecha, abierto[1])
+                abierto = None
+            if sigue_activo and abierto is None:
+                abierto = (fecha, datos.get("grupo"))
+        
+        # El estado actual manda (p.ej. si el registro se purgó)
+        if activo and abierto is None:
+            abierto = (hoy, grupo)
+        if not activo and abierto is not None:
+            if abierto[0] < hoy:
+                yield (persona_id, abierto[0], hoy, abierto[1])
+            abierto = None
+        if abierto is not None:
+            yield (persona_id, abierto[0], None, abierto[1])
+
+MIGRACIONES: List[Migracion] = [
+    Migracion(1, "Esquema inicial (personas y asignaciones)", esquema=_ESQUEMA_INICIAL),
+    Migracion(2, "Registro de cambios", esquema=_registro_cambios),
+    Migracion(3, "Tablas de sincronización", esquema=_SINCRONIZACION),
+    Migracion(4, "Lunes de cada asignación", esquema=_columna_semana_lunes, datos=_completar_semana_lunes),
+    Migracion(5, "Turnos por persona (estadísticas)", esquema=_tabla_turnos, datos=_completar_turnos),
+    Migracion(6, "Historial de ediciones (deshacer/rehacer)", esquema=_HISTORIAL),
+    Migracion(7, "Revisión de filas (control de concurrencia)", esquema=_revision_de_filas),
+    Migracion(8, "Períodos de actividad de las personas", esquema=_membresias, datos=_completar_membresias),
+    Migracion(9, "Registro de cambios solo de columnas sincronizadas",
+              esquema=_cambios_solo_columnas_registradas),
+]
+
+ULTIMA_VERSION = MIGRACIONES[-1].version
+
+# ----------------------------------------------------------------------
+# Migrador
+# ----------------------------------------------------------------------
+
+class Migrador:
+    """Aplica las migraciones pendientes de una BD"""
+    
+    TAMANO_LOTE = 500
+    
+    def __init__(self, db_path: str, migraciones: List[Migracion] = None,
+                 tamano_lote: int = TAMANO_LOTE):
+        self.db_path = db_path
+        self.migraciones = sorted(migraciones or MIGRACIONES, key=lambda m: m.version)
+        self.tamano_lote = tamano_lote
+    
+    @property
+    def ultima_version(self) -> int:
+        return self.migraciones[-1].version if self.migraciones else 0
+    
+    def version_actual(self) -> int:
+        """Versión del esquema de la BD (una sola lectura del encabezado)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+    
+    def pendientes(self, version: Optional[int] = None) -> List[Migracion]:
+        version = self.version_actual() if version is None else version
+        return [m for m in self.migraciones if m.version > version]
+    
+    def migrar(self, progreso: Optional[Callable[[Migracion], None]] = None) -> int:
+        """
+        Aplica las migraciones pendientes, en orden
+        Args:
+            progreso: Callback llamado antes de aplicar cada migración
+        Returns:
+            Cantidad de migraciones aplicadas (0 si el esquema está al día)
+        """
+        version = self.version_actual()
+        if version >= self.ultima_version:
+            return 0
+        
+        aplicadas = 0
+        # isolation_level=None: las transacciones se manejan a mano
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            for migracion in self.pendientes(version):
+                if progreso:
+                    progreso(migracion)
+                self._aplicar(conn, migracion)
+                aplicadas += 1
+        finally:
+            conn.close()
+        return aplicadas
+    
+    def _aplicar(self, conn: sqlite3.Connection, migracion: Migracion):
+        """Aplica una migración; la versión solo avanza cuando terminó entera"""
+        with self._transaccion(conn):
+            # Otro proceso pudo haberla aplicado mientras esperábamos el lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= migracion.version:
+                return
+            if isinstance(migracion.esquema, str):
+                for sentencia in migracion.esquema.split(";"):
+                    if sentencia.strip():
+                        conn.execute(sentencia)
+            elif migracion.esquema is not None:
+                migracion.esquema(conn)
+            if migracion.datos is None:
+                conn.execute(f"PRAGMA user_version = {migracion.version}")
+                return
+        
+        # Datos: un lote por transacción (si se corta, se retoma desde el principio
+        # y los lotes ya hechos no vuelven a cambiar nada)
+        ultimo_id = 0
+        while ultimo_id is not None:
+            with self._transaccion(conn):
+                ultimo_id = migracion.datos(conn, ultimo_id, self.tamano_lote)
+        
+        with self._transaccion(conn):
+            conn.execute(f"PRAGMA user_version = {migracion.version}")
+    
+    @staticmethod
+    @contextmanager
+    def _transaccion(conn: sqlite3.Connection):
+        """BEGIN IMMEDIATE ... COMMIT (o ROLLBACK si hubo error)"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -1,58 +1,97 @@
 import sqlite3
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import date
 from src.models.asignacion import Asignacion
-from src.models.persona import Persona
+from src.models.persona import Persona, TipoPersona
 from src.models.semana import Semana
+from src.database.db_manager import DBManager
+from src.database.escritor import EscritorUnico, escribir
+from src.config.settings import DB_PATH
+from src.database.repositories.cambios_repository import leer_ultimo_seq
+from src.database.repositories.base import (
+    AsignacionRepositoryBase, COLUMNAS_VIGILANCIA, ConflictoVersion, MESES, PersonaRepositoryBase, Registro
+)
+from src.database.instrumentacion import conectar
+from src.utils.date_utils import DateUtils
+from src.utils.file_utils import FileUtils
+from src.utils.indice_nombres import IndiceNombres
 
-class AsignacionRepository:
-    """Repository para gestionar asignaciones en la BD"""
+class AsignacionRepository(AsignacionRepositoryBase):
+    """Repository para gestionar asignaciones en la BD (SQLite)"""
     
-    def __init__(self, db_path: str = "asignaciones.db"):
+    def __init__(self, db_path: str = DB_PATH, escritor: Optional[EscritorUnico] = None):
+        """
+        Args:
+            db_path: Ruta de la BD
+            escritor: Si se indica, las escrituras pasan por él (ver EscritorUnico)
+        """
+        super().__init__()
         self.db_path = db_path
+        self.escritor = escritor
         self._crear_tabla()
     
     def _crear_tabla(self):
         """Crea la tabla de asignaciones si no existe"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS asignaciones (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    semana TEXT NOT NULL,
-                    acomodadores_1hora TEXT NOT NULL,
-                    acomodadores_2hora TEXT NOT NULL,
-                    acomodador_final TEXT NOT NULL,
-                    vigilante_1hora TEXT NOT NULL,
-                    vigilante_2hora TEXT NOT NULL,
-                    vigilante_final TEXT NOT NULL,
-                    dia_reunion TEXT NOT NULL,
-                    fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+        # El esquema se verifica una sola vez por proceso (ver DBManager)
+        DBManager(self.db_path).inicializar_esquema()
+    
+    def version_datos(self) -> int:
+        """Último seq del registro de cambios: lo mueve cualquier escritura, de cualquier proceso"""
+        with conectar(self.db_path) as conn:
+            return leer_ultimo_seq(conn)
     
     def guardar(self, asignacion: Asignacion) -> int:
         """Guarda una asignación en la BD"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO asignaciones 
-                (semana, acomodadores_1hora, acomodadores_2hora, acomodador_final,
-                 vigilante_1hora, vigilante_2hora, vigilante_final, dia_reunion)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                str(asignacion.semana),
-                asignacion.acomodadores_1hora,
-                asignacion.acomodadores_2hora,
-                str(asignacion.acomodador_final),
-                str(asignacion.vigilante_1hora),
-                str(asignacion.vigilante_2hora),
-                str(asignacion.vigilante_final),
-                asignacion.dia_reunion
-            ))
-            return cursor.lastrowid
+        asignacion_id = self._escribir(lambda conn: conn.execute("""
+            INSERT INTO asignaciones 
+            (semana, acomodadores_1hora, acomodadores_2hora, acomodador_final,
+             vigilante_1hora, vigilante_2hora, vigilante_final, dia_reunion, semana_lunes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            str(asignacion.semana),
+            asignacion.acomodadores_1hora,
+            asignacion.acomodadores_2hora,
+            str(asignacion.acomodador_final),
+            str(asignacion.vigilante_1hora),
+            str(asignacion.vigilante_2hora),
+            str(asignacion.vigilante_final),
+            asignacion.dia_reunion,
+            self._lunes(str(asignacion.semana))
+        )).lastrowid)
+        self.version += 1
+        return asignacion_id
+    
+    def guardar_lote(self, filas: Iterable[tuple], tamano_lote: int = 500) -> int:
+        """
+        Guarda muchas asignaciones (como tuplas de to_tuple) en una sola transacción
+        Returns: Cantidad guardada (si algo falla, no se guarda ninguna)
+        """
+        def insertar(conn: sqlite3.Connection) -> int:
+            total = 0
+            for lote in FileUtils.en_lotes(filas, tamano_lote):
+                conn.executemany("""
+                    INSERT INTO asignaciones 
+                    (semana, acomodadores_1hora, acomodadores_2hora, acomodador_final,
+                     vigilante_1hora, vigilante_2hora, vigilante_final, dia_reunion, semana_lunes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [tuple(fila[:8]) + (self._lunes(fila[0]),) for fila in lote])
+                total += len(lote)
+            return total
+        
+        total = self._escribir(insertar)
+        if total:
+            self.version += 1
+        return total
+    
+    def obtener_claves(self) -> Set[Tuple[str, str]]:
+        """Obtiene los pares (semana, dia_reunion) ya guardados"""
+        with conectar(self.db_path) as conn:
+            cursor = conn.execute("SELECT semana, dia_reunion FROM asignaciones")
+            return {(semana, dia) for semana, dia in cursor}
     
     def obtener_todas(self) -> List[tuple]:
         """Obtiene todas las asignaciones como tuplas"""
-        with sqlite3.connect(self.db_path) as conn:
+        with conectar(self.db_path) as conn:
             cursor = conn.execute("""
                 SELECT semana, acomodadores_1hora, acomodadores_2hora, 
                        acomodador_final, vigilante_1hora, vigilante_2hora,
@@ -62,13 +101,43 @@ class AsignacionRepository:
             """)
             return cursor.fetchall()
     
+    def obtener_con_id(self, numero_mes: Optional[int] = None) -> List[Tuple[int, int, tuple]]:
+        """Obtiene (id, revisión, fila) de todas las asignaciones o de las de un mes"""
+        filtro, parametros = "", ()
+        if numero_mes:
+            filtro, parametros = "WHERE LOWER(semana) LIKE ?", (f"%{MESES[numero_mes]}%",)
+        with conectar(self.db_path) as conn:
+            cursor = conn.execute(f"""
+                SELECT id, revision, semana, acomodadores_1hora, acomodadores_2hora,
+                       acomodador_final, vigilante_1hora, vigilante_2hora,
+                       vigilante_final, dia_reunion
+                FROM asignaciones
+                {filtro}
+                ORDER BY id
+            """, parametros)
+            return [(fila[0], fila[1], fila[2:]) for fila in cursor]
+    
+    def obtener_fila(self, id_asignacion: int) -> Optional[Tuple[int, tuple]]:
+        """Obtiene (revisión, fila) de una asignación, o None si no existe"""
+        with conectar(self.db_path) as conn:
+            return self._leer_fila(conn, id_asignacion)
+    
+    @staticmethod
+    def _leer_fila(conn: sqlite3.Connection, id_asignacion: int) -> Optional[Tuple[int, tuple]]:
+        fila = conn.execute("""
+            SELECT revision, semana, acomodadores_1hora, acomodadores_2hora,
+                   acomodador_final, vigilante_1hora, vigilante_2hora,
+                   vigilante_final, dia_reunion
+            FROM asignaciones
+            WHERE id = ?
+        """, (id_asignacion,)).fetchone()
+        return None if fila is None else (fila[0], fila[1:])
+    
     def obtener_por_mes(self, numero_mes: int) -> List[tuple]:
         """Obtiene asignaciones de un mes específico"""
-        with sqlite3.connect(self.db_path) as conn:
+        with conectar(self.db_path) as conn:
             # Buscar semanas que contengan el nombre del mes
-            meses = ["", "enero", "febrero", "marzo", "abril", "mayo", "junio",
-                    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
-            mes_nombre = meses[numero_mes]
+            mes_nombre = MESES[numero_mes]
             
             cursor = conn.execute("""
                 SELECT semana, acomodadores_1hora, acomodadores_2hora,
@@ -80,23 +149,234 @@ class AsignacionRepository:
             """, (f"%{mes_nombre}%",))
             return cursor.fetchall()
     
+    def iterar_todas(self, tamano_lote: int = 500) -> Iterator[tuple]:
+        """
+        Recorre todas las asignaciones sin cargarlas todas en memoria
+        Args:
+            tamano_lote: Filas leídas por cada fetchmany
+        """
+        return self._iterar("""
+            SELECT semana, acomodadores_1hora, acomodadores_2hora,
+                   acomodador_final, vigilante_1hora, vigilante_2hora,
+                   vigilante_final, dia_reunion
+            FROM asignaciones
+            ORDER BY id
+        """, (), tamano_lote)
+    
+    def iterar_por_mes(self, numero_mes: int, tamano_lote: int = 500) -> Iterator[tuple]:
+        """Recorre las asignaciones de un mes sin cargarlas todas en memoria"""
+        return self._iterar("""
+            SELECT semana, acomodadores_1hora, acomodadores_2hora,
+                   acomodador_final, vigilante_1hora, vigilante_2hora,
+                   vigilante_final, dia_reunion
+            FROM asignaciones
+            WHERE LOWER(semana) LIKE ?
+            ORDER BY id
+        """, (f"%{MESES[numero_mes]}%",), tamano_lote)
+    
+    def iterar_por_rango(self, desde: Optional[date], hasta: Optional[date],
+                         tamano_lote: int = 500) -> Iterator[tuple]:
+        """Recorre las asignaciones de las semanas que se superponen con un rango (usa el índice de semana_lunes)"""
+        filtro, parametros = self._filtro_rango(desde, hasta)
+        return self._iterar(f"""
+            SELECT semana, acomodadores_1hora, acomodadores_2hora,
+                   acomodador_final, vigilante_1hora, vigilante_2hora,
+                   vigilante_final, dia_reunion
+            FROM asignaciones a
+            {filtro}
+            ORDER BY id
+        """, parametros, tamano_lote)
+    
+    def contar_por_rol(self, desde: Optional[date] = None,
+                       hasta: Optional[date] = None) -> Dict[Tuple[str, str], int]:
+        """Cuenta los turnos de cada persona en cada puesto (GROUP BY sobre la tabla turnos)"""
+        filtro, parametros = self._filtro_rango(desde, hasta)
+        with conectar(self.db_path) as conn:
+            cursor = conn.execute(
+                f"SELECT nombre, columna, COUNT(*) FROM turnos a {filtro} GROUP BY nombre, columna",
+                parametros
+            )
+            return {(nombre, columna): cantidad for nombre, columna, cantidad in cursor}
+    
+    def iterar_turnos(self, tamano_lote: int = 500) -> Iterator[Tuple[str, date]]:
+        """Recorre los turnos como (nombre, lunes de la semana) desde la tabla turnos"""
+        filas = self._iterar(
+            "SELECT nombre, semana_lunes FROM turnos WHERE semana_lunes IS NOT NULL", (), tamano_lote
+        )
+        return ((nombre, date.fromisoformat(lunes)) for nombre, lunes in filas)
+    
+    def iterar_turnos_de(self, nombre: str, desde: date) -> Iterator[Tuple[str, str, str]]:
+        """Recorre los turnos de una persona desde la tabla turnos (ver AsignacionRepositoryBase)"""
+        conn = conectar(self.db_path)
+        conn.create_function("normalizar", 1, IndiceNombres.normalizar, deterministic=True)
+        try:
+            # turnos_semana cubre el rango y el nombre: sólo se leen asignaciones de los turnos hallados
+            yield from conn.execute("""
+                SELECT a.semana, a.dia_reunion, t.columna
+                FROM turnos t JOIN asignaciones a ON a.id = t.asignacion_id
+                WHERE t.semana_lunes >= ? AND normalizar(t.nombre) = ?
+                GROUP BY t.asignacion_id, t.columna
+                ORDER BY t.semana_lunes, t.asignacion_id, MIN(t.rowid)
+            """, (DateUtils.limite_semanas_desde(desde).isoformat(), IndiceNombres.normalizar(nombre).strip()))
+        finally:
+            conn.close()
+    
+    def contar_por_reunion(self, desde: Optional[date] = None,
+                           hasta: Optional[date] = None) -> Dict[str, int]:
+        """Cuenta las asignaciones de cada día de la semana de reunión con un GROUP BY"""
+        filtro, parametros = self._filtro_rango(desde, hasta)
+        # "Domingo 14" -> "Domingo": se agrupa por día de la semana, no por fecha
+        dia = "CASE WHEN instr(dia_reunion, ' ') > 0 THEN substr(dia_reunion, 1, instr(dia_reunion, ' ') - 1) ELSE dia_reunion END"
+        with conectar(self.db_path) as conn:
+            cursor = conn.execute(
+                f"SELECT {dia}, COUNT(*) FROM asignaciones a {filtro} GROUP BY 1",
+                parametros
+            )
+            return dict(cursor.fetchall())
+    
+    def contar_vigilancia_por_grupo(self, personas: PersonaRepositoryBase, desde: Optional[date] = None,
+                                    hasta: Optional[date] = None) -> Dict[int, int]:
+        """
+        Cuenta los turnos de vigilancia por grupo con un GROUP BY (ver AsignacionRepositoryBase)
+        El grupo de cada turno es el de la membresía vigente esa semana (como
+        PersonaRepository.obtener_todos con as_of); las personas se leen con
+        un JOIN en esta misma BD, así que `personas` no se consulta.
+        """
+        filtro, parametros = self._filtro_rango(desde, hasta)
+        marcas = ", ".join("?" * len(COLUMNAS_VIGILANCIA))
+        filtro = (filtro + " AND" if filtro else "WHERE") + f" a.columna IN ({marcas})"
+        with conectar(self.db_path) as conn:
+            cursor = conn.execute(f"""
+                WITH vigilantes AS (
+                    SELECT apellido || ' ' || nombre AS nombre, MIN(id) AS id
+                    FROM personas WHERE tipo = ? GROUP BY 1
+                )
+                SELECT COALESCE(CASE WHEN m.persona_id IS NULL THEN p.grupo ELSE m.grupo END, 0), COUNT(*)
+                FROM turnos a
+                LEFT JOIN vigilantes v ON v.nombre = a.nombre
+                LEFT JOIN personas p ON p.id = v.id
+                LEFT JOIN membresias m
+                  ON m.persona_id = v.id
+                 AND m.desde = (SELECT MAX(desde) FROM membresias WHERE persona_id = v.id AND desde <= a.semana_lunes)
+                 AND (m.hasta IS NULL OR m.hasta > a.semana_lunes)
+                {filtro}
+                GROUP BY 1
+            """, (TipoPersona.VIGILANTE.value,) + parametros + tuple(COLUMNAS_VIGILANCIA))
+            return dict(cursor.fetchall())
+    
+    @staticmethod
+    def _filtro_rango(desde: Optional[date], hasta: Optional[date]) -> Tuple[str, tuple]:
+        """WHERE sobre semana_lunes para las semanas que se superponen con el rango"""
+        condiciones, parametros = [], []
+        if desde is not None:
+            condiciones.append("a.semana_lunes >= ?")
+            parametros.append(DateUtils.limite_semanas_desde(desde).isoformat())
+        if hasta is not None:
+            condiciones.append("a.semana_lunes <= ?")
+            parametros.append(hasta.isoformat())
+        if not condiciones:
+            return "", ()
+        return "WHERE " + " AND ".join(condiciones), tuple(parametros)
+    
+    def _escribir(self, funcion):
+        return escribir(self.db_path, funcion, self.escritor)
+    
+    @staticmethod
+    def _lunes(semana: str) -> Optional[str]:
+        """Valor de la columna semana_lunes para el texto de una semana"""
+        lunes = DateUtils.parsear_semana(semana)
+        return lunes.isoformat() if lunes else None
+    
+    def _iterar(self, sql: str, parametros: tuple, tamano_lote: int) -> Iterator[tuple]:
+        """Itera un cursor por lotes; la conexión se cierra al terminar"""
+        conn = conectar(self.db_path)
+        try:
+            cursor = conn.execute(sql, parametros)
+            while True:
+                lote = cursor.fetchmany(tamano_lote)
+                if not lote:
+                    break
+                yield from lote
+        finally:
+            conn.close()
+    
     def eliminar_todas(self):
         """Elimina todas las asignaciones"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM asignaciones")
-    
-    def actualizar(self, id_asignacion: int, columna: str, valor: str):
-        """Actualiza una columna específica de una asignación"""
-        columnas_validas = [
-            'acomodadores_1hora', 'acomodadores_2hora', 'acomodador_final',
-            'vigilante_1hora', 'vigilante_2hora', 'vigilante_final', 'dia_reunion'
-        ]
+        self._escribir(lambda conn: conn.execute("DELETE FROM asignaciones"))
+        self.version += 1
+    
+    def actualizar(self, id_asignacion: int, columna: str, valor: str,
+                   revision: Optional[int] = None, registrar: Optional[Registro] = None) -> Optional[int]:
+        """
+        Actualiza una columna específica de una asignación
+        Con `revision` el UPDATE es condicional: si otra edición ya cambió la
+        fila no espera ni reintenta, lanza ConflictoVersion con la fila actual.
+        `registrar` se hace en la misma transacción, después del UPDATE.
+        Returns: La revisión nueva (None si la fila no existe)
+        """
+        self._validar_columna(columna)
+        
+        def actualizar(conn: sqlite3.Connection) -> Optional[int]:
+            sql = f"UPDATE asignaciones SET {columna} = ?, revision = revision + 1 WHERE id = ?"
+            parametros = [valor, id_asignacion]
+            if revision is not None:
+                sql += " AND revision = ?"
+                parametros.append(revision)
+            if conn.execute(sql, parametros).rowcount == 0:
+                if revision is not None:
+                    raise ConflictoVersion("asignaciones", id_asignacion, self._leer_fila(conn, id_asignacion))
+                return None
+            if registrar is not None:
+                registrar(conn)
+            return conn.execute("SELECT revision FROM asignaciones WHERE id = ?", (id_asignacion,)).fetchone()[0]
         
-        if columna not in columnas_validas:
-            raise ValueError(f"Columna '{columna}' no es válida")
+        nueva = self._escribir(actualizar)
+        self.version += 1
+        return nueva
+    
+    def actualizar_lote(self, cambios: Iterable[Tuple[int, str, str]]):
+        """Aplica varios (id, columna, valor) en una sola transacción"""
+        cambios = list(cambios)
+        for _, columna, _ in cambios:
+            self._validar_columna(columna)
+        
+        def actualizar(conn: sqlite3.Connection):
+            for id_asignacion, columna, valor in cambios:
+                conn.execute(
+                    f"UPDATE asignaciones SET {columna} = ?, revision = revision + 1 WHERE id = ?",
+                    (valor, id_asignacion)
+                )
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                f"UPDATE asignaciones SET {columna} = ? WHERE id = ?",
-                (valor, id_asignacion)
-            )
\ No newline at end of file
+        self._escribir(actualizar)
+        self.version += 1
+    
+    def reemplazar_lote(self, cambios: Iterable[Tuple[int, str, str, str]],
+                        registrar: Optional[Registro] = None):
+        """
+        Aplica varios (id, columna, anterior, nuevo) en una transacción, cada
+        uno solo si la celda sigue valiendo `anterior`; si alguna cambió, se
+        deshace todo y se lanza ConflictoVersion con esa fila. `registrar` va
+        en la misma transacción.
+        """
+        cambios = list(cambios)
+        for _, columna, _, _ in cambios:
+            self._validar_columna(columna)
+        
+        def reemplazar(conn: sqlite3.Connection):
+            for id_asignacion, columna, anterior, nuevo in cambios:
+                if conn.execute(
+                    f"UPDATE asignaciones SET {columna} = ?, revision = revision + 1 "
+                    f"WHERE id = ? AND {columna} = ?",
+                    (nuevo, id_asignacion, anterior)
+                ).rowcount == 0:
+                    raise ConflictoVersion("asignaciones", id_asignacion, self._leer_fila(conn, id_asignacion))
+            if registrar is not None:
+                registrar(conn)
+        
+        self._escribir(reemplazar)
+        self.version += 1
+    
+    def contar_turnos_por_persona(self) -> Dict[str, int]:
+        """Cuenta cuántos turnos tuvo cada persona (por nombre completo)"""
+        with conectar(self.db_path) as conn:
+            return dict(conn.execute("SELECT nombre, COUNT(*) FROM turnos GROUP BY nombre").fetchall())
\ No newline at end of file
@@ -0,0 +1,322 @@
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.models.asignacion import Asignacion
+from src.models.membresia import Membresia
+from src.models.persona import Persona, TipoPersona
+from src.utils.date_utils import DateUtils
+from src.utils.indice_nombres import IndiceNombres
+
+MESES = ["", "enero", "febrero", "marzo", "abril", "mayo", "junio",
+         "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
+
+# Columnas con nombres de personas (las de 1° y 2° hora tienen "A / B")
+COLUMNAS_PERSONAS = [
+    'acomodadores_1hora', 'acomodadores_2hora', 'acomodador_final',
+    'vigilante_1hora', 'vigilante_2hora', 'vigilante_final'
+]
+
+# Puestos de vigilancia (los que se cuentan por grupo)
+COLUMNAS_VIGILANCIA = [c for c in COLUMNAS_PERSONAS if c.startswith("vigilante_")]
+
+# Escritura extra que un repositorio con BD hace en la misma transacción
+Registro = Callable[[sqlite3.Connection], None]
+
+class ConflictoVersion(Exception):
+    """
+    Otra edición cambió la fila después de leerla (control optimista)
+    No se escribió nada; `actual` trae la fila como está ahora en la BD
+    (None si se borró) para que quien editaba la vuelva a mostrar.
+    """
+    
+    def __init__(self, tabla: str, fila_id: int, actual=None):
+        super().__init__(f"La fila {fila_id} de {tabla} fue modificada por otra edición")
+        self.tabla = tabla
+        self.fila_id = fila_id
+        self.actual = actual
+
+class PersonaRepositoryBase(ABC):
+    """
+    Interfaz de los repositorios de personas
+    Los servicios dependen solo de esta interfaz; las implementaciones son
+    PersonaRepository (SQLite) y PersonaRepositoryMemoria.
+    """
+    
+    def __init__(self):
+        # Se incrementa en cada escritura de esta instancia (no ve las de otros
+        # procesos ni las de otras instancias: para cachés, ver version_datos)
+        self.version = 0
+    
+    def version_datos(self) -> int:
+        """
+        Marca que cambia con cada escritura, venga de donde venga
+        Las cachés la comparan para saber si siguen vigentes. En memoria
+        alcanza con version; sobre SQLite se lee del registro de cambios.
+        """
+        return self.version
+    
+    @abstractmethod
+    def obtener_todos(self, tipo: TipoPersona, incluir_inactivos: bool = False,
+                      as_of: Optional[date] = None) -> List[Persona]:
+        """
+        Obtiene todas las personas de un tipo, ordenadas por apellido y nombre
+        Args:
+            as_of: Si se indica, activo y grupo son los que regían ese día
+                (según los períodos de membresía)
+        """
+    
+    @abstractmethod
+    def agregar(self, persona: Persona) -> int:
+        """Agrega una nueva persona y devuelve su id"""
+    
+    @abstractmethod
+    def desactivar(self, persona_id: int, revision: Optional[int] = None):
+        """
+        Desactiva una persona (soft delete)
+        Args:
+            revision: Si se indica, solo se escribe si la fila sigue en esa
+                revisión; si no, ConflictoVersion con la persona actual
+        """
+    
+    @abstractmethod
+    def activar(self, persona_id: int, revision: Optional[int] = None):
+        """Reactiva una persona (revision como en desactivar)"""
+    
+    @abstractmethod
+    def cambiar_grupo(self, persona_id: int, grupo: Optional[int], revision: Optional[int] = None):
+        """Cambia el grupo de una persona desde hoy (revision como en desactivar)"""
+    
+    @abstractmethod
+    def obtener_membresias(self, persona_id: int) -> List[Membresia]:
+        """Períodos de actividad de una persona, del más viejo al más nuevo"""
+    
+    def agregar_lote(self, personas: Iterable[Persona], tamano_lote: int = 500) -> int:
+        """Agrega muchas personas; devuelve la cantidad agregada"""
+        total = 0
+        for persona in personas:
+            self.agregar(persona)
+            total += 1
+        return total
+    
+    def activar_todos(self, tipo: TipoPersona):
+        """Reactiva todas las personas de un tipo"""
+        for persona in self.obtener_todos(tipo, incluir_inactivos=True):
+            if not persona.activo:
+                self.activar(persona.id)
+
+class AsignacionRepositoryBase(ABC):
+    """
+    Interfaz de los repositorios de asignaciones
+    Las filas son tuplas en el orden de Asignacion.to_tuple.
+    """
+    
+    COLUMNAS_PERSONAS = COLUMNAS_PERSONAS
+    
+    def __init__(self):
+        # Se incrementa en cada escritura (ver PersonaRepositoryBase.version)
+        self.version = 0
+    
+    def version_datos(self) -> int:
+        """Marca que cambia con cada escritura (ver PersonaRepositoryBase.version_datos)"""
+        return self.version
+    
+    @abstractmethod
+    def guardar(self, asignacion: Asignacion) -> int:
+        """Guarda una asignación y devuelve su id"""
+    
+    @abstractmethod
+    def guardar_lote(self, filas: Iterable[tuple], tamano_lote: int = 500) -> int:
+        """Guarda muchas filas (tuplas de to_tuple); devuelve la cantidad guardada"""
+    
+    @abstractmethod
+    def iterar_todas(self, tamano_lote: int = 500) -> Iterator[tuple]:
+        """Recorre todas las asignaciones en orden de creación"""
+    
+    @abstractmethod
+    def eliminar_todas(self):
+        """Elimina todas las asignaciones"""
+    
+    @abstractmethod
+    def actualizar(self, id_asignacion: int, columna: str, valor: str,
+                   revision: Optional[int] = None, registrar: Optional[Registro] = None) -> Optional[int]:
+        """
+        Actualiza una columna específica de una asignación
+        Args:
+            revision: Si se indica, solo se escribe si la fila sigue en esa
+                revisión; si no, ConflictoVersion con (revisión, fila) actuales
+            registrar: Escritura que va en la misma transacción (p.ej. el
+                historial); solo la aceptan las implementaciones con BD
+        Returns:
+            La revisión nueva de la fila (None si no existe)
+        """
+    
+    @abstractmethod
+    def obtener_con_id(self, numero_mes: Optional[int] = None) -> List[Tuple[int, int, tuple]]:
+        """Obtiene (id, revisión, fila) de todas las asignaciones o de las de un mes"""
+    
+    @abstractmethod
+    def obtener_fila(self, id_asignacion: int) -> Optional[Tuple[int, tuple]]:
+        """Obtiene (revisión, fila) de una asignación, o None si no existe"""
+    
+    def obtener_todas(self) -> List[tuple]:
+        """Obtiene todas las asignaciones como tuplas"""
+        return list(self.iterar_todas())
+    
+    def actualizar_lote(self, cambios: Iterable[Tuple[int, str, str]]):
+        """Aplica varios (id, columna, valor); las implementaciones con BD lo hacen en una transacción"""
+        for id_asignacion, columna, valor in cambios:
+            self.actualizar(id_asignacion, columna, valor)
+    
+    def reemplazar_lote(self, cambios: Iterable[Tuple[int, str, str, str]],
+                        registrar: Optional[Registro] = None):
+        """
+        Aplica varios (id, columna, anterior, nuevo) solo si cada celda sigue
+        valiendo `anterior`; si alguna cambió, ConflictoVersion y no se aplica
+        ninguno. Las implementaciones con BD lo verifican en la transacción
+        (y hacen ahí también `registrar`, ver actualizar).
+        """
+        self._sin_transaccion(registrar)
+        cambios = list(cambios)
+        for id_asignacion, columna, anterior, _ in cambios:
+            self._validar_columna(columna)
+            actual = self.obtener_fila(id_asignacion)
+            if actual is None or actual[1][self._posicion(columna)] != anterior:
+                raise ConflictoVersion("asignaciones", id_asignacion, actual)
+        self.actualizar_lote((fila_id, columna, nuevo) for fila_id, columna, _, nuevo in cambios)
+    
+    def iterar_por_mes(self, numero_mes: int, tamano_lote: int = 500) -> Iterator[tuple]:
+        """Recorre las asignaciones cuya semana menciona un mes"""
+        mes_nombre = MESES[numero_mes]
+        return (fila for fila in self.iterar_todas(tamano_lote) if mes_nombre in fila[0].lower())
+    
+    def obtener_por_mes(self, numero_mes: int) -> List[tuple]:
+        """Obtiene asignaciones de un mes específico"""
+        return list(self.iterar_por_mes(numero_mes))
+    
+    def iterar_por_rango(self, desde: Optional[date], hasta: Optional[date],
+                         tamano_lote: int = 500) -> Iterator[tuple]:
+        """Recorre las asignaciones de las semanas que se superponen con un rango (None = sin límite)"""
+        limite = DateUtils.limite_semanas_desde(desde) if desde is not None else None
+        for fila in self.iterar_todas(tamano_lote):
+            lunes = DateUtils.parsear_semana(fila[0])
+            if lunes and (hasta is None or lunes <= hasta) and (limite is None or lunes >= limite):
+                yield fila
+    
+    def obtener_claves(self) -> Set[Tuple[str, str]]:
+        """Obtiene los pares (semana, dia_reunion) ya guardados"""
+        return {(fila[0], fila[7]) for fila in self.iterar_todas()}
+    
+    def contar_turnos_por_persona(self) -> Dict[str, int]:
+        """Cuenta cuántos turnos tuvo cada persona (por nombre completo)"""
+        conteo: Dict[str, int] = {}
+        for fila in self.iterar_todas():
+            for valor in fila[1:7]:
+                for nombre in valor.split(" / "):
+                    nombre = nombre.strip()
+                    if nombre:
+                        conteo[nombre] = conteo.get(nombre, 0) + 1
+        return conteo
+    
+    def iterar_turnos(self) -> Iterator[Tuple[str, date]]:
+        """Recorre los turnos como (nombre, lunes de la semana); omite semanas sin fecha"""
+        for fila in self.iterar_todas():
+            lunes = DateUtils.parsear_semana(fila[0])
+            if lunes is None:
+                continue
+            for valor in fila[1:7]:
+                for nombre in valor.split(" / "):
+                    nombre = nombre.strip()
+                    if nombre:
+                        yield nombre, lunes
+    
+    def iterar_turnos_de(self, nombre: str, desde: date) -> Iterator[Tuple[str, str, str]]:
+        """
+        Recorre los turnos de una persona en las semanas que llegan a una fecha
+        Args:
+            nombre: Nombre completo (no distingue mayúsculas ni acentos)
+            desde: Fecha desde la que se buscan
+        Returns:
+            (semana, dia_reunion, columna de COLUMNAS_PERSONAS), ordenados por fecha
+        """
+        buscado = IndiceNombres.normalizar(nombre).strip()
+        turnos = []
+        for fila in self.iterar_por_rango(desde, None):
+            for columna, valor in zip(COLUMNAS_PERSONAS, fila[1:7]):
+                nombres = (IndiceNombres.normalizar(n).strip() for n in valor.split(" / "))
+                if buscado in nombres:
+                    turnos.append((DateUtils.parsear_semana(fila[0]), fila[0], fila[7], columna))
+        turnos.sort(key=lambda turno: turno[0])
+        return (turno[1:] for turno in turnos)
+    
+    def contar_por_rol(self, desde: Optional[date] = None,
+                       hasta: Optional[date] = None) -> Dict[Tuple[str, str], int]:
+        """
+        Cuenta los turnos de cada persona en cada puesto
+        Args:
+            desde, hasta: Rango de fechas (None = sin límite)
+        Returns:
+            {(nombre, columna de COLUMNAS_PERSONAS): cantidad}
+        """
+        conteo: Dict[Tuple[str, str], int] = {}
+        for fila in self._filas_del_rango(desde, hasta):
+            for columna, valor in zip(COLUMNAS_PERSONAS, fila[1:7]):
+                for nombre in valor.split(" / "):
+                    nombre = nombre.strip()
+                    if nombre:
+                        conteo[(nombre, columna)] = conteo.get((nombre, columna), 0) + 1
+        return conteo
+    
+    def contar_por_reunion(self, desde: Optional[date] = None,
+                           hasta: Optional[date] = None) -> Dict[str, int]:
+        """Cuenta las asignaciones de cada día de la semana de reunión ("Domingo 14" -> "Domingo")"""
+        conteo: Dict[str, int] = {}
+        for fila in self._filas_del_rango(desde, hasta):
+            dia = fila[7].split(" ", 1)[0]
+            conteo[dia] = conteo.get(dia, 0) + 1
+        return conteo
+    
+    def contar_vigilancia_por_grupo(self, personas: PersonaRepositoryBase, desde: Optional[date] = None,
+                                    hasta: Optional[date] = None) -> Dict[int, int]:
+        """
+        Cuenta los turnos de vigilancia por el grupo que tenía cada persona esa semana
+        Args:
+            personas: Repositorio de personas (sus membresías dan el grupo de cada semana)
+            desde, hasta: Rango de fechas (None = sin límite)
+        Returns:
+            {grupo: cantidad} (0 = sin grupo o nombre que no es de un vigilante)
+        """
+        grupos_por_semana: Dict[Optional[date], Dict[str, int]] = {}
+        conteo: Dict[int, int] = {}
+        for fila in self._filas_del_rango(desde, hasta):
+            lunes = DateUtils.parsear_semana(fila[0])
+            if lunes not in grupos_por_semana:
+                vigilantes = personas.obtener_todos(TipoPersona.VIGILANTE, incluir_inactivos=True, as_of=lunes)
+                grupos_por_semana[lunes] = {str(p): p.grupo or 0 for p in vigilantes}
+            for valor in fila[4:7]:
+                nombre = valor.strip()
+                if nombre:
+                    grupo = grupos_por_semana[lunes].get(nombre, 0)
+                    conteo[grupo] = conteo.get(grupo, 0) + 1
+        return conteo
+    
+    def _filas_del_rango(self, desde: Optional[date], hasta: Optional[date]) -> Iterator[tuple]:
+        if desde is None and hasta is None:
+            return self.iterar_todas()
+        return self.iterar_por_rango(desde, hasta)
+    
+    @staticmethod
+    def _sin_transaccion(registrar: Optional[Registro]):
+        """Sin BD no hay una transacción donde hacer `registrar`"""
+        if registrar is not None:
+            raise ValueError("Este repositorio no tiene transacciones para registrar escrituras")
+    
+    @staticmethod
+    def _validar_columna(columna: str):
+        if columna not in COLUMNAS_PERSONAS + ['dia_reunion']:
+            raise ValueError(f"Columna '{columna}' no es válida")
+    
+    @staticmethod
+    def _posicion(columna: str) -> int:
+        """Posición de una columna editable en las tuplas de to_tuple"""
+        return (COLUMNAS_PERSONAS + ['dia_reunion']).index(columna) + 1
@@ -0,0 +1,84 @@
+import json
+import sqlite3
+from typing import List, Optional
+from src.models.cambio import Cambio
+from src.database.db_manager import DBManager
+from src.database.escritor import EscritorUnico, escribir
+from src.database.instrumentacion import conectar
+from src.config.settings import DB_PATH
+
+def leer_ultimo_seq(conn: sqlite3.Connection) -> int:
+    """
+    Mayor número de secuencia asignado alguna vez (0 si no hubo cambios)
+    Sale de sqlite_sequence y no de MAX(seq): no retrocede cuando purgar_hasta
+    vacía la tabla, así sirve como marca de que los datos cambiaron.
+    """
+    fila = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'").fetchone()
+    return fila[0] if fila else 0
+
+class CambiosRepository:
+    """
+    Lectura del registro de cambios
+    La tabla la completan los triggers (ver migraciones.py): cada escritura en
+    personas o asignaciones agrega una fila con un número de secuencia
+    creciente, así quien lee puede pedir solo lo que cambió desde su última
+    lectura.
+    """
+    
+    def __init__(self, db_path: str = DB_PATH, escritor: Optional[EscritorUnico] = None):
+        """
+        Args:
+            db_path: Ruta de la BD
+            escritor: Si se indica, las escrituras pasan por él (ver EscritorUnico)
+        """
+        self.db_path = db_path
+        self.escritor = escritor
+        DBManager(self.db_path).inicializar_esquema()
+    
+    def ultimo_seq(self) -> int:
+        """Número de secuencia del último cambio (0 si no hubo; no retrocede al purgar)"""
+        with conectar(self.db_path) as conn:
+            return leer_ultimo_seq(conn)
+    
+    def cambios_desde(self, seq: int, tabla: Optional[str] = None,
+                      limite: int = 1000) -> List[Cambio]:
+        """
+        Obtiene los cambios posteriores a un número de secuencia
+        Args:
+            seq: Último número de secuencia ya procesado (0 = desde el principio)
+            tabla: Si se especifica, solo los cambios de esa tabla
+            limite: Cantidad máxima de cambios (para leer por páginas)
+        Returns:
+            Lista de cambios ordenada por seq
+        """
+        sql = "SELECT seq, tabla, fila_id, operacion, datos, fecha FROM cambios WHERE seq > ?"
+        parametros = [seq]
+        if tabla:
+            sql += " AND tabla = ?"
+            parametros.append(tabla)
+        sql += " ORDER BY seq LIMIT ?"
+        parametros.append(limite)
+        
+        with conectar(self.db_path) as conn:
+            cursor = conn.execute(sql, parametros)
+            return [self._row_to_cambio(row) for row in cursor.fetchall()]
+    
+    def purgar_hasta(self, seq: int) -> int:
+        """
+        Borra los cambios ya procesados por todos los lectores
+        Returns: Cantidad de cambios borrados
+        """
+        return escribir(self.db_path, lambda conn: conn.execute(
+            "DELETE FROM cambios WHERE seq <= ?", (seq,)
+        ).rowcount, self.escritor)
+    
+    def _row_to_cambio(self, row) -> Cambio:
+        """Convierte una fila de BD a objeto Cambio"""
+        return Cambio(
+            seq=row[0],
+            tabla=row[1],
+            fila_id=row[2],
+            operacion=row[3],
+            datos=json.loads(row[4]) if row[4] else {},
+            fecha=row[5]
+        )
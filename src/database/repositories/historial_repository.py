@@ -0,0 +1,112 @@
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+from src.models.edicion import Comando, Edicion
+from src.database.db_manager import DBManager
+from src.database.escritor import EscritorUnico, escribir
+from src.database.instrumentacion import conectar
+from src.config.settings import DB_PATH
+
+class HistorialRepository:
+    """
+    Historial de ediciones persistido (para deshacer después de reiniciar)
+    Cada comando guarda solo sus diferencias (fila, columna, valor anterior y
+    nuevo). Los comandos deshechos se marcan; registrar uno nuevo descarta
+    los deshechos, como en cualquier editor.
+    """
+    
+    def __init__(self, db_path: str = DB_PATH, escritor: Optional[EscritorUnico] = None):
+        """
+        Args:
+            db_path: Ruta de la BD
+            escritor: Si se indica, las escrituras pasan por él (ver EscritorUnico)
+        """
+        self.db_path = db_path
+        self.escritor = escritor
+        DBManager(self.db_path).inicializar_esquema()
+    
+    def agregar(self, comando: Comando, profundidad: int) -> int:
+        """
+        Guarda un comando nuevo, descarta los deshechos y recorta los más viejos
+        Args:
+            comando: Comando a guardar
+            profundidad: Cantidad máxima de comandos que se conservan
+        Returns:
+            Id del comando
+        """
+        return self._escribir(lambda conn: self.agregar_en(conn, comando, profundidad))
+    
+    def agregar_en(self, conn: sqlite3.Connection, comando: Comando, profundidad: int) -> int:
+        """Como agregar, dentro de una transacción ya abierta (p.ej. junto con la edición)"""
+        self._borrar(conn, "deshecho = 1")
+        comando_id = conn.execute(
+            "INSERT INTO historial_comandos (descripcion) VALUES (?)", (comando.descripcion,)
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO historial_ediciones VALUES (?, ?, ?, ?, ?, ?)",
+            [(comando_id, orden, e.fila_id, e.columna, e.anterior, e.nuevo)
+             for orden, e in enumerate(comando.ediciones)]
+        )
+        self._borrar(conn, "id NOT IN (SELECT id FROM historial_comandos ORDER BY id DESC LIMIT ?)",
+                     (profundidad,))
+        return comando_id
+    
+    @staticmethod
+    def agregar_edicion_en(conn: sqlite3.Connection, comando_id: int, orden: int, edicion: Edicion):
+        """Suma una edición a un comando ya guardado, dentro de una transacción ya abierta"""
+        conn.execute(
+            "INSERT INTO historial_ediciones VALUES (?, ?, ?, ?, ?, ?)",
+            (comando_id, orden, edicion.fila_id, edicion.columna, edicion.anterior, edicion.nuevo)
+        )
+    
+    def marcar(self, comando_id: int, deshecho: bool):
+        """Marca un comando como deshecho (o rehecho)"""
+        self._escribir(lambda conn: self.marcar_en(conn, comando_id, deshecho))
+    
+    @staticmethod
+    def marcar_en(conn: sqlite3.Connection, comando_id: int, deshecho: bool):
+        """Como marcar, dentro de una transacción ya abierta"""
+        conn.execute("UPDATE historial_comandos SET deshecho = ? WHERE id = ?", (int(deshecho), comando_id))
+    
+    def cargar(self, profundidad: int) -> Tuple[List[Comando], List[Comando]]:
+        """
+        Lee los últimos comandos
+        Returns:
+            (para deshacer, del más viejo al más nuevo;
+             para rehacer, del más nuevo al más viejo: el último es el próximo)
+        """
+        with conectar(self.db_path) as conn:
+            filas = conn.execute(
+                "SELECT id, descripcion, deshecho FROM historial_comandos ORDER BY id DESC LIMIT ?",
+                (profundidad,)
+            ).fetchall()
+            if not filas:
+                return [], []
+            comandos: Dict[int, Comando] = {
+                comando_id: Comando(descripcion, id=comando_id) for comando_id, descripcion, _ in filas
+            }
+            cursor = conn.execute(
+                "SELECT comando_id, fila_id, columna, anterior, nuevo FROM historial_ediciones "
+                "WHERE comando_id >= ? ORDER BY comando_id, orden",
+                (filas[-1][0],)
+            )
+            for comando_id, fila_id, columna, anterior, nuevo in cursor:
+                comandos[comando_id].ediciones.append(Edicion(fila_id, columna, anterior, nuevo))
+        
+        deshacer = [comandos[fila[0]] for fila in reversed(filas) if not fila[2]]
+        rehacer = [comandos[fila[0]] for fila in filas if fila[2]]
+        return deshacer, rehacer
+    
+    def vaciar(self):
+        """Borra todo el historial"""
+        self._escribir(lambda conn: self._borrar(conn, "1"))
+    
+    @staticmethod
+    def _borrar(conn: sqlite3.Connection, condicion: str, parametros: tuple = ()):
+        conn.execute(
+            f"DELETE FROM historial_ediciones WHERE comando_id IN "
+            f"(SELECT id FROM historial_comandos WHERE {condicion})", parametros
+        )
+        conn.execute(f"DELETE FROM historial_comandos WHERE {condicion}", parametros)
+    
+    def _escribir(self, funcion):
+        return escribir(self.db_path, funcion, self.escritor)
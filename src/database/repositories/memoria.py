@@ -0,0 +1,202 @@
+import threading
+from bisect import bisect_right
+from dataclasses import replace
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.models.asignacion import Asignacion
+from src.models.membresia import Membresia
+from src.models.persona import Persona, TipoPersona
+from src.database.repositories.base import (
+    AsignacionRepositoryBase, ConflictoVersion, MESES, PersonaRepositoryBase, Registro
+)
+
+class PersonaRepositoryMemoria(PersonaRepositoryBase):
+    """
+    Repositorio de personas en memoria (sin disco)
+    Sirve para simulaciones y búsquedas de planes sin tocar la BD real.
+    """
+    
+    def __init__(self, personas: Iterable[Persona] = ()):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._personas: Dict[int, Persona] = {}
+        # id -> períodos de membresía ordenados por fecha de inicio
+        self._membresias: Dict[int, List[Membresia]] = {}
+        self._proximo_id = 1
+        for persona in personas:
+            # Las personas iniciales están activas (o no) desde siempre
+            self._insertar(persona, persona.id, date.min)
+    
+    @classmethod
+    def copiar_de(cls, repository: PersonaRepositoryBase) -> "PersonaRepositoryMemoria":
+        """Crea un repositorio en memoria con una copia de todas las personas de otro (y sus períodos)"""
+        personas = []
+        for tipo in TipoPersona:
+            personas.extend(repository.obtener_todos(tipo, incluir_inactivos=True))
+        copia = cls(personas)
+        for persona in personas:
+            copia._membresias[persona.id] = repository.obtener_membresias(persona.id)
+        return copia
+    
+    def _insertar(self, persona: Persona, persona_id=None, desde: Optional[date] = None) -> int:
+        with self._lock:
+            if persona_id is None:
+                persona_id = self._proximo_id
+            self._proximo_id = max(self._proximo_id, persona_id + 1)
+            # Se guarda una copia: cambiar el objeto del llamador no altera el repositorio
+            self._personas[persona_id] = replace(persona, id=persona_id)
+            self._membresias[persona_id] = (
+                [Membresia(persona_id, desde or date.today(), grupo=persona.grupo)] if persona.activo else []
+            )
+            self.version += 1
+            return persona_id
+    
+    def obtener_todos(self, tipo: TipoPersona, incluir_inactivos: bool = False,
+                      as_of: Optional[date] = None) -> List[Persona]:
+        with self._lock:
+            personas = [replace(p) for p in self._personas.values() if p.tipo == tipo]
+            if as_of is not None:
+                for persona in personas:
+                    periodo = self._vigente(persona.id, as_of)
+                    persona.activo = periodo is not None
+                    if periodo is not None:
+                        persona.grupo = periodo.grupo
+        personas = [p for p in personas if incluir_inactivos or p.activo]
+        return sorted(personas, key=lambda p: (p.apellido, p.nombre))
+    
+    def _vigente(self, persona_id: int, fecha: date) -> Optional[Membresia]:
+        """Período que rige en una fecha: el último que empezó antes (búsqueda binaria)"""
+        periodos = self._membresias.get(persona_id, [])
+        posicion = bisect_right([m.desde for m in periodos], fecha)
+        if posicion and periodos[posicion - 1].vigente_en(fecha):
+            return periodos[posicion - 1]
+        return None
+    
+    def obtener_membresias(self, persona_id: int) -> List[Membresia]:
+        with self._lock:
+            return list(self._membresias.get(persona_id, []))
+    
+    def agregar(self, persona: Persona) -> int:
+        return self._insertar(persona)
+    
+    def desactivar(self, persona_id: int, revision: Optional[int] = None):
+        self._cambiar(persona_id, revision, activo=False)
+    
+    def activar(self, persona_id: int, revision: Optional[int] = None):
+        self._cambiar(persona_id, revision, activo=True)
+    
+    def cambiar_grupo(self, persona_id: int, grupo: Optional[int], revision: Optional[int] = None):
+        self._cambiar(persona_id, revision, grupo=grupo)
+    
+    def activar_todos(self, tipo: TipoPersona):
+        with self._lock:
+            for persona in self._personas.values():
+                if persona.tipo == tipo and not persona.activo:
+                    self._aplicar(persona, activo=True)
+            self.version += 1
+    
+    def _cambiar(self, persona_id: int, revision: Optional[int], **cambios):
+        with self._lock:
+            persona = self._personas.get(persona_id)
+            if revision is not None and (persona is None or persona.revision != revision):
+                raise ConflictoVersion("personas", persona_id, replace(persona) if persona else None)
+            if persona is not None:
+                self._aplicar(persona, **cambios)
+            self.version += 1
+    
+    def _aplicar(self, persona: Persona, **cambios):
+        """Cambia activo/grupo y, como los triggers de la BD, cierra y abre períodos"""
+        antes = (persona.activo, persona.grupo)
+        for campo, valor in cambios.items():
+            setattr(persona, campo, valor)
+        persona.revision += 1
+        if (persona.activo, persona.grupo) == antes:
+            return
+        hoy = date.today()
+        periodos = self._membresias.setdefault(persona.id, [])
+        if periodos and periodos[-1].hasta is None:
+            cerrado = replace(periodos.pop(), hasta=hoy)
+            if cerrado.desde < hoy:
+                periodos.append(cerrado)
+        if persona.activo:
+            periodos.append(Membresia(persona.id, hoy, grupo=persona.grupo))
+
+class AsignacionRepositoryMemoria(AsignacionRepositoryBase):
+    """Repositorio de asignaciones en memoria (sin disco)"""
+    
+    def __init__(self, filas: Iterable[tuple] = ()):
+        super().__init__()
+        self._lock = threading.Lock()
+        # id -> fila (los dict conservan el orden de inserción)
+        self._filas: Dict[int, tuple] = {}
+        # id -> revisión (solo las filas editadas; las demás están en 0)
+        self._revisiones: Dict[int, int] = {}
+        self._proximo_id = 1
+        self.guardar_lote(filas)
+    
+    @classmethod
+    def copiar_de(cls, repository: AsignacionRepositoryBase) -> "AsignacionRepositoryMemoria":
+        """Crea un repositorio en memoria con una copia de las asignaciones de otro"""
+        return cls(repository.iterar_todas())
+    
+    def guardar(self, asignacion: Asignacion) -> int:
+        with self._lock:
+            return self._agregar(asignacion.to_tuple())
+    
+    def guardar_lote(self, filas: Iterable[tuple], tamano_lote: int = 500) -> int:
+        total = 0
+        with self._lock:
+            for fila in filas:
+                self._agregar(tuple(fila))
+                total += 1
+        return total
+    
+    def _agregar(self, fila: tuple) -> int:
+        fila_id = self._proximo_id
+        self._proximo_id += 1
+        self._filas[fila_id] = fila
+        self.version += 1
+        return fila_id
+    
+    def iterar_todas(self, tamano_lote: int = 500) -> Iterator[tuple]:
+        with self._lock:
+            filas = list(self._filas.values())
+        return iter(filas)
+    
+    def obtener_con_id(self, numero_mes: Optional[int] = None) -> List[Tuple[int, int, tuple]]:
+        mes_nombre = MESES[numero_mes] if numero_mes else None
+        with self._lock:
+            return [(fila_id, self._revisiones.get(fila_id, 0), fila)
+                    for fila_id, fila in self._filas.items()
+                    if mes_nombre is None or mes_nombre in fila[0].lower()]
+    
+    def obtener_fila(self, id_asignacion: int) -> Optional[Tuple[int, tuple]]:
+        with self._lock:
+            return self._actual(id_asignacion)
+    
+    def _actual(self, id_asignacion: int) -> Optional[Tuple[int, tuple]]:
+        fila = self._filas.get(id_asignacion)
+        return None if fila is None else (self._revisiones.get(id_asignacion, 0), fila)
+    
+    def eliminar_todas(self):
+        with self._lock:
+            self._filas.clear()
+            self._revisiones.clear()
+            self.version += 1
+    
+    def actualizar(self, id_asignacion: int, columna: str, valor: str,
+                   revision: Optional[int] = None, registrar: Optional[Registro] = None) -> Optional[int]:
+        self._sin_transaccion(registrar)
+        self._validar_columna(columna)
+        posicion = self._posicion(columna)
+        with self._lock:
+            actual = self._actual(id_asignacion)
+            if revision is not None and (actual is None or actual[0] != revision):
+                raise ConflictoVersion("asignaciones", id_asignacion, actual)
+            self.version += 1
+            if actual is None:
+                return None
+            fila = actual[1]
+            self._filas[id_asignacion] = fila[:posicion] + (valor,) + fila[posicion + 1:]
+            self._revisiones[id_asignacion] = actual[0] + 1
+            return actual[0] + 1
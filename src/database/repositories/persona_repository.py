@@ -1,55 +1,165 @@
 import sqlite3
-from typing import List, Optional
+from datetime import date
+from typing import Iterable, List, Optional
+from src.models.membresia import Membresia
 from src.models.persona import Persona, TipoPersona
+from src.database.db_manager import DBManager
+from src.database.escritor import EscritorUnico, escribir
+from src.database.repositories.cambios_repository import leer_ultimo_seq
+from src.database.repositories.base import ConflictoVersion, PersonaRepositoryBase
+from src.database.instrumentacion import conectar
+from src.config.settings import DB_PATH
+from src.utils.file_utils import FileUtils
 
-class PersonaRepository:
-    """Patrón Repository: Maneja el acceso a datos de personas"""
+class PersonaRepository(PersonaRepositoryBase):
+    """Patrón Repository: Maneja el acceso a datos de personas (SQLite)"""
     
-    def __init__(self, db_path: str = "asignaciones.db"):
+    # Columnas en el orden que espera _row_to_persona
+    COLUMNAS = "id, nombre, apellido, tipo, activo, grupo, revision"
+    
+    def __init__(self, db_path: str = DB_PATH, escritor: Optional[EscritorUnico] = None):
+        """
+        Args:
+            db_path: Ruta de la BD
+            escritor: Si se indica, las escrituras pasan por él (ver EscritorUnico)
+        """
+        super().__init__()
         self.db_path = db_path
+        self.escritor = escritor
         self._crear_tabla()
     
     def _crear_tabla(self):
         """Crea la tabla si no existe"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS personas (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL,
-                    apellido TEXT NOT NULL,
-                    tipo TEXT NOT NULL,
-                    activo INTEGER DEFAULT 1,
-                    grupo INTEGER
-                )
-            """)
+        # El esquema se verifica una sola vez por proceso (ver DBManager)
+        DBManager(self.db_path).inicializar_esquema()
     
-    def obtener_todos(self, tipo: TipoPersona) -> List[Persona]:
-        """Obtiene todas las personas de un tipo"""
-        with sqlite3.connect(self.db_path) as conn:
+    def version_datos(self) -> int:
+        """Último seq del registro de cambios: lo mueve cualquier escritura, de cualquier proceso"""
+        with conectar(self.db_path) as conn:
+            return leer_ultimo_seq(conn)
+    
+    def obtener_todos(self, tipo: TipoPersona, incluir_inactivos: bool = False,
+                      as_of: Optional[date] = None) -> List[Persona]:
+        """
+        Obtiene todas las personas de un tipo (por defecto solo las activas)
+        Args:
+            as_of: Si se indica, activo y grupo son los que regían ese día
+        """
+        if as_of is not None:
+            return self._obtener_al(tipo, incluir_inactivos, as_of)
+        filtro_activo = "" if incluir_inactivos else " AND activo = 1"
+        with conectar(self.db_path) as conn:
             cursor = conn.execute(
-                "SELECT * FROM personas WHERE tipo = ? AND activo = 1 ORDER BY apellido, nombre",
+                f"SELECT {self.COLUMNAS} FROM personas WHERE tipo = ?{filtro_activo} ORDER BY apellido, nombre",
                 (tipo.value,)
             )
             return [self._row_to_persona(row) for row in cursor.fetchall()]
     
-    def agregar(self, persona: Persona) -> int:
-        """Agrega una nueva persona"""
-        with sqlite3.connect(self.db_path) as conn:
+    def _obtener_al(self, tipo: TipoPersona, incluir_inactivos: bool, as_of: date) -> List[Persona]:
+        """
+        Personas con el período de membresía vigente en una fecha
+        Por cada persona, el período que rige es el de mayor `desde` que no
+        pasa la fecha: MAX sobre la clave primaria (persona_id, desde), sin
+        recorrer la historia.
+        """
+        filtro_activo = "" if incluir_inactivos else " AND m.persona_id IS NOT NULL"
+        with conectar(self.db_path) as conn:
+            cursor = conn.execute(f"""
+                SELECT p.id, p.nombre, p.apellido, p.tipo, m.persona_id IS NOT NULL,
+                       CASE WHEN m.persona_id IS NULL THEN p.grupo ELSE m.grupo END, p.revision
+                FROM personas p
+                LEFT JOIN membresias m
+                  ON m.persona_id = p.id
+                 AND m.desde = (SELECT MAX(desde) FROM membresias WHERE persona_id = p.id AND desde <= :fecha)
+                 AND (m.hasta IS NULL OR m.hasta > :fecha)
+                WHERE p.tipo = :tipo{filtro_activo}
+                ORDER BY p.apellido, p.nombre
+            """, {"fecha": as_of.isoformat(), "tipo": tipo.value})
+            return [self._row_to_persona(row) for row in cursor.fetchall()]
+    
+    def obtener_membresias(self, persona_id: int) -> List[Membresia]:
+        """Períodos de actividad de una persona, del más viejo al más nuevo"""
+        with conectar(self.db_path) as conn:
             cursor = conn.execute(
-                "INSERT INTO personas (nombre, apellido, tipo, activo, grupo) VALUES (?, ?, ?, ?, ?)",
-                (persona.nombre, persona.apellido, persona.tipo.value, persona.activo, persona.grupo)
+                "SELECT desde, hasta, grupo FROM membresias WHERE persona_id = ? ORDER BY desde",
+                (persona_id,)
             )
-            return cursor.lastrowid
+            return [
+                Membresia(persona_id, date.fromisoformat(desde),
+                          date.fromisoformat(hasta) if hasta else None, grupo)
+                for desde, hasta, grupo in cursor
+            ]
+    
+    def agregar(self, persona: Persona) -> int:
+        """Agrega una nueva persona"""
+        persona_id = self._escribir(lambda conn: conn.execute(
+            "INSERT INTO personas (nombre, apellido, tipo, activo, grupo) VALUES (?, ?, ?, ?, ?)",
+            (persona.nombre, persona.apellido, persona.tipo.value, persona.activo, persona.grupo)
+        ).lastrowid)
+        self.version += 1
+        return persona_id
+    
+    def agregar_lote(self, personas: Iterable[Persona], tamano_lote: int = 500) -> int:
+        """
+        Agrega muchas personas en una sola transacción
+        Args:
+            personas: Personas a agregar (puede ser un generador)
+            tamano_lote: Filas por cada executemany
+        Returns:
+            Cantidad de personas agregadas (si algo falla, no se agrega ninguna)
+        """
+        def insertar(conn: sqlite3.Connection) -> int:
+            total = 0
+            for lote in FileUtils.en_lotes(personas, tamano_lote):
+                conn.executemany(
+                    "INSERT INTO personas (nombre, apellido, tipo, activo, grupo) VALUES (?, ?, ?, ?, ?)",
+                    [(p.nombre, p.apellido, p.tipo.value, p.activo, p.grupo) for p in lote]
+                )
+                total += len(lote)
+            return total
+        
+        total = self._escribir(insertar)
+        if total:
+            self.version += 1
+        return total
+    
+    def desactivar(self, persona_id: int, revision: Optional[int] = None):
+        """Desactiva una persona (soft delete; su período de membresía se cierra hoy)"""
+        self._cambiar(persona_id, "activo", False, revision)
+    
+    def activar(self, persona_id: int, revision: Optional[int] = None):
+        """Reactiva una persona (abre un período de membresía desde hoy)"""
+        self._cambiar(persona_id, "activo", True, revision)
+    
+    def cambiar_grupo(self, persona_id: int, grupo: Optional[int], revision: Optional[int] = None):
+        """Cambia el grupo de una persona; el grupo anterior queda registrado hasta hoy"""
+        self._cambiar(persona_id, "grupo", grupo, revision)
+    
+    def activar_todos(self, tipo: TipoPersona):
+        """Reactiva todas las personas de un tipo (en una sola sentencia)"""
+        self._escribir(lambda conn: conn.execute(
+            "UPDATE personas SET activo = 1, revision = revision + 1 WHERE tipo = ? AND activo = 0",
+            (tipo.value,)
+        ))
+        self.version += 1
     
-    def desactivar(self, persona_id: int):
-        """Desactiva una persona (soft delete)"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("UPDATE personas SET activo = 0 WHERE id = ?", (persona_id,))
+    def _cambiar(self, persona_id: int, columna: str, valor, revision: Optional[int]):
+        """UPDATE condicional: con revisión, falla rápido si otro la cambió"""
+        def cambiar(conn: sqlite3.Connection):
+            sql = f"UPDATE personas SET {columna} = ?, revision = revision + 1 WHERE id = ?"
+            parametros = [valor, persona_id]
+            if revision is not None:
+                sql += " AND revision = ?"
+                parametros.append(revision)
+            if conn.execute(sql, parametros).rowcount == 0 and revision is not None:
+                fila = conn.execute(f"SELECT {self.COLUMNAS} FROM personas WHERE id = ?", (persona_id,)).fetchone()
+                raise ConflictoVersion("personas", persona_id, self._row_to_persona(fila) if fila else None)
+        
+        self._escribir(cambiar)
+        self.version += 1
     
-    def activar(self, persona_id: int):
-        """Reactiva una persona"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("UPDATE personas SET activo = 1 WHERE id = ?", (persona_id,))
+    def _escribir(self, funcion):
+        return escribir(self.db_path, funcion, self.escritor)
     
     def _row_to_persona(self, row) -> Persona:
         """Convierte una fila de BD a objeto Persona"""
@@ -59,5 +169,6 @@ class PersonaRepository:
             apellido=row[2],
             tipo=TipoPersona(row[3]),
             activo=bool(row[4]),
-            grupo=row[5]
+            grupo=row[5],
+            revision=row[6]
         )
@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+@dataclass
+class Cambio:
+    """Una entrada del registro de cambios (ver tabla 'cambios')"""
+    seq: int
+    tabla: str
+    fila_id: int
+    operacion: str  # "insertar", "actualizar" o "borrar"
+    datos: dict = field(default_factory=dict)
+    fecha: Optional[str] = None
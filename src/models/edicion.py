@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass(frozen=True)
+class Edicion:
+    """Cambio de una celda: solo la diferencia, no la fila entera"""
+    fila_id: int
+    columna: str
+    anterior: str
+    nuevo: str
+
+@dataclass
+class Comando:
+    """Una o varias ediciones que se deshacen y rehacen juntas"""
+    descripcion: str
+    ediciones: List[Edicion] = field(default_factory=list)
+    id: Optional[int] = None  # Asignado al guardarlo en el historial
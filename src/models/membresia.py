@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+@dataclass(frozen=True)
+class Membresia:
+    """Período en que una persona estuvo activa (con su grupo en ese período)"""
+    persona_id: int
+    desde: date
+    hasta: Optional[date] = None  # Exclusivo; None = sigue vigente
+    grupo: Optional[int] = None
+    
+    def vigente_en(self, fecha: date) -> bool:
+        return self.desde <= fecha and (self.hasta is None or fecha < self.hasta)
@@ -19,6 +19,7 @@ class Persona:
     tipo: TipoPersona = TipoPersona.ACOMODADOR
     activo: bool = True
     grupo: Optional[int] = None  # Para vigilantes
+    revision: int = 0  # Cambia en cada escritura (control de concurrencia)
     
     @property
     def nombre_completo(self) -> str:
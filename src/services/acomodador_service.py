@@ -1,18 +1,19 @@
 import random
-import sqlite3
-from typing import List, Tuple
+from datetime import date
+from typing import List, Optional, Tuple
 from src.models.persona import Persona, TipoPersona
+from src.database.repositories.base import PersonaRepositoryBase
 from src.database.repositories.persona_repository import PersonaRepository
 
 class AcomodadorService:
     """Patrón Service: Contiene la lógica de negocio de acomodadores"""
     
-    def __init__(self, repository: PersonaRepository = None):
+    def __init__(self, repository: PersonaRepositoryBase = None):
         self.repository = repository or PersonaRepository()
     
-    def obtener_acomodadores_activos(self) -> List[Persona]:
-        """Obtiene todos los acomodadores activos ordenados"""
-        return self.repository.obtener_todos(TipoPersona.ACOMODADOR)
+    def obtener_acomodadores_activos(self, as_of: Optional[date] = None) -> List[Persona]:
+        """Obtiene todos los acomodadores activos ordenados (hoy o en la fecha `as_of`)"""
+        return self.repository.obtener_todos(TipoPersona.ACOMODADOR, as_of=as_of)
     
     def seleccionar_aleatorios(self, cantidad: int = 5) -> Tuple[List[Persona], str]:
         """
@@ -37,20 +38,16 @@ class AcomodadorService:
             f"Acomodador después de la reunión: {seleccionados[4]}"
         )
     
-    def desactivar_acomodador(self, persona_id: int):
-        """Desactiva un acomodador (equivalente a remover)"""
-        self.repository.desactivar(persona_id)
+    def desactivar_acomodador(self, persona_id: int, revision: Optional[int] = None):
+        """
+        Desactiva un acomodador (equivalente a remover)
+        Con `revision`, ConflictoVersion si otro lo cambió desde que se leyó
+        """
+        self.repository.desactivar(persona_id, revision)
     
     def reiniciar_todos(self) -> List[Persona]:
         """Reactiva todos los acomodadores"""
-        # Primero obtener todos (incluso inactivos)
-        with sqlite3.connect(self.repository.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT id FROM personas WHERE tipo = ?",
-                (TipoPersona.ACOMODADOR.value,)
-            )
-            for row in cursor.fetchall():
-                self.repository.activar(row[0])
+        self.repository.activar_todos(TipoPersona.ACOMODADOR)
         
         return self.obtener_acomodadores_activos()
     
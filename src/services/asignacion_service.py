@@ -1,13 +1,16 @@
-from typing import List, Optional
+from datetime import date
+from typing import List, Optional, Tuple
+from src.config.constants import ENCABEZADOS_ASIGNACION
 from src.models.asignacion import Asignacion
 from src.models.persona import Persona
 from src.models.semana import Semana
+from src.database.repositories.base import AsignacionRepositoryBase
 from src.database.repositories.asignacion_repository import AsignacionRepository
 
 class AsignacionService:
     """Servicio para gestionar lógica de negocio de asignaciones"""
     
-    def __init__(self, repository: AsignacionRepository = None):
+    def __init__(self, repository: AsignacionRepositoryBase = None):
         self.repository = repository or AsignacionRepository()
     
     def crear_asignacion(self, semana: Semana,
@@ -78,6 +81,49 @@ class AsignacionService:
         
         return self.repository.obtener_por_mes(numero_mes)
     
+    def obtener_asignaciones_con_id(self, numero_mes: Optional[int] = None) -> List[Tuple[int, int, tuple]]:
+        """
+        Obtiene las asignaciones con su id y revisión (para editarlas)
+        Args:
+            numero_mes: Si se especifica, solo las de ese mes
+        Returns: Lista de (id, revisión, tupla)
+        """
+        if numero_mes is not None and (numero_mes < 1 or numero_mes > 12):
+            raise ValueError("El mes debe estar entre 1 y 12")
+        
+        return self.repository.obtener_con_id(numero_mes)
+    
+    def obtener_asignacion(self, id_asignacion: int) -> Optional[Tuple[int, tuple]]:
+        """(revisión, tupla) de una asignación guardada, o None si ya no existe"""
+        return self.repository.obtener_fila(id_asignacion)
+    
+    def obtener_asignaciones_por_rango(self, desde: Optional[date], hasta: Optional[date]) -> List[tuple]:
+        """
+        Obtiene las asignaciones de las semanas que se superponen con un rango
+        Args:
+            desde: Primer día del rango (None = sin límite)
+            hasta: Último día del rango, inclusive (None = sin límite)
+        """
+        if desde is not None and hasta is not None and hasta < desde:
+            raise ValueError("La fecha final es anterior a la inicial")
+        
+        return list(self.repository.iterar_por_rango(desde, hasta))
+    
+    def proximos_turnos(self, nombre: str, desde: Optional[date] = None) -> List[tuple]:
+        """
+        Obtiene los turnos de una persona desde una fecha
+        Args:
+            nombre: Nombre completo (no distingue mayúsculas ni acentos)
+            desde: Fecha desde la que se buscan (si es None, usa hoy)
+        Returns:
+            Lista de (semana, dia_reunion, puesto) ordenada por fecha
+        """
+        puestos = dict(zip(self.repository.COLUMNAS_PERSONAS, ENCABEZADOS_ASIGNACION[1:7]))
+        return [
+            (semana, dia_reunion, puestos[columna])
+            for semana, dia_reunion, columna in self.repository.iterar_turnos_de(nombre, desde or date.today())
+        ]
+    
     def limpiar_todas_asignaciones(self) -> bool:
         """Elimina todas las asignaciones"""
         try:
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+from typing import Callable, List, Optional
+from src.config.settings import DB_PATH, BACKUP_DIR, BACKUP_RETENCION
+
+class BackupService:
+    """
+    Respaldos en caliente de la BD con la API de backup de SQLite
+    La copia se hace de a unas pocas páginas por paso, así la BD sigue
+    disponible para la interfaz mientras se respalda.
+    """
+    
+    PAGINAS_POR_PASO = 64
+    FORMATO_FECHA = "%Y%m%d_%H%M%S_%f"
+    
+    def __init__(self, db_path: str = DB_PATH, carpeta: str = BACKUP_DIR,
+                 retencion: int = BACKUP_RETENCION):
+        """
+        Args:
+            db_path: BD a respaldar
+            carpeta: Carpeta donde se guardan los respaldos
+            retencion: Cantidad de respaldos que se conservan (0 = todos)
+        """
+        self.db_path = db_path
+        self.carpeta = carpeta
+        self.retencion = retencion
+    
+    @property
+    def _prefijo(self) -> str:
+        return os.path.splitext(os.path.basename(self.db_path))[0] + "_"
+    
+    def crear_respaldo(self, paginas: int = PAGINAS_POR_PASO, pausa: float = 0.0,
+                       progreso: Optional[Callable[[int, int], None]] = None) -> str:
+        """
+        Crea un respaldo con fecha y hora y aplica la retención
+        Args:
+            paginas: Páginas copiadas por paso
+            pausa: Segundos de espera entre pasos (deja pasar a otras escrituras)
+            progreso: Callback(copiadas, total) después de cada paso
+        Returns:
+            Ruta del respaldo creado
+        """
+        os.makedirs(self.carpeta, exist_ok=True)
+        destino = self._ruta_nueva()
+        temporal = destino + ".tmp"
+        
+        def paso(_estado, restantes, total):
+            if progreso:
+                progreso(total - restantes, total)
+            if pausa and restantes:
+                time.sleep(pausa)
+        
+        origen = sqlite3.connect(self.db_path)
+        copia = sqlite3.connect(temporal)
+        try:
+            origen.backup(copia, pages=paginas, progress=paso)
+        finally:
+            copia.close()
+            origen.close()
+        
+        # El respaldo solo aparece con su nombre definitivo cuando está completo
+        os.replace(temporal, destino)
+        self.aplicar_retencion()
+        return destino
+    
+    def _ruta_nueva(self) -> str:
+        """Nombre del próximo respaldo (el orden alfabético es el cronológico)"""
+        marca = datetime.now().strftime(self.FORMATO_FECHA)
+        return os.path.join(self.carpeta, f"{self._prefijo}{marca}.db")
+    
+    def listar_respaldos(self) -> List[str]:
+        """Respaldos existentes, del más antiguo al más reciente"""
+        if not os.path.isdir(self.carpeta):
+            return []
+        nombres = sorted(
+            n for n in os.listdir(self.carpeta)
+            if n.startswith(self._prefijo) and n.endswith(".db")
+        )
+        return [os.path.join(self.carpeta, n) for n in nombres]
+    
+    def aplicar_retencion(self) -> List[str]:
+        """
+        Borra los respaldos más antiguos que exceden la retención
+        Returns: Rutas borradas
+        """
+        respaldos = self.listar_respaldos()
+        if not self.retencion or len(respaldos) <= self.retencion:
+            return []
+        
+        borrados = respaldos[:-self.retencion]
+        for ruta in borrados:
+            os.remove(ruta)
+        return borrados
+    
+    def verificar(self, ruta: str) -> bool:
+        """Verifica la integridad de un respaldo"""
+        with closing(sqlite3.connect(ruta)) as conn:
+            return conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
@@ -0,0 +1,124 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Tuple
+from src.database.repositories.base import AsignacionRepositoryBase, COLUMNAS_PERSONAS
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.utils.date_utils import DateUtils
+
+# Un turno: (semana, día de reunión, columna de COLUMNAS_PERSONAS)
+Turno = Tuple[str, str, str]
+
+@dataclass(frozen=True)
+class CambioCelda:
+    """Una celda de personas con distinto valor en los dos planes"""
+    semana: str
+    dia_reunion: str
+    columna: str
+    anterior: str
+    nuevo: str
+
+@dataclass
+class CambiosPersona:
+    """Turnos que una persona gana y pierde entre los dos planes"""
+    altas: List[Turno] = field(default_factory=list)
+    bajas: List[Turno] = field(default_factory=list)
+
+@dataclass
+class DiferenciaPlanes:
+    """Resultado de comparar dos planes"""
+    celdas: List[CambioCelda] = field(default_factory=list)
+    # (semana, día de reunión) que están solo en uno de los planes
+    agregadas: List[Tuple[str, str]] = field(default_factory=list)
+    quitadas: List[Tuple[str, str]] = field(default_factory=list)
+    por_persona: Dict[str, CambiosPersona] = field(default_factory=dict)
+    
+    @property
+    def vacia(self) -> bool:
+        return not (self.celdas or self.agregadas or self.quitadas)
+    
+    def afectados(self) -> List[str]:
+        """Personas con algún turno ganado o perdido (las que hay que avisar)"""
+        return sorted(self.por_persona)
+    
+    def __str__(self) -> str:
+        return (
+            f"Celdas cambiadas: {len(self.celdas)} - Agregadas: {len(self.agregadas)} - "
+            f"Quitadas: {len(self.quitadas)} - Personas afectadas: {len(self.por_persona)}"
+        )
+
+class DiferenciasService:
+    """
+    Compara planes de asignaciones por semana, reunión y puesto
+    Las filas se indexan por (semana, día de reunión) en un dict, así que la
+    comparación recorre cada plan una sola vez. Además de las celdas
+    distintas, arma la lista de turnos ganados y perdidos de cada persona.
+    """
+    
+    def __init__(self, repository: AsignacionRepositoryBase = None):
+        self.repository = repository or AsignacionRepository()
+    
+    def comparar(self, anterior: Iterable[tuple], nuevo: Iterable[tuple]) -> DiferenciaPlanes:
+        """
+        Compara dos planes
+        Args:
+            anterior, nuevo: Filas en el orden de Asignacion.to_tuple (pueden ser generadores)
+        Returns:
+            DiferenciaPlanes (si hay filas repetidas, se emparejan en orden)
+        """
+        pendientes: Dict[Tuple[str, str], Deque[tuple]] = {}
+        for fila in anterior:
+            pendientes.setdefault((fila[0], fila[7]), deque()).append(fila)
+        
+        diferencia = DiferenciaPlanes()
+        for fila in nuevo:
+            clave = (fila[0], fila[7])
+            filas = pendientes.get(clave)
+            if filas:
+                self._comparar_filas(filas.popleft(), fila, diferencia)
+            else:
+                diferencia.agregadas.append(clave)
+                self._anotar(diferencia, clave, ("",) * 6, fila[1:7])
+        
+        for clave, filas in pendientes.items():
+            for fila in filas:
+                diferencia.quitadas.append(clave)
+                self._anotar(diferencia, clave, fila[1:7], ("",) * 6)
+        return diferencia
+    
+    def comparar_con_guardado(self, plan: Iterable[tuple]) -> DiferenciaPlanes:
+        """
+        Compara un plan con lo guardado para sus mismas semanas y reuniones
+        Las asignaciones guardadas de otras semanas no cuentan como quitadas.
+        """
+        plan = [tuple(fila) for fila in plan]
+        claves = {(fila[0], fila[7]) for fila in plan}
+        lunes = [DateUtils.parsear_semana(fila[0]) for fila in plan]
+        if plan and all(lunes):
+            # Solo se leen las semanas del plan (con el índice de semana_lunes)
+            guardadas = self.repository.iterar_por_rango(min(lunes), max(lunes))
+        else:
+            guardadas = self.repository.iterar_todas()
+        return self.comparar((fila for fila in guardadas if (fila[0], fila[7]) in claves), plan)
+    
+    def _comparar_filas(self, anterior: tuple, nuevo: tuple, diferencia: DiferenciaPlanes):
+        for columna, valor_anterior, valor_nuevo in zip(COLUMNAS_PERSONAS, anterior[1:7], nuevo[1:7]):
+            if valor_anterior != valor_nuevo:
+                diferencia.celdas.append(
+                    CambioCelda(nuevo[0], nuevo[7], columna, valor_anterior, valor_nuevo)
+                )
+        self._anotar(diferencia, (nuevo[0], nuevo[7]), anterior[1:7], nuevo[1:7])
+    
+    @staticmethod
+    def _anotar(diferencia: DiferenciaPlanes, clave: Tuple[str, str],
+                anteriores: Iterable[str], nuevos: Iterable[str]):
+        """Registra los turnos ganados y perdidos de cada puesto de una fila"""
+        for columna, valor_anterior, valor_nuevo in zip(COLUMNAS_PERSONAS, anteriores, nuevos):
+            if valor_anterior == valor_nuevo:
+                continue
+            antes = {n.strip() for n in valor_anterior.split(" / ") if n.strip()}
+            despues = {n.strip() for n in valor_nuevo.split(" / ") if n.strip()}
+            turno = (clave[0], clave[1], columna)
+            for nombre in despues - antes:
+                diferencia.por_persona.setdefault(nombre, CambiosPersona()).altas.append(turno)
+            for nombre in antes - despues:
+                diferencia.por_persona.setdefault(nombre, CambiosPersona()).bajas.append(turno)
@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from src.database.repositories.base import AsignacionRepositoryBase
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.services.vigilancia_service import VigilanciaService
+
+@dataclass
+class Estadisticas:
+    """Conteos de turnos de un rango de fechas"""
+    desde: Optional[date]
+    hasta: Optional[date]
+    # Asignaciones por día de la semana de la reunión ("Jueves", "Domingo")
+    reuniones: Dict[str, int] = field(default_factory=dict)
+    # Turnos por persona y puesto: {nombre: {columna: cantidad}}
+    por_persona: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # Turnos por puesto (columna de COLUMNAS_PERSONAS)
+    por_rol: Dict[str, int] = field(default_factory=dict)
+    # Turnos de vigilancia por el grupo de la persona esa semana (0 = sin grupo)
+    por_grupo: Dict[int, int] = field(default_factory=dict)
+    
+    @property
+    def total_asignaciones(self) -> int:
+        return sum(self.reuniones.values())
+    
+    def ranking(self) -> List[Tuple[str, int]]:
+        """Personas ordenadas por cantidad total de turnos (de más a menos)"""
+        totales = [(nombre, sum(roles.values())) for nombre, roles in self.por_persona.items()]
+        return sorted(totales, key=lambda x: (-x[1], x[0]))
+    
+    def to_dict(self) -> Dict:
+        return {
+            "desde": self.desde.isoformat() if self.desde else None,
+            "hasta": self.hasta.isoformat() if self.hasta else None,
+            "total_asignaciones": self.total_asignaciones,
+            "reuniones": self.reuniones,
+            "por_rol": self.por_rol,
+            "por_grupo": self.por_grupo,
+            "por_persona": self.por_persona,
+        }
+
+class EstadisticasService:
+    """
+    Estadísticas de turnos sobre rangos de fechas arbitrarios
+    Los conteos los hace la BD (GROUP BY sobre la tabla turnos); aquí solo se
+    reparten los resultados, que tienen una fila por persona y puesto.
+    """
+    
+    def __init__(self, repository: AsignacionRepositoryBase = None,
+                 vigilancia_service: VigilanciaService = None):
+        self.repository = repository or AsignacionRepository()
+        self.vigilancia_service = vigilancia_service or VigilanciaService()
+    
+    def calcular(self, desde: Optional[date] = None, hasta: Optional[date] = None) -> Estadisticas:
+        """
+        Calcula las estadísticas de las semanas que se superponen con un rango
+        Args:
+            desde: Primer día (None = desde el principio del historial)
+            hasta: Último día, inclusive (None = hasta el final)
+        """
+        if desde and hasta and hasta < desde:
+            raise ValueError("La fecha final es anterior a la inicial")
+        
+        estadisticas = Estadisticas(
+            desde, hasta,
+            reuniones=self.repository.contar_por_reunion(desde, hasta),
+            por_grupo=self.repository.contar_vigilancia_por_grupo(
+                self.vigilancia_service.repository, desde, hasta
+            )
+        )
+        
+        for (nombre, columna), cantidad in self.repository.contar_por_rol(desde, hasta).items():
+            estadisticas.por_persona.setdefault(nombre, {})[columna] = cantidad
+            estadisticas.por_rol[columna] = estadisticas.por_rol.get(columna, 0) + cantidad
+        
+        return estadisticas
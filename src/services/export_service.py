@@ -0,0 +1,293 @@
+import csv
+import os
+import zipfile
+from typing import BinaryIO, Iterable, List, Optional
+from xml.sax.saxutils import escape
+from src.config.constants import ENCABEZADOS_ASIGNACION
+from src.database.repositories.base import AsignacionRepositoryBase, MESES
+from src.database.repositories.asignacion_repository import AsignacionRepository
+
+class ExportService:
+    """
+    Exportación de asignaciones a CSV, XLSX y PDF
+    Todos los formatos se escriben fila por fila a medida que se leen del
+    cursor, así la memoria usada no depende del tamaño del historial.
+    Solo usa la biblioteca estándar.
+    """
+    
+    FORMATOS = ("csv", "xlsx", "pdf")
+    
+    def __init__(self, repository: AsignacionRepositoryBase = None):
+        self.repository = repository or AsignacionRepository()
+    
+    def exportar(self, ruta: str, formato: Optional[str] = None,
+                 numero_mes: Optional[int] = None) -> int:
+        """
+        Exporta las asignaciones guardadas
+        Args:
+            ruta: Archivo de salida
+            formato: "csv", "xlsx" o "pdf" (si es None, se deduce de la extensión)
+            numero_mes: Si se especifica, exporta solo ese mes
+        Returns:
+            Cantidad de filas exportadas
+        """
+        formato = formato or self.deducir_formato(ruta)
+        
+        if numero_mes:
+            if numero_mes < 1 or numero_mes > 12:
+                raise ValueError("El mes debe estar entre 1 y 12")
+            filas = self.repository.iterar_por_mes(numero_mes)
+            titulo = f"Asignaciones - {MESES[numero_mes]}"
+        else:
+            filas = self.repository.iterar_todas()
+            titulo = "Asignaciones"
+        
+        return self.exportar_filas(filas, ruta, formato, titulo)
+    
+    def exportar_filas(self, filas: Iterable[tuple], ruta: str,
+                       formato: Optional[str] = None, titulo: str = "Asignaciones") -> int:
+        """Exporta filas ya obtenidas (p.ej. un plan sin guardar)"""
+        formato = formato or self.deducir_formato(ruta)
+        if formato == "csv":
+            return self.exportar_csv(filas, ruta)
+        if formato == "xlsx":
+            return self.exportar_xlsx(filas, ruta)
+        if formato == "pdf":
+            return self.exportar_pdf(filas, ruta, titulo)
+        raise ValueError(f"Formato '{formato}' no soportado (use {', '.join(self.FORMATOS)})")
+    
+    @classmethod
+    def deducir_formato(cls, ruta: str) -> str:
+        """Deduce el formato a partir de la extensión del archivo"""
+        extension = os.path.splitext(ruta)[1].lower().lstrip(".")
+        if extension not in cls.FORMATOS:
+            raise ValueError(f"No se reconoce la extensión '{extension}' (use {', '.join(cls.FORMATOS)})")
+        return extension
+    
+    # ------------------------------------------------------------------
+    # CSV
+    # ------------------------------------------------------------------
+    
+    def exportar_csv(self, filas: Iterable[tuple], ruta: str) -> int:
+        """Escribe un CSV con encabezados"""
+        cantidad = 0
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(ENCABEZADOS_ASIGNACION)
+            for fila in filas:
+                escritor.writerow(fila)
+                cantidad += 1
+        return cantidad
+    
+    # ------------------------------------------------------------------
+    # XLSX (SpreadsheetML mínimo, con cadenas en línea)
+    # ------------------------------------------------------------------
+    
+    _XLSX_ARCHIVOS = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '</Types>'
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        "xl/workbook.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Asignaciones" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>'
+        ),
+    }
+    
+    def exportar_xlsx(self, filas: Iterable[tuple], ruta: str) -> int:
+        """Escribe un libro XLSX de una hoja; la hoja se comprime a medida que se escribe"""
+        cantidad = 0
+        with zipfile.ZipFile(ruta, "w", zipfile.ZIP_DEFLATED) as libro:
+            for nombre, contenido in self._XLSX_ARCHIVOS.items():
+                libro.writestr(nombre, contenido)
+            
+            with libro.open("xl/worksheets/sheet1.xml", "w") as hoja:
+                hoja.write(
+                    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    b'<sheetData>'
+                )
+                hoja.write(self._fila_xlsx(1, ENCABEZADOS_ASIGNACION))
+                for fila in filas:
+                    cantidad += 1
+                    hoja.write(self._fila_xlsx(cantidad + 1, fila))
+                hoja.write(b'</sheetData></worksheet>')
+        
+        return cantidad
+    
+    @staticmethod
+    def _fila_xlsx(numero: int, valores) -> bytes:
+        """Serializa una fila de la hoja con cadenas en línea"""
+        celdas = "".join(
+            f'<c r="{ExportService._columna_xlsx(i)}{numero}" t="inlineStr">'
+            f'<is><t xml:space="preserve">{escape(str(valor))}</t></is></c>'
+            for i, valor in enumerate(valores)
+        )
+        return f'<row r="{numero}">{celdas}</row>'.encode("utf-8")
+    
+    @staticmethod
+    def _columna_xlsx(indice: int) -> str:
+        """Convierte un índice 0-based a letra de columna (0 -> A)"""
+        letras = ""
+        indice += 1
+        while indice:
+            indice, resto = divmod(indice - 1, 26)
+            letras = chr(65 + resto) + letras
+        return letras
+    
+    # ------------------------------------------------------------------
+    # PDF (hoja imprimible A4 apaisada, Helvetica)
+    # ------------------------------------------------------------------
+    
+    PDF_ANCHO, PDF_ALTO = 842, 595
+    PDF_MARGEN = 30
+    PDF_TAMANO_FUENTE = 7
+    PDF_INTERLINEA = 9
+    # Proporciones de columna, como en la tabla de la interfaz
+    PDF_PROPORCIONES = [173, 220, 220, 145, 145, 145, 145, 173]
+    
+    def exportar_pdf(self, filas: Iterable[tuple], ruta: str,
+                     titulo: str = "Asignaciones") -> int:
+        """Escribe una hoja PDF paginada; cada página se vuelca al completarse"""
+        with open(ruta, "wb") as archivo:
+            escritor = _EscritorPDF(archivo)
+            anchos = self._anchos_columnas_pdf()
+            cantidad = 0
+            pagina: List[str] = []
+            y = 0.0
+            
+            def nueva_pagina():
+                nonlocal pagina, y
+                if pagina:
+                    escritor.agregar_pagina("\n".join(pagina), self.PDF_ANCHO, self.PDF_ALTO)
+                pagina = []
+                y = self.PDF_ALTO - self.PDF_MARGEN
+                pagina.append(self._texto_pdf(self.PDF_MARGEN, y - 12, titulo, 12, negrita=True))
+                y -= 24
+                y = self._fila_pdf(pagina, y, anchos, ENCABEZADOS_ASIGNACION, negrita=True)
+            
+            nueva_pagina()
+            for fila in filas:
+                lineas = max(len(self._lineas_celda(v)) for v in fila)
+                if y - lineas * self.PDF_INTERLINEA < self.PDF_MARGEN:
+                    nueva_pagina()
+                y = self._fila_pdf(pagina, y, anchos, fila)
+                cantidad += 1
+            
+            escritor.agregar_pagina("\n".join(pagina), self.PDF_ANCHO, self.PDF_ALTO)
+            escritor.cerrar()
+        
+        return cantidad
+    
+    def _anchos_columnas_pdf(self) -> List[float]:
+        """Reparte el ancho útil de la página según las proporciones"""
+        util = self.PDF_ANCHO - 2 * self.PDF_MARGEN
+        total = sum(self.PDF_PROPORCIONES)
+        return [util * p / total for p in self.PDF_PROPORCIONES]
+    
+    @staticmethod
+    def _lineas_celda(valor) -> List[str]:
+        """Las parejas "A / B" van en dos líneas"""
+        texto = str(valor)
+        return [t.strip() for t in texto.replace(" / ", "\n").split("\n")] or [""]
+    
+    def _fila_pdf(self, pagina: List[str], y: float, anchos: List[float],
+                  valores, negrita: bool = False) -> float:
+        """Dibuja una fila con su línea inferior; devuelve la nueva altura"""
+        celdas = [self._lineas_celda(v) for v in valores]
+        alto = max(len(c) for c in celdas) * self.PDF_INTERLINEA + 3
+        
+        x = self.PDF_MARGEN
+        for ancho, lineas in zip(anchos, celdas):
+            max_caracteres = int(ancho / (self.PDF_TAMANO_FUENTE * 0.5))
+            for i, linea in enumerate(lineas):
+                pagina.append(self._texto_pdf(
+                    x + 2, y - (i + 1) * self.PDF_INTERLINEA,
+                    linea[:max_caracteres], self.PDF_TAMANO_FUENTE, negrita
+                ))
+            x += ancho
+        
+        y -= alto
+        pagina.append(f"{self.PDF_MARGEN} {y:.1f} m {self.PDF_ANCHO - self.PDF_MARGEN} {y:.1f} l S")
+        return y
+    
+    @staticmethod
+    def _texto_pdf(x: float, y: float, texto: str, tamano: int, negrita: bool = False) -> str:
+        """Operadores PDF para escribir un texto"""
+        texto = texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        fuente = "F2" if negrita else "F1"
+        return f"BT /{fuente} {tamano} Tf {x:.1f} {y:.1f} Td ({texto}) Tj ET"
+
+class _EscritorPDF:
+    """Escritor PDF incremental: cada página se escribe en cuanto se agrega"""
+    
+    # Objetos reservados: 1 catálogo, 2 árbol de páginas, 3-4 fuentes
+    _PRIMER_OBJETO_LIBRE = 5
+    
+    def __init__(self, archivo: BinaryIO):
+        self.archivo = archivo
+        self.offsets = {}
+        self.paginas: List[int] = []
+        self.siguiente = self._PRIMER_OBJETO_LIBRE
+        self.archivo.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for numero, base in ((3, "Helvetica"), (4, "Helvetica-Bold")):
+            self._objeto(numero, (
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} "
+                f"/Encoding /WinAnsiEncoding >>"
+            ).encode("ascii"))
+    
+    def _objeto(self, numero: int, contenido: bytes):
+        self.offsets[numero] = self.archivo.tell()
+        self.archivo.write(f"{numero} 0 obj\n".encode("ascii"))
+        self.archivo.write(contenido)
+        self.archivo.write(b"\nendobj\n")
+    
+    def agregar_pagina(self, operadores: str, ancho: int, alto: int):
+        """Escribe el contenido y el objeto de una página"""
+        datos = operadores.encode("cp1252", errors="replace")
+        contenido, pagina = self.siguiente, self.siguiente + 1
+        self.siguiente += 2
+        
+        self._objeto(contenido, f"<< /Length {len(datos)} >>\nstream\n".encode("ascii")
+                     + datos + b"\nendstream")
+        self._objeto(pagina, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {ancho} {alto}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {contenido} 0 R >>"
+        ).encode("ascii"))
+        self.paginas.append(pagina)
+    
+    def cerrar(self):
+        """Escribe el árbol de páginas, el catálogo y la tabla xref"""
+        kids = " ".join(f"{p} 0 R" for p in self.paginas)
+        self._objeto(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.paginas)} >>".encode("ascii"))
+        self._objeto(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        
+        inicio_xref = self.archivo.tell()
+        total = self.siguiente
+        self.archivo.write(f"xref\n0 {total}\n0000000000 65535 f \n".encode("ascii"))
+        for numero in range(1, total):
+            self.archivo.write(f"{self.offsets[numero]:010d} 00000 n \n".encode("ascii"))
+        self.archivo.write((
+            f"trailer\n<< /Size {total} /Root 1 0 R >>\n"
+            f"startxref\n{inicio_xref}\n%%EOF\n"
+        ).encode("ascii"))
@@ -11,8 +11,7 @@ class FechaService:
         self.date_utils = DateUtils()
         self.grupo_service = GrupoLimpiezaService()
         
-        # Configurar locale
-        self.date_utils.configurar_locale_espanol()
+        # El locale se configura recién al generar semanas (ver generar_semanas)
         
         # Fechas especiales (asambleas, convenciones)
         self.eventos_especiales = [
@@ -46,6 +45,9 @@ class FechaService:
         Returns:
             Lista de objetos Semana
         """
+        # Configurar locale (diferido: no demora la construcción del servicio)
+        self.date_utils.configurar_locale_espanol()
+        
         if fecha_inicio is None:
             fecha_inicio = date.today()
         
@@ -0,0 +1,165 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, List, Optional
+from src.config.settings import HISTORIAL_PROFUNDIDAD
+from src.models.edicion import Comando, Edicion
+from src.database.repositories.base import AsignacionRepositoryBase, Registro
+from src.database.repositories.historial_repository import HistorialRepository
+
+class HistorialService:
+    """
+    Deshacer y rehacer ediciones de asignaciones
+    Se guardan solo las diferencias de cada celda. Con un HistorialRepository
+    el historial sobrevive a un reinicio; sin él vive solo en memoria. Nunca
+    se conservan más de `profundidad` comandos. Cada escritura guarda su
+    entrada del historial en la misma transacción. Deshacer y rehacer solo
+    escriben si las celdas siguen como las dejó el comando (si otro las
+    cambió, ConflictoVersion y el comando queda donde estaba).
+    """
+    
+    def __init__(self, asignacion_repository: AsignacionRepositoryBase,
+                 repository: Optional[HistorialRepository] = None,
+                 profundidad: int = HISTORIAL_PROFUNDIDAD):
+        """
+        Args:
+            asignacion_repository: Donde se aplican las ediciones
+            repository: Persistencia del historial (None = solo en memoria)
+            profundidad: Cantidad máxima de comandos que se pueden deshacer
+        """
+        self.asignacion_repository = asignacion_repository
+        self.repository = repository
+        self.profundidad = profundidad
+        self._deshacer: Deque[Comando] = deque(maxlen=profundidad)
+        self._rehacer: List[Comando] = []
+        self._grupo: Optional[Comando] = None
+        if repository is not None:
+            deshacer, self._rehacer = repository.cargar(profundidad)
+            self._deshacer.extend(deshacer)
+    
+    # ------------------------------------------------------------------
+    # Ediciones
+    # ------------------------------------------------------------------
+    
+    def editar(self, fila_id: int, columna: str, anterior: str, nuevo: str,
+               revision: Optional[int] = None) -> Optional[int]:
+        """
+        Aplica la edición de una celda y la registra
+        Args:
+            fila_id: Id de la asignación
+            columna: Columna editada (ver COLUMNAS_PERSONAS)
+            anterior: Valor que tenía la celda
+            nuevo: Valor nuevo
+            revision: Revisión de la fila leída; si otro la cambió, se lanza
+                ConflictoVersion y no se registra nada
+        Returns:
+            La revisión nueva de la fila
+        """
+        if anterior == nuevo:
+            return revision
+        edicion = Edicion(fila_id, columna, anterior, nuevo)
+        comando = self._grupo if self._grupo is not None else Comando(f"Editar {columna}")
+        guardado: List[int] = []
+        revision = self.asignacion_repository.actualizar(
+            fila_id, columna, nuevo, revision, registrar=self._registro(comando, edicion, guardado)
+        )
+        if guardado:
+            comando.id = guardado[0]
+        comando.ediciones.append(edicion)
+        if len(comando.ediciones) == 1:
+            # Con su primera edición el comando ya se puede deshacer
+            self._deshacer.append(comando)
+            self._rehacer.clear()
+        return revision
+    
+    @contextmanager
+    def grupo(self, descripcion: str):
+        """
+        Junta las ediciones hechas dentro del bloque en un solo comando
+        Un grupo dentro de otro se suma al de afuera.
+        """
+        if self._grupo is not None:
+            yield self._grupo
+            return
+        self._grupo = Comando(descripcion)
+        try:
+            yield self._grupo
+        finally:
+            self._grupo = None
+    
+    def _registro(self, comando: Comando, edicion: Edicion, guardado: List[int]) -> Optional[Registro]:
+        """
+        Escritura del historial para la transacción de una edición
+        La primera edición guarda el comando (su id queda en `guardado`); las
+        siguientes de un grupo se le suman. None si el historial es solo en memoria.
+        """
+        if self.repository is None:
+            return None
+        if comando.id is None:
+            nuevo = Comando(comando.descripcion, [edicion])
+            return lambda conn: guardado.append(self.repository.agregar_en(conn, nuevo, self.profundidad))
+        orden = len(comando.ediciones)
+        return lambda conn: self.repository.agregar_edicion_en(conn, comando.id, orden, edicion)
+    
+    def _marca(self, comando: Comando, deshecho: bool) -> Optional[Registro]:
+        """Escritura que marca el comando como deshecho o rehecho (None si no está guardado)"""
+        if self.repository is None or comando.id is None:
+            return None
+        return lambda conn: self.repository.marcar_en(conn, comando.id, deshecho)
+    
+    # ------------------------------------------------------------------
+    # Deshacer / rehacer
+    # ------------------------------------------------------------------
+    
+    @property
+    def puede_deshacer(self) -> bool:
+        return bool(self._deshacer)
+    
+    @property
+    def puede_rehacer(self) -> bool:
+        return bool(self._rehacer)
+    
+    def proximo_deshacer(self) -> Optional[str]:
+        """Descripción del comando que se desharía (para el menú)"""
+        return self._deshacer[-1].descripcion if self._deshacer else None
+    
+    def proximo_rehacer(self) -> Optional[str]:
+        return self._rehacer[-1].descripcion if self._rehacer else None
+    
+    def deshacer(self) -> Optional[Comando]:
+        """
+        Deshace el último comando (todas sus ediciones en una transacción)
+        Returns: El comando deshecho (para actualizar la vista) o None si no hay
+        """
+        if not self._deshacer:
+            return None
+        comando = self._deshacer[-1]
+        self.asignacion_repository.reemplazar_lote(
+            ((e.fila_id, e.columna, e.nuevo, e.anterior) for e in reversed(comando.ediciones)),
+            registrar=self._marca(comando, deshecho=True)
+        )
+        self._deshacer.pop()
+        self._rehacer.append(comando)
+        return comando
+    
+    def rehacer(self) -> Optional[Comando]:
+        """
+        Vuelve a aplicar el último comando deshecho
+        Returns: El comando rehecho o None si no hay
+        """
+        if not self._rehacer:
+            return None
+        comando = self._rehacer[-1]
+        self.asignacion_repository.reemplazar_lote(
+            ((e.fila_id, e.columna, e.anterior, e.nuevo) for e in comando.ediciones),
+            registrar=self._marca(comando, deshecho=False)
+        )
+        self._rehacer.pop()
+        self._deshacer.append(comando)
+        return comando
+    
+    def vaciar(self):
+        """Olvida todo el historial (también el guardado)"""
+        self._deshacer.clear()
+        self._rehacer.clear()
+        if self.repository is not None:
+            self.repository.vaciar()
@@ -0,0 +1,214 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.config.constants import ENCABEZADOS_ASIGNACION
+from src.models.persona import Persona, TipoPersona
+from src.database.repositories.base import AsignacionRepositoryBase, PersonaRepositoryBase
+from src.database.repositories.persona_repository import PersonaRepository
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.utils.file_utils import FileUtils
+from src.utils.indice_nombres import IndiceNombres
+
+@dataclass
+class ResultadoImportacion:
+    """Resumen de una importación masiva"""
+    insertados: int = 0
+    duplicados: int = 0
+    conflictos: List[str] = field(default_factory=list)
+    errores: List[str] = field(default_factory=list)
+    
+    def __str__(self) -> str:
+        return (
+            f"Insertados: {self.insertados} - Duplicados: {self.duplicados} - "
+            f"Conflictos: {len(self.conflictos)} - Errores: {len(self.errores)}"
+        )
+
+class ImportacionService:
+    """
+    Importación masiva de planteles y de asignaciones pasadas (CSV/XLSX)
+    Lee el archivo por lotes, descarta duplicados con un índice en memoria
+    y escribe todo con executemany en una sola transacción. Las filas con
+    problemas se informan en el resultado en lugar de cortar la importación.
+    """
+    
+    TAMANO_LOTE = 500
+    
+    # Encabezados aceptados para cada campo de persona
+    COLUMNAS_PERSONA = {
+        'apellido': ('apellido', 'apellidos'),
+        'nombre': ('nombre', 'nombres'),
+        'tipo': ('tipo', 'rol'),
+        'grupo': ('grupo', 'grupo vigilancia', 'grupo de vigilancia'),
+    }
+    
+    def __init__(self, persona_repository: PersonaRepositoryBase = None,
+                 asignacion_repository: AsignacionRepositoryBase = None):
+        self.persona_repository = persona_repository or PersonaRepository()
+        self.asignacion_repository = asignacion_repository or AsignacionRepository()
+    
+    # ------------------------------------------------------------------
+    # Personas
+    # ------------------------------------------------------------------
+    
+    def importar_personas(self, ruta: str, tipo: Optional[TipoPersona] = None) -> ResultadoImportacion:
+        """
+        Importa un plantel desde CSV/XLSX
+        Args:
+            ruta: Archivo con columnas apellido, nombre y opcionalmente tipo y grupo
+            tipo: Tipo para todas las filas (obligatorio si el archivo no tiene columna tipo)
+        Returns:
+            ResultadoImportacion
+        """
+        resultado = ResultadoImportacion()
+        filas = FileUtils.leer_filas(ruta)
+        
+        encabezado = next(filas, None)
+        if encabezado is None:
+            resultado.errores.append("El archivo está vacío")
+            return resultado
+        
+        columnas = self._mapear_columnas(encabezado)
+        faltantes = [c for c in ('apellido', 'nombre') if c not in columnas]
+        if faltantes:
+            resultado.errores.append(f"Faltan las columnas: {', '.join(faltantes)}")
+            return resultado
+        if tipo is None and 'tipo' not in columnas:
+            resultado.errores.append("Falta la columna 'tipo' (o indique el tipo para todo el archivo)")
+            return resultado
+        
+        existentes = self._indice_personas()
+        resultado.insertados = self.persona_repository.agregar_lote(
+            self._personas_nuevas(filas, columnas, tipo, existentes, resultado),
+            self.TAMANO_LOTE
+        )
+        return resultado
+    
+    def _mapear_columnas(self, encabezado: List[str]) -> Dict[str, int]:
+        """Asocia cada campo con la posición de su columna en el archivo"""
+        normalizados = [IndiceNombres.normalizar(e).strip() for e in encabezado]
+        columnas = {}
+        for campo, alias in self.COLUMNAS_PERSONA.items():
+            for i, nombre in enumerate(normalizados):
+                if nombre in alias:
+                    columnas[campo] = i
+                    break
+        return columnas
+    
+    def _indice_personas(self) -> Dict[Tuple[str, str, str], Persona]:
+        """Índice en memoria (apellido, nombre, tipo) -> persona, incluidas las inactivas"""
+        indice = {}
+        for tipo in TipoPersona:
+            for persona in self.persona_repository.obtener_todos(tipo, incluir_inactivos=True):
+                indice[self._clave_persona(persona.apellido, persona.nombre, tipo)] = persona
+        return indice
+    
+    @staticmethod
+    def _clave_persona(apellido: str, nombre: str, tipo: TipoPersona) -> Tuple[str, str, str]:
+        return (
+            " ".join(IndiceNombres.normalizar(apellido).split()),
+            " ".join(IndiceNombres.normalizar(nombre).split()),
+            tipo.value
+        )
+    
+    def _personas_nuevas(self, filas: Iterator[List[str]], columnas: Dict[str, int],
+                         tipo_fijo: Optional[TipoPersona],
+                         existentes: Dict[Tuple[str, str, str], Persona],
+                         resultado: ResultadoImportacion) -> Iterator[Persona]:
+        """Genera las personas a insertar, registrando duplicados, conflictos y errores"""
+        def valor(fila, campo):
+            i = columnas.get(campo)
+            return fila[i].strip() if i is not None and i < len(fila) else ""
+        
+        for numero, fila in enumerate(filas, start=2):
+            if not any(fila):
+                continue
+            
+            apellido, nombre = valor(fila, 'apellido'), valor(fila, 'nombre')
+            if not apellido or not nombre:
+                resultado.errores.append(f"Fila {numero}: falta apellido o nombre")
+                continue
+            
+            try:
+                tipo = tipo_fijo or TipoPersona(IndiceNombres.normalizar(valor(fila, 'tipo')))
+            except ValueError:
+                resultado.errores.append(f"Fila {numero}: tipo '{valor(fila, 'tipo')}' no válido")
+                continue
+            
+            texto_grupo = valor(fila, 'grupo')
+            try:
+                grupo = int(texto_grupo) if texto_grupo else None
+            except ValueError:
+                resultado.errores.append(f"Fila {numero}: grupo '{texto_grupo}' no válido")
+                continue
+            
+            clave = self._clave_persona(apellido, nombre, tipo)
+            existente = existentes.get(clave)
+            if existente is not None:
+                resultado.duplicados += 1
+                if grupo is not None and existente.grupo is not None and existente.grupo != grupo:
+                    resultado.conflictos.append(
+                        f"Fila {numero}: {existente} ya existe en el grupo {existente.grupo} "
+                        f"(el archivo indica el grupo {grupo})"
+                    )
+                elif not existente.activo:
+                    resultado.conflictos.append(f"Fila {numero}: {existente} ya existe pero está inactivo")
+                continue
+            
+            persona = Persona(nombre=nombre, apellido=apellido, tipo=tipo, activo=True, grupo=grupo)
+            # También evita duplicados dentro del mismo archivo
+            existentes[clave] = persona
+            yield persona
+    
+    # ------------------------------------------------------------------
+    # Asignaciones
+    # ------------------------------------------------------------------
+    
+    def importar_asignaciones(self, ruta: str) -> ResultadoImportacion:
+        """
+        Importa una planilla de asignaciones pasadas
+        Args:
+            ruta: Archivo con las columnas de ENCABEZADOS_ASIGNACION (mismo formato que la exportación)
+        Returns:
+            ResultadoImportacion (se consideran duplicadas las de igual semana y día de reunión)
+        """
+        resultado = ResultadoImportacion()
+        filas = FileUtils.leer_filas(ruta)
+        
+        encabezado = next(filas, None)
+        if encabezado is None:
+            resultado.errores.append("El archivo está vacío")
+            return resultado
+        
+        normalizados = [IndiceNombres.normalizar(e).strip() for e in encabezado]
+        esperados = [IndiceNombres.normalizar(e) for e in ENCABEZADOS_ASIGNACION]
+        faltantes = [ENCABEZADOS_ASIGNACION[i] for i, e in enumerate(esperados) if e not in normalizados]
+        if faltantes:
+            resultado.errores.append(f"Faltan las columnas: {', '.join(faltantes)}")
+            return resultado
+        posiciones = [normalizados.index(e) for e in esperados]
+        
+        existentes = self.asignacion_repository.obtener_claves()
+        resultado.insertados = self.asignacion_repository.guardar_lote(
+            self._asignaciones_nuevas(filas, posiciones, existentes, resultado),
+            self.TAMANO_LOTE
+        )
+        return resultado
+    
+    def _asignaciones_nuevas(self, filas: Iterator[List[str]], posiciones: List[int],
+                             existentes: set, resultado: ResultadoImportacion) -> Iterator[tuple]:
+        """Genera las tuplas a insertar, registrando duplicados y errores"""
+        for numero, fila in enumerate(filas, start=2):
+            if not any(fila):
+                continue
+            
+            valores = tuple(fila[i].strip() if i < len(fila) else "" for i in posiciones)
+            if not all(valores):
+                resultado.errores.append(f"Fila {numero}: hay columnas vacías")
+                continue
+            
+            clave = (valores[0], valores[-1])
+            if clave in existentes:
+                resultado.duplicados += 1
+                continue
+            
+            existentes.add(clave)
+            yield valores
@@ -0,0 +1,90 @@
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+from src.models.asignacion import Asignacion
+from src.models.semana import Semana
+from src.services.fecha_service import FechaService
+from src.services.acomodador_service import AcomodadorService
+from src.services.vigilancia_service import VigilanciaService
+from src.services.asignacion_service import AsignacionService
+
+class PlanificacionService:
+    """
+    Servicio para generar planes completos (varias semanas) sin interfaz
+    Combina los servicios existentes tal como lo hacen los paneles
+    """
+    
+    REUNIONES = ("entre_semana", "fin_semana")
+    
+    def __init__(self, fecha_service: FechaService = None,
+                 acomodador_service: AcomodadorService = None,
+                 vigilancia_service: VigilanciaService = None,
+                 asignacion_service: AsignacionService = None):
+        self.fecha_service = fecha_service or FechaService()
+        self.acomodador_service = acomodador_service or AcomodadorService()
+        self.vigilancia_service = vigilancia_service or VigilanciaService()
+        self.asignacion_service = asignacion_service or AsignacionService()
+    
+    def generar_plan(self, fecha_inicio: Optional[date] = None, cantidad: int = 4,
+                     reuniones: Sequence[str] = REUNIONES,
+                     omitir_especiales: bool = True) -> List[Asignacion]:
+        """
+        Genera las asignaciones de un rango de semanas
+        Args:
+            fecha_inicio: Fecha de inicio (si es None, usa hoy)
+            cantidad: Cantidad de semanas
+            reuniones: Reuniones a cubrir por semana ("entre_semana", "fin_semana")
+            omitir_especiales: Si se saltean las semanas de asamblea/convención
+        Returns:
+            Lista de asignaciones (sin guardar)
+        """
+        semanas = self.fecha_service.generar_semanas(fecha_inicio, cantidad)
+        plan = []
+        
+        for semana in semanas:
+            if omitir_especiales and semana.es_especial:
+                continue
+            
+            for tipo_reunion in reuniones:
+                acomodadores, _ = self.acomodador_service.seleccionar_aleatorios(5)
+                vigilantes = self._seleccionar_vigilantes(semana)
+                plan.append(self.asignacion_service.crear_asignacion(
+                    semana, acomodadores, vigilantes, tipo_reunion
+                ))
+        
+        return plan
+    
+    def _seleccionar_vigilantes(self, semana: Semana):
+        """Toma los vigilantes del grupo de limpieza de la semana (como el panel)"""
+        try:
+            seleccionados, _ = self.vigilancia_service.seleccionar_por_grupo(semana.grupo_limpieza)
+        except ValueError:
+            # El grupo no tiene suficientes miembros activos
+            seleccionados, _ = self.vigilancia_service.seleccionar_aleatorios(3)
+        return seleccionados
+    
+    def validar_plan(self, plan: List[Asignacion]) -> List[str]:
+        """
+        Valida todas las asignaciones del plan
+        Returns: Lista de errores (vacía si el plan es válido)
+        """
+        errores = []
+        for asignacion in plan:
+            es_valida, mensaje = asignacion.validar()
+            if not es_valida:
+                errores.append(f"{asignacion.semana} ({asignacion.dia_reunion}): {mensaje}")
+        return errores
+    
+    def guardar_plan(self, plan: List[Asignacion]) -> Tuple[int, List[str]]:
+        """
+        Guarda todas las asignaciones del plan
+        Returns: (cantidad_guardadas, errores)
+        """
+        guardadas = 0
+        errores = []
+        for asignacion in plan:
+            exito, mensaje = self.asignacion_service.guardar_asignacion(asignacion)
+            if exito:
+                guardadas += 1
+            else:
+                errores.append(f"{asignacion.semana} ({asignacion.dia_reunion}): {mensaje}")
+        return guardadas, errores
@@ -0,0 +1,260 @@
+import hashlib
+import html
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.config.constants import ENCABEZADOS_ASIGNACION
+from src.config.settings import PUBLICACION_DIR
+from src.database.repositories.base import AsignacionRepositoryBase, MESES
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.database.repositories.cambios_repository import CambiosRepository
+from src.utils.date_utils import DateUtils
+from src.utils.indice_nombres import IndiceNombres
+
+@dataclass
+class ResultadoPublicacion:
+    """Resumen de una publicación"""
+    escritos: List[str] = field(default_factory=list)
+    sin_cambios: int = 0
+    borrados: List[str] = field(default_factory=list)
+    
+    def __str__(self) -> str:
+        return (
+            f"Escritos: {len(self.escritos)} - Sin cambios: {self.sin_cambios} - "
+            f"Borrados: {len(self.borrados)}"
+        )
+
+class PublicacionService:
+    """
+    Publica las asignaciones como archivos estáticos JSON y HTML
+    Genera una página por mes y una por persona, más un índice. Cada página
+    guarda en el manifiesto el hash de las filas con las que se generó: al
+    volver a publicar solo se reescriben las páginas cuyas filas cambiaron.
+    Si el registro de cambios no avanzó desde la última publicación, ni
+    siquiera se leen las asignaciones.
+    """
+    
+    MANIFIESTO = "manifiesto.json"
+    SIN_FECHA = "sin-fecha"
+    
+    def __init__(self, repository: AsignacionRepositoryBase = None, carpeta: str = PUBLICACION_DIR,
+                 cambios_repository: Optional[CambiosRepository] = None):
+        """
+        Args:
+            repository: Origen de las asignaciones
+            carpeta: Carpeta de salida
+            cambios_repository: Registro de cambios de la misma BD (opcional;
+                sin él, cada publicación compara los hashes de todas las páginas)
+        """
+        self.repository = repository or AsignacionRepository()
+        self.carpeta = carpeta
+        self.cambios_repository = cambios_repository
+    
+    def publicar(self) -> ResultadoPublicacion:
+        """
+        Publica (o actualiza) todas las páginas
+        Returns: ResultadoPublicacion
+        """
+        anterior, seq_anterior = self._leer_manifiesto()
+        seq = self.cambios_repository.ultimo_seq() if self.cambios_repository else None
+        if seq is not None and seq == seq_anterior and all(self._existe(ruta) for ruta in anterior):
+            return ResultadoPublicacion(sin_cambios=len(anterior))
+        
+        meses, personas, nombres = self._agrupar()
+        
+        paginas: Dict[str, Tuple[str, object]] = {}
+        for clave, filas in meses.items():
+            paginas[f"meses/{clave}"] = (self._titulo_mes(clave), filas)
+        for slug, turnos in personas.items():
+            paginas[f"personas/{slug}"] = (nombres[slug], turnos)
+        indice = {
+            "meses": [{"clave": c, "titulo": self._titulo_mes(c)} for c in sorted(meses)],
+            "personas": [{"clave": s, "nombre": nombres[s]} for s in sorted(personas, key=nombres.get)],
+        }
+        paginas["index"] = ("Asignaciones", indice)
+        
+        manifiesto = {}
+        resultado = ResultadoPublicacion()
+        
+        for ruta, (titulo, datos) in paginas.items():
+            huella = self._huella(titulo, datos)
+            manifiesto[ruta] = huella
+            if anterior.get(ruta) == huella and self._existe(ruta):
+                resultado.sin_cambios += 1
+                continue
+            
+            if ruta == "index":
+                contenido_html = self._html_indice(indice)
+            elif ruta.startswith("meses/"):
+                contenido_html = self._html_mes(titulo, datos)
+            else:
+                contenido_html = self._html_persona(titulo, datos)
+            self._escribir(f"{ruta}.json", json.dumps(
+                {"titulo": titulo, "datos": datos}, ensure_ascii=False, indent=1
+            ))
+            self._escribir(f"{ruta}.html", contenido_html)
+            resultado.escritos.append(ruta)
+        
+        # Páginas que ya no corresponden (p.ej. una persona sin turnos)
+        for ruta in set(anterior) - set(manifiesto):
+            for extension in (".json", ".html"):
+                destino = os.path.join(self.carpeta, ruta + extension)
+                if os.path.exists(destino):
+                    os.remove(destino)
+            resultado.borrados.append(ruta)
+        
+        self._escribir(self.MANIFIESTO, json.dumps(
+            {"seq": seq, "paginas": manifiesto}, indent=1, sort_keys=True
+        ))
+        return resultado
+    
+    # ------------------------------------------------------------------
+    # Agrupación
+    # ------------------------------------------------------------------
+    
+    def _agrupar(self):
+        """
+        Agrupa las filas por mes y por persona en una sola pasada
+        Returns: (filas por mes, turnos por slug, nombre por slug)
+        """
+        meses: Dict[str, List[dict]] = {}
+        personas: Dict[str, List[Tuple[date, dict]]] = {}
+        
+        for fila in self.repository.iterar_todas():
+            lunes = DateUtils.parsear_semana(fila[0])
+            clave_mes = f"{lunes.year}-{lunes.month:02d}" if lunes else self.SIN_FECHA
+            meses.setdefault(clave_mes, []).append(dict(zip(ENCABEZADOS_ASIGNACION, fila)))
+            
+            for puesto, valor in zip(ENCABEZADOS_ASIGNACION[1:7], fila[1:7]):
+                for nombre in valor.split(" / "):
+                    nombre = nombre.strip()
+                    if not nombre:
+                        continue
+                    personas.setdefault(nombre, []).append(
+                        (lunes or date.max, {"semana": fila[0], "dia_reunion": fila[7], "puesto": puesto})
+                    )
+        
+        slugs = self.slugs_unicos(personas)
+        turnos = {
+            slugs[nombre]: [turno for _, turno in sorted(lista, key=lambda t: t[0])]
+            for nombre, lista in personas.items()
+        }
+        nombres = {slug: nombre for nombre, slug in slugs.items()}
+        return meses, turnos, nombres
+    
+    @staticmethod
+    def slug(nombre: str) -> str:
+        """Nombre de archivo de una persona: 'Gómez Yanina' -> 'gomez-yanina'"""
+        return re.sub(r"[^a-z0-9]+", "-", IndiceNombres.normalizar(nombre)).strip("-")
+    
+    @classmethod
+    def slugs_unicos(cls, nombres: Iterable[str]) -> Dict[str, str]:
+        """
+        Slug de cada nombre, sin repetir
+        Si dos nombres dan el mismo slug (p.ej. 'Gómez Ana' y 'Gomez Ana'), el
+        que sigue en orden alfabético lleva un sufijo: 'gomez-ana-2'. El orden
+        no depende de las filas, así cada página conserva su archivo.
+        """
+        slugs: Dict[str, str] = {}
+        usados = set()
+        for nombre in sorted(nombres):
+            base = cls.slug(nombre) or "persona"
+            slug, numero = base, 1
+            while slug in usados:
+                numero += 1
+                slug = f"{base}-{numero}"
+            usados.add(slug)
+            slugs[nombre] = slug
+        return slugs
+    
+    def _titulo_mes(self, clave: str) -> str:
+        if clave == self.SIN_FECHA:
+            return "Sin fecha"
+        anio, mes = clave.split("-")
+        return f"{MESES[int(mes)].capitalize()} {anio}"
+    
+    # ------------------------------------------------------------------
+    # Archivos
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _huella(titulo: str, datos) -> str:
+        contenido = json.dumps([titulo, datos], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+    
+    def _leer_manifiesto(self) -> Tuple[Dict[str, str], Optional[int]]:
+        """Returns: (hash por página, seq del registro de cambios al publicar)"""
+        ruta = os.path.join(self.carpeta, self.MANIFIESTO)
+        if not os.path.exists(ruta):
+            return {}, None
+        with open(ruta, encoding="utf-8") as archivo:
+            manifiesto = json.load(archivo)
+        if "paginas" not in manifiesto:
+            # Manifiesto anterior al registro de cambios: solo hashes
+            return manifiesto, None
+        return manifiesto["paginas"], manifiesto.get("seq")
+    
+    def _existe(self, ruta: str) -> bool:
+        base = os.path.join(self.carpeta, ruta)
+        return os.path.exists(base + ".json") and os.path.exists(base + ".html")
+    
+    def _escribir(self, ruta: str, contenido: str):
+        """Escribe un archivo de forma atómica (los lectores nunca ven uno a medias)"""
+        destino = os.path.join(self.carpeta, ruta)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        temporal = destino + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, destino)
+    
+    # ------------------------------------------------------------------
+    # HTML
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _pagina(titulo: str, cuerpo: str, raiz: str = "") -> str:
+        volver = f'<p><a href="{raiz}index.html">Volver al índice</a></p>' if raiz else ""
+        return (
+            "<!DOCTYPE html>\n<html lang=\"es\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(titulo)}</title>\n"
+            "<style>body{font-family:Arial,sans-serif;margin:1em}"
+            "table{border-collapse:collapse}th,td{border:1px solid #999;padding:4px 8px}"
+            "th{background:#333;color:#fff}</style>\n</head>\n<body>\n"
+            f"<h1>{html.escape(titulo)}</h1>\n{volver}{cuerpo}\n</body>\n</html>\n"
+        )
+    
+    @staticmethod
+    def _tabla(encabezados: List[str], filas: List[List[str]]) -> str:
+        lineas = ["<table>", "<tr>" + "".join(f"<th>{html.escape(e)}</th>" for e in encabezados) + "</tr>"]
+        for fila in filas:
+            lineas.append("<tr>" + "".join(f"<td>{html.escape(v)}</td>" for v in fila) + "</tr>")
+        lineas.append("</table>")
+        return "\n".join(lineas)
+    
+    def _html_mes(self, titulo: str, filas: List[dict]) -> str:
+        tabla = self._tabla(ENCABEZADOS_ASIGNACION, [[f[e] for e in ENCABEZADOS_ASIGNACION] for f in filas])
+        return self._pagina(titulo, tabla, "../")
+    
+    def _html_persona(self, nombre: str, turnos: List[dict]) -> str:
+        tabla = self._tabla(
+            ["Semana", "Día de reunión", "Puesto"],
+            [[t["semana"], t["dia_reunion"], t["puesto"]] for t in turnos]
+        )
+        return self._pagina(nombre, tabla, "../")
+    
+    def _html_indice(self, indice: dict) -> str:
+        meses = "".join(
+            f'<li><a href="meses/{m["clave"]}.html">{html.escape(m["titulo"])}</a></li>'
+            for m in indice["meses"]
+        )
+        personas = "".join(
+            f'<li><a href="personas/{p["clave"]}.html">{html.escape(p["nombre"])}</a></li>'
+            for p in indice["personas"]
+        )
+        return self._pagina(
+            "Asignaciones",
+            f"<h2>Por mes</h2>\n<ul>{meses}</ul>\n<h2>Por persona</h2>\n<ul>{personas}</ul>"
+        )
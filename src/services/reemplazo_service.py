@@ -0,0 +1,248 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.config.settings import REEMPLAZO_SEMANAS_CARGA
+from src.models.persona import Persona, TipoPersona
+from src.database.repositories.base import AsignacionRepositoryBase, COLUMNAS_PERSONAS, PersonaRepositoryBase
+from src.database.repositories.persona_repository import PersonaRepository
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.database.repositories.cambios_repository import CambiosRepository
+from src.services.vigilancia_service import VigilanciaService
+from src.services.grupo_limpieza_service import GrupoLimpiezaService
+from src.utils.date_utils import DateUtils
+
+@dataclass
+class Candidato:
+    """Una persona sugerida para cubrir un puesto"""
+    persona: Persona
+    # Pertenece al grupo de limpieza de la semana (solo vigilancia)
+    en_grupo: bool
+    # Turnos en las semanas cercanas (ver REEMPLAZO_SEMANAS_CARGA)
+    carga_reciente: int
+    # Turnos en todo el historial
+    turnos: int
+    
+    def __str__(self) -> str:
+        grupo = ", de su grupo" if self.en_grupo else ""
+        return f"{self.persona} ({self.carga_reciente} cercanos, {self.turnos} en total{grupo})"
+
+class _IndiceTurnos:
+    """
+    Turnos por semana y por persona, actualizable asignación por asignación
+    Recuerda lo que aportó cada asignación para poder quitarlo cuando el
+    registro de cambios avisa que se editó o se borró.
+    """
+    
+    def __init__(self, version: int):
+        self.version = version
+        # id de asignación -> (lunes, nombres)
+        self._filas: Dict[int, Tuple[date, List[str]]] = {}
+        # lunes -> {nombre: turnos esa semana}
+        self.por_semana: Dict[date, Dict[str, int]] = {}
+        # nombre -> fechas ordenadas de sus turnos
+        self.fechas: Dict[str, List[date]] = {}
+    
+    @classmethod
+    def armar(cls, version: int, filas: Iterable[Tuple[int, tuple]]) -> "_IndiceTurnos":
+        """Índice completo a partir de (id, fila) de todas las asignaciones"""
+        indice = cls(version)
+        for fila_id, fila in filas:
+            indice._agregar(fila_id, fila, insort_fechas=False)
+        for lista in indice.fechas.values():
+            lista.sort()
+        return indice
+    
+    def poner(self, fila_id: int, fila: Optional[tuple]):
+        """Reemplaza lo que aporta una asignación (None = se borró)"""
+        anterior = self._filas.pop(fila_id, None)
+        if anterior is not None:
+            lunes, nombres = anterior
+            semana = self.por_semana[lunes]
+            for nombre in nombres:
+                semana[nombre] -= 1
+                if not semana[nombre]:
+                    del semana[nombre]
+                fechas = self.fechas[nombre]
+                del fechas[bisect_left(fechas, lunes)]
+        if fila is not None:
+            self._agregar(fila_id, fila, insort_fechas=True)
+    
+    def _agregar(self, fila_id: int, fila: tuple, insort_fechas: bool):
+        lunes = DateUtils.parsear_semana(fila[0])
+        if lunes is None:
+            return
+        nombres = ReemplazoService.nombres_de(fila[1:7])
+        self._filas[fila_id] = (lunes, nombres)
+        semana = self.por_semana.setdefault(lunes, {})
+        for nombre in nombres:
+            semana[nombre] = semana.get(nombre, 0) + 1
+            fechas = self.fechas.setdefault(nombre, [])
+            if insort_fechas:
+                insort(fechas, lunes)
+            else:
+                fechas.append(lunes)
+
+class ReemplazoService:
+    """
+    Sugerencias de reemplazo para un puesto que queda libre
+    Los índices (quién tiene turno en cada semana, las fechas de los turnos
+    de cada persona y el plantel activo) se arman una vez y se reutilizan
+    mientras no cambie version_datos de los repositorios (la mueve cualquier
+    escritura, también de otros procesos): cada sugerencia es un recorrido
+    del plantel con búsquedas binarias. Con un registro de cambios, el
+    índice de turnos no se rearma: se le aplican las asignaciones cambiadas.
+    """
+    
+    # Más cambios pendientes que estos y conviene rearmar el índice
+    MAX_CAMBIOS_INCREMENTALES = 1000
+    
+    def __init__(self, persona_repository: PersonaRepositoryBase = None,
+                 asignacion_repository: AsignacionRepositoryBase = None,
+                 vigilancia_service: VigilanciaService = None,
+                 grupo_limpieza_service: GrupoLimpiezaService = None,
+                 semanas_carga: int = REEMPLAZO_SEMANAS_CARGA,
+                 cambios_repository: Optional[CambiosRepository] = None):
+        """
+        Args:
+            semanas_carga: Semanas antes y después que cuentan como carga reciente
+            cambios_repository: Registro de cambios de la BD de asignaciones
+                (sin él, el índice de turnos se rearma con cada escritura)
+        """
+        self.persona_repository = persona_repository or PersonaRepository()
+        self.asignacion_repository = asignacion_repository or AsignacionRepository()
+        self.vigilancia_service = vigilancia_service or VigilanciaService(self.persona_repository)
+        self.grupo_limpieza_service = grupo_limpieza_service or GrupoLimpiezaService()
+        self.semanas_carga = semanas_carga
+        self.cambios_repository = cambios_repository
+        self._lock = threading.Lock()
+        # tipo -> (version, personas activas)
+        self._planteles: Dict[TipoPersona, Tuple[int, List[Persona]]] = {}
+        self._turnos: Optional[_IndiceTurnos] = None
+    
+    def sugerir(self, fila_id: int, columna: str, limite: int = 10) -> List[Candidato]:
+        """
+        Candidatos para un puesto de una asignación guardada
+        Args:
+            fila_id: Id de la asignación
+            columna: Puesto a cubrir (ver COLUMNAS_PERSONAS)
+            limite: Cantidad máxima de candidatos
+        Returns:
+            Candidatos del mejor al peor (ver sugerir_para_semana)
+        """
+        actual = self.asignacion_repository.obtener_fila(fila_id)
+        if actual is None:
+            raise ValueError(f"No existe la asignación {fila_id}")
+        fila = actual[1]
+        lunes = DateUtils.parsear_semana(fila[0])
+        if lunes is None:
+            raise ValueError(f"No se reconoce la semana '{fila[0]}'")
+        return self.sugerir_para_semana(lunes, columna, limite, excluir=self.nombres_de(fila[1:7]))
+    
+    def sugerir_para_semana(self, lunes: date, columna: str, limite: int = 10,
+                            excluir: Iterable[str] = ()) -> List[Candidato]:
+        """
+        Candidatos para un puesto de una semana
+        Quedan afuera las personas inactivas y las que ya tienen turno esa
+        semana. Primero van las del grupo de limpieza de la semana (para los
+        puestos de vigilancia), luego las de menos carga reciente y, a igual
+        carga, las de menos turnos en total.
+        Args:
+            lunes: Lunes de la semana
+            columna: Puesto a cubrir (ver COLUMNAS_PERSONAS)
+            limite: Cantidad máxima de candidatos
+            excluir: Nombres que tampoco se sugieren (p.ej. los de una fila sin guardar)
+        """
+        if columna not in COLUMNAS_PERSONAS:
+            raise ValueError(f"Columna '{columna}' no es válida")
+        
+        tipo = TipoPersona.VIGILANTE if columna.startswith("vigilante_") else TipoPersona.ACOMODADOR
+        por_semana, fechas = self._obtener_turnos()
+        ocupados = set(por_semana.get(lunes, ())) | set(excluir)
+        grupo: Set[str] = set()
+        if tipo == TipoPersona.VIGILANTE:
+            numero = self.grupo_limpieza_service.obtener_grupo_para_semana(lunes)
+            grupo = set(self.vigilancia_service.grupos_config.get(numero, ()))
+        
+        desde = lunes - timedelta(weeks=self.semanas_carga)
+        hasta = lunes + timedelta(weeks=self.semanas_carga)
+        candidatos = []
+        for persona in self._obtener_plantel(tipo):
+            nombre = str(persona)
+            if nombre in ocupados:
+                continue
+            turnos = fechas.get(nombre, [])
+            cercanos = bisect_right(turnos, hasta) - bisect_left(turnos, desde)
+            candidatos.append(Candidato(persona, nombre in grupo, cercanos, len(turnos)))
+        
+        return heapq.nsmallest(
+            limite, candidatos,
+            key=lambda c: (not c.en_grupo, c.carga_reciente, c.turnos, str(c.persona))
+        )
+    
+    @staticmethod
+    def nombres_de(valores: Iterable[str]) -> List[str]:
+        """Nombres de las celdas de personas (separa los pares "A / B")"""
+        return [nombre.strip() for valor in valores for nombre in valor.split(" / ") if nombre.strip()]
+    
+    @staticmethod
+    def reemplazar_en(valor: str, saliente: str, entrante: str) -> str:
+        """
+        Valor de la celda con una persona cambiada por otra
+        En los pares "A / B" solo se cambia la que sale; si no está, se
+        reemplaza la celda entera.
+        """
+        nombres = [nombre.strip() for nombre in valor.split(" / ")]
+        if saliente not in nombres:
+            return entrante
+        return " / ".join(entrante if nombre == saliente else nombre for nombre in nombres)
+    
+    def _obtener_plantel(self, tipo: TipoPersona) -> List[Persona]:
+        """Personas activas de un tipo, en caché mientras no cambie la versión"""
+        version = self.persona_repository.version_datos()
+        plantel = self._planteles.get(tipo)
+        if plantel is None or plantel[0] != version:
+            with self._lock:
+                plantel = (version, self.persona_repository.obtener_todos(tipo))
+                self._planteles[tipo] = plantel
+        return plantel[1]
+    
+    def _obtener_turnos(self) -> Tuple[Dict[date, Dict[str, int]], Dict[str, List[date]]]:
+        """Índices de turnos por semana y por persona (al día con la versión)"""
+        version = self.asignacion_repository.version_datos()
+        with self._lock:
+            indice = self._turnos
+            if indice is None or (indice.version != version and not self._aplicar_cambios(indice, version)):
+                # La versión se lee antes que las filas: lo escrito en el medio se vuelve a aplicar
+                indice = _IndiceTurnos.armar(
+                    version, ((fila_id, fila) for fila_id, _, fila in self.asignacion_repository.obtener_con_id())
+                )
+                self._turnos = indice
+            return indice.por_semana, indice.fechas
+    
+    def _aplicar_cambios(self, indice: _IndiceTurnos, version: int) -> bool:
+        """
+        Aplica al índice las asignaciones cambiadas desde su versión
+        Returns:
+            False si hay que rearmarlo: no hay registro de cambios, ya se
+            purgaron los que faltan o son demasiados
+        """
+        if self.cambios_repository is None:
+            return False
+        cambios = self.cambios_repository.cambios_desde(indice.version, limite=self.MAX_CAMBIOS_INCREMENTALES + 1)
+        if (not cambios or len(cambios) > self.MAX_CAMBIOS_INCREMENTALES
+                or cambios[0].seq != indice.version + 1 or cambios[-1].seq < version):
+            return False
+        
+        columnas = ["semana"] + COLUMNAS_PERSONAS
+        for cambio in cambios:
+            if cambio.tabla != "asignaciones":
+                continue
+            fila = None
+            if cambio.operacion != "borrar":
+                fila = tuple(cambio.datos.get(columna) or "" for columna in columnas)
+            indice.poner(cambio.fila_id, fila)
+        indice.version = cambios[-1].seq
+        return True
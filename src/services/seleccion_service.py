@@ -0,0 +1,73 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+from src.models.persona import Persona, TipoPersona
+from src.database.repositories.base import AsignacionRepositoryBase, PersonaRepositoryBase
+from src.database.repositories.persona_repository import PersonaRepository
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.utils.indice_nombres import IndiceNombres
+
+class SeleccionService:
+    """
+    Servicio de selección de personas para editar asignaciones
+    Mantiene en memoria el plantel activo (con su índice de nombres) y el
+    conteo de turnos. Las búsquedas usan solo esa instantánea; precargar
+    lee version_datos una vez y recarga lo que cambió (también por
+    escrituras de otros procesos), pensado para correr en segundo plano.
+    """
+    
+    def __init__(self, persona_repository: PersonaRepositoryBase = None,
+                 asignacion_repository: AsignacionRepositoryBase = None):
+        self.persona_repository = persona_repository or PersonaRepository()
+        self.asignacion_repository = asignacion_repository or AsignacionRepository()
+        self._lock = threading.Lock()
+        # tipo -> (version, personas por id, índice)
+        self._planteles: Dict[TipoPersona, Tuple[int, Dict[int, Persona], IndiceNombres]] = {}
+        # (version, turnos por nombre completo)
+        self._turnos: Optional[Tuple[int, Dict[str, int]]] = None
+    
+    def en_cache(self, tipo: TipoPersona) -> bool:
+        """Indica si ya hay una instantánea del plantel y los turnos (no va a la BD)"""
+        return tipo in self._planteles and self._turnos is not None
+    
+    def precargar(self, tipo: TipoPersona) -> bool:
+        """
+        Recarga el plantel y los turnos si cambió su versión; pensado para segundo plano
+        Returns:
+            True si la instantánea cambió
+        """
+        with self._lock:
+            version = self.persona_repository.version_datos()
+            plantel = self._planteles.get(tipo)
+            cambio = plantel is None or plantel[0] != version
+            if cambio:
+                personas = self.persona_repository.obtener_todos(tipo)
+                indice = IndiceNombres((p.id, str(p)) for p in personas)
+                self._planteles[tipo] = (version, {p.id: p for p in personas}, indice)
+            
+            version = self.asignacion_repository.version_datos()
+            if self._turnos is None or self._turnos[0] != version:
+                self._turnos = (version, self.asignacion_repository.contar_turnos_por_persona())
+                cambio = True
+        return cambio
+    
+    def obtener_candidatos(self, tipo: TipoPersona, texto: str = "") -> List[Tuple[Persona, int]]:
+        """
+        Busca personas activas de un tipo en la instantánea, ordenadas por equidad
+        Args:
+            tipo: Tipo de persona
+            texto: Texto de búsqueda (prefijo de palabra o subcadena del nombre)
+        Returns:
+            (persona, turnos) de las que coinciden; primero las de menos turnos.
+            Las que coinciden por prefijo van antes que las que solo lo contienen.
+        """
+        if not self.en_cache(tipo):
+            self.precargar(tipo)
+        _, personas, indice = self._planteles[tipo]
+        turnos = self._turnos[1]
+        
+        por_prefijo, por_subcadena = indice.buscar_agrupado(texto)
+        por_turnos = lambda c: turnos.get(str(personas[c]), 0)
+        
+        # sorted es estable: a igual cantidad de turnos se mantiene el orden alfabético
+        claves = sorted(por_prefijo, key=por_turnos) + sorted(por_subcadena, key=por_turnos)
+        return [(personas[c], por_turnos(c)) for c in claves]
@@ -0,0 +1,292 @@
+import hashlib
+import json
+import sqlite3
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from src.config.settings import DB_PATH
+from src.database.db_manager import DBManager
+from src.database.escritor import EscritorUnico, escribir
+from src.database.instrumentacion import conectar
+from src.database.repositories.cambios_repository import CambiosRepository
+from src.models.cambio import Cambio
+from src.utils.date_utils import DateUtils
+
+@dataclass
+class ResultadoSync:
+    """Resumen de una sincronización"""
+    enviados: int = 0
+    recibidos: int = 0
+    conflictos: int = 0
+    
+    def __str__(self) -> str:
+        return f"Enviados: {self.enviados} - Recibidos: {self.recibidos} - Conflictos: {self.conflictos}"
+
+class SyncService:
+    """
+    Sincronización por deltas con una BD central (ver src/api/central.py)
+    Envía solo lo que el registro de cambios anotó desde la última
+    sincronización y recibe solo las filas con versión central mayor a la
+    última recibida: el tiempo depende de lo editado, no del tamaño de la BD.
+    
+    La tabla sync_filas asocia cada fila local con su uid global, la versión
+    central que tiene y la huella de sus datos; la huella permite no
+    reenviar como propios los cambios que llegaron de la central.
+    
+    Las escrituras locales pasan por el escritor único (si se indica) y las
+    llamadas a la central quedan fuera de esas transacciones: la red lenta
+    no demora las demás escrituras de la aplicación.
+    """
+    
+    TABLAS = tuple(DBManager.COLUMNAS_CAMBIOS)
+    
+    def __init__(self, central, db_path: str = DB_PATH,
+                 cambios_repository: CambiosRepository = None, tamano_lote: int = 200,
+                 escritor: Optional[EscritorUnico] = None):
+        """
+        Args:
+            central: CentralSync o ClienteCentral (misma interfaz)
+            db_path: BD local
+            cambios_repository: Registro de cambios de la BD local
+            tamano_lote: Cambios por envío / filas por recepción
+            escritor: Si se indica, las escrituras locales pasan por él (ver EscritorUnico)
+        """
+        self.central = central
+        self.db_path = db_path
+        self.escritor = escritor
+        self.cambios_repository = cambios_repository or CambiosRepository(db_path)
+        self.tamano_lote = tamano_lote
+        self._origen: Optional[str] = None
+    
+    @property
+    def origen(self) -> str:
+        """Identificador de esta instalación (se crea la primera vez)"""
+        if self._origen is None:
+            def obtener(conn: sqlite3.Connection) -> str:
+                origen = self._leer_estado(conn, "origen")
+                if origen is None:
+                    origen = uuid.uuid4().hex[:12]
+                    self._guardar_estado(conn, "origen", origen)
+                return origen
+            
+            self._origen = self._escribir(obtener)
+        return self._origen
+    
+    def sincronizar(self) -> ResultadoSync:
+        """Envía los cambios locales y luego recibe los de la central"""
+        resultado = ResultadoSync()
+        self._enviar(resultado)
+        self._recibir(resultado)
+        return resultado
+    
+    # ------------------------------------------------------------------
+    # Envío
+    # ------------------------------------------------------------------
+    
+    def _enviar(self, resultado: ResultadoSync):
+        origen = self.origen
+        seq = int(self._estado("seq_enviado") or 0)
+        
+        while True:
+            cambios = self.cambios_repository.cambios_desde(seq, limite=self.tamano_lote)
+            if not cambios:
+                break
+            
+            # Solo importa el último estado de cada fila dentro del lote
+            ultimos: Dict[Tuple[str, int], Cambio] = {}
+            for cambio in cambios:
+                if cambio.tabla in self.TABLAS:
+                    ultimos[(cambio.tabla, cambio.fila_id)] = cambio
+            
+            # Si el envío se corta, el reintento usa los mismos uid (ver _armar_paquete)
+            paquete = self._escribir(lambda conn: self._armar_paquete(conn, ultimos.values()))
+            respuestas = self.central.enviar(origen, paquete) if paquete else []
+            seq = cambios[-1].seq
+            
+            def confirmar(conn: sqlite3.Connection):
+                for respuesta in respuestas:
+                    if respuesta["conflicto"]:
+                        resultado.conflictos += 1
+                    if respuesta["aceptado"]:
+                        resultado.enviados += 1
+                        self._marcar_sincronizada(conn, respuesta["fila"])
+                    else:
+                        # Ganó la versión de la central: se aplica localmente
+                        self._aplicar(conn, respuesta["fila"], seq_enviado=None)
+                self._guardar_estado(conn, "seq_enviado", str(seq))
+            
+            self._escribir(confirmar)
+    
+    def _armar_paquete(self, conn: sqlite3.Connection, cambios) -> list:
+        paquete = []
+        for cambio in cambios:
+            borrado = cambio.operacion == "borrar"
+            huella = self._huella(cambio.datos, borrado)
+            fila = conn.execute(
+                "SELECT uid, version, huella FROM sync_filas WHERE tabla = ? AND fila_id = ?",
+                (cambio.tabla, cambio.fila_id)
+            ).fetchone()
+            
+            if fila is None:
+                if borrado:
+                    continue  # Nunca llegó a la central
+                # uid determinístico: si el envío se corta, el reintento no duplica la fila
+                uid, version = f"{self.origen}-{cambio.tabla}-{cambio.fila_id}", 0
+                conn.execute(
+                    "INSERT INTO sync_filas (tabla, fila_id, uid, version) VALUES (?, ?, ?, 0)",
+                    (cambio.tabla, cambio.fila_id, uid)
+                )
+            else:
+                uid, version, huella_conocida = fila
+                if huella == huella_conocida:
+                    continue  # Eco de un cambio que vino de la central
+            
+            paquete.append({
+                "uid": uid,
+                "tabla": cambio.tabla,
+                "datos": cambio.datos,
+                "borrado": borrado,
+                "version_base": version,
+                "modificado": cambio.fecha,
+            })
+        return paquete
+    
+    def _marcar_sincronizada(self, conn: sqlite3.Connection, fila: dict):
+        conn.execute(
+            "UPDATE sync_filas SET version = ?, huella = ? WHERE uid = ?",
+            (fila["version"], self._huella(fila["datos"], fila["borrado"]), fila["uid"])
+        )
+    
+    # ------------------------------------------------------------------
+    # Recepción
+    # ------------------------------------------------------------------
+    
+    def _recibir(self, resultado: ResultadoSync):
+        version = int(self._estado("version_recibida") or 0)
+        seq_enviado = int(self._estado("seq_enviado") or 0)
+        
+        while True:
+            filas, ultima = self.central.recibir(version, self.tamano_lote)
+            if not filas:
+                break
+            
+            def aplicar(conn: sqlite3.Connection):
+                for fila in filas:
+                    if self._aplicar(conn, fila, seq_enviado):
+                        resultado.recibidos += 1
+                self._guardar_estado(conn, "version_recibida", str(ultima))
+            
+            self._escribir(aplicar)
+            version = ultima
+    
+    def _aplicar(self, conn: sqlite3.Connection, fila: dict, seq_enviado: Optional[int]) -> bool:
+        """
+        Aplica una fila de la central a la BD local
+        Args:
+            seq_enviado: Si se indica, no pisa filas con cambios locales sin enviar
+                (se resuelven en el próximo envío)
+        Returns:
+            True si se modificó la BD local
+        """
+        tabla = fila["tabla"]
+        if tabla not in self.TABLAS:
+            return False
+        
+        mapeo = conn.execute(
+            "SELECT fila_id, version, huella FROM sync_filas WHERE uid = ?", (fila["uid"],)
+        ).fetchone()
+        if mapeo is not None and mapeo[1] >= fila["version"]:
+            return False  # Ya la tenemos (p.ej. un cambio propio)
+        if mapeo is not None and seq_enviado is not None and self._tiene_cambio_local(
+            conn, tabla, mapeo[0], seq_enviado, mapeo[2]
+        ):
+            return False
+        
+        columnas = list(DBManager.COLUMNAS_CAMBIOS[tabla])
+        valores = [fila["datos"].get(c) for c in columnas]
+        if tabla == "asignaciones":
+            # Columna derivada (no viaja en los cambios)
+            lunes = DateUtils.parsear_semana(fila["datos"].get("semana") or "")
+            columnas.append("semana_lunes")
+            valores.append(lunes.isoformat() if lunes else None)
+        huella = self._huella(fila["datos"], fila["borrado"])
+        
+        if mapeo is None:
+            if fila["borrado"]:
+                return False
+            cursor = conn.execute(
+                f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})",
+                valores
+            )
+            conn.execute(
+                "INSERT INTO sync_filas (tabla, fila_id, uid, version, huella) VALUES (?, ?, ?, ?, ?)",
+                (tabla, cursor.lastrowid, fila["uid"], fila["version"], huella)
+            )
+            return True
+        
+        fila_id = mapeo[0]
+        if fila["borrado"]:
+            conn.execute(f"DELETE FROM {tabla} WHERE id = ?", (fila_id,))
+        else:
+            cursor = conn.execute(
+                f"UPDATE {tabla} SET {', '.join(f'{c} = ?' for c in columnas)}, "
+                f"revision = revision + 1 WHERE id = ?",
+                valores + [fila_id]
+            )
+            if cursor.rowcount == 0:
+                # Se había borrado localmente: se recrea con el mismo id
+                conn.execute(
+                    f"INSERT INTO {tabla} (id, {', '.join(columnas)}) "
+                    f"VALUES (?, {', '.join('?' * len(columnas))})",
+                    [fila_id] + valores
+                )
+        conn.execute(
+            "UPDATE sync_filas SET version = ?, huella = ? WHERE uid = ?",
+            (fila["version"], huella, fila["uid"])
+        )
+        return True
+    
+    def _tiene_cambio_local(self, conn: sqlite3.Connection, tabla: str, fila_id: int,
+                            seq_enviado: int, huella_conocida: Optional[str]) -> bool:
+        """
+        Indica si la fila tiene un cambio local sin enviar
+        Si el último cambio posterior a seq_enviado coincide con la huella
+        conocida, lo escribió _aplicar (p.ej. en un lote anterior de la misma
+        recepción): es un eco de la central, no una edición local.
+        """
+        ultimo = conn.execute(
+            "SELECT operacion, datos FROM cambios WHERE tabla = ? AND fila_id = ? AND seq > ? "
+            "ORDER BY seq DESC LIMIT 1",
+            (tabla, fila_id, seq_enviado)
+        ).fetchone()
+        if ultimo is None:
+            return False
+        datos = json.loads(ultimo[1]) if ultimo[1] else {}
+        return self._huella(datos, ultimo[0] == "borrar") != huella_conocida
+    
+    # ------------------------------------------------------------------
+    # Auxiliares
+    # ------------------------------------------------------------------
+    
+    def _escribir(self, funcion):
+        return escribir(self.db_path, funcion, self.escritor)
+    
+    def _estado(self, clave: str) -> Optional[str]:
+        with conectar(self.db_path) as conn:
+            return self._leer_estado(conn, clave)
+    
+    @staticmethod
+    def _huella(datos: dict, borrado: bool) -> str:
+        contenido = json.dumps([datos, bool(borrado)], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _leer_estado(conn: sqlite3.Connection, clave: str) -> Optional[str]:
+        fila = conn.execute("SELECT valor FROM sync_estado WHERE clave = ?", (clave,)).fetchone()
+        return fila[0] if fila else None
+    
+    @staticmethod
+    def _guardar_estado(conn: sqlite3.Connection, clave: str, valor: str):
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_estado (clave, valor) VALUES (?, ?)", (clave, valor)
+        )
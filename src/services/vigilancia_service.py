@@ -1,13 +1,15 @@
 import random
-from typing import List, Tuple, Dict
+from datetime import date
+from typing import List, Optional, Tuple, Dict
 from src.models.persona import Persona, TipoPersona
 from src.models.grupo_vigilancia import GrupoVigilancia
+from src.database.repositories.base import PersonaRepositoryBase
 from src.database.repositories.persona_repository import PersonaRepository
 
 class VigilanciaService:
     """Servicio para gestionar la vigilancia con sistema de grupos"""
     
-    def __init__(self, repository: PersonaRepository = None):
+    def __init__(self, repository: PersonaRepositoryBase = None):
         self.repository = repository or PersonaRepository()
         self._inicializar_grupos()
     
@@ -26,16 +28,18 @@ class VigilanciaService:
             6: ["Arguello Monica", "Benitez Gabriela", "Ledesma Susana", "Sotelo Rosa"]
         }
     
-    def obtener_vigilantes_activos(self) -> List[Persona]:
-        """Obtiene todos los vigilantes activos ordenados"""
-        return self.repository.obtener_todos(TipoPersona.VIGILANTE)
+    def obtener_vigilantes_activos(self, as_of: Optional[date] = None) -> List[Persona]:
+        """Obtiene todos los vigilantes activos ordenados (hoy o en la fecha `as_of`)"""
+        return self.repository.obtener_todos(TipoPersona.VIGILANTE, as_of=as_of)
     
-    def obtener_grupos(self) -> Dict[int, GrupoVigilancia]:
+    def obtener_grupos(self, as_of: Optional[date] = None) -> Dict[int, GrupoVigilancia]:
         """
         Obtiene los grupos de vigilancia con sus miembros actuales
+        Args:
+            as_of: Si se indica, con los miembros que estaban activos ese día
         Returns: Dict con número de grupo y objeto GrupoVigilancia
         """
-        vigilantes = self.obtener_vigilantes_activos()
+        vigilantes = self.obtener_vigilantes_activos(as_of)
         grupos = {}
         
         for num_grupo, nombres in self.grupos_config.items():
@@ -57,6 +61,17 @@ class VigilanciaService:
                 return num
         return 0  # No pertenece a ningún grupo
     
+    def numeros_de_grupo(self, personas: List[Persona]) -> Dict[int, int]:
+        """
+        Grupo de cada persona sin volver a consultar la BD
+        Returns: {id de la persona: número de grupo} (0 si no pertenece a ninguno)
+        """
+        numero_de: Dict[str, int] = {}
+        for numero, nombres in self.grupos_config.items():
+            for nombre in nombres:
+                numero_de.setdefault(nombre, numero)
+        return {persona.id: numero_de.get(str(persona), 0) for persona in personas}
+    
     def seleccionar_aleatorios(self, cantidad: int = 3, 
                               excluir_grupo: int = None) -> Tuple[List[Persona], str]:
         """
@@ -115,25 +130,20 @@ class VigilanciaService:
         )
     
     def remover_vigilante_de_grupo(self, persona_id: int, 
-                                   actualizar_lista: bool = True):
+                                   actualizar_lista: bool = True,
+                                   revision: Optional[int] = None):
         """
         Remueve un vigilante (lo desactiva)
         Args:
             persona_id: ID de la persona
             actualizar_lista: Si debe actualizar la lista después
+            revision: Revisión leída; si otro lo cambió, ConflictoVersion
         """
-        self.repository.desactivar(persona_id)
+        self.repository.desactivar(persona_id, revision)
     
     def reiniciar_todos(self) -> List[Persona]:
         """Reactiva todos los vigilantes"""
-        import sqlite3
-        with sqlite3.connect(self.repository.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT id FROM personas WHERE tipo = ?",
-                (TipoPersona.VIGILANTE.value,)
-            )
-            for row in cursor.fetchall():
-                self.repository.activar(row[0])
+        self.repository.activar_todos(TipoPersona.VIGILANTE)
         
         return self.obtener_vigilantes_activos()
     
@@ -162,15 +172,16 @@ class VigilanciaService:
         Obtiene estadísticas de cada grupo
         Returns: Dict con info de cada grupo (número, cantidad activos, nombres)
         """
-        grupos = self.obtener_grupos()
         stats = {}
         
-        for num, grupo in grupos.items():
+        # obtener_grupos ya trae solo vigilantes activos: una pasada por grupo
+        for num, grupo in self.obtener_grupos().items():
+            activos = grupo.obtener_nombres()
             stats[num] = {
                 'numero': num,
-                'total': len(grupo.miembros),
-                'activos': [str(p) for p in grupo.miembros if p.activo],
-                'cantidad_activos': len([p for p in grupo.miembros if p.activo])
+                'total': len(activos),
+                'activos': activos,
+                'cantidad_activos': len(activos)
             }
         
         return stats
\ No newline at end of file
@@ -1,23 +1,30 @@
 import tkinter as tk
-from tkinter import messagebox, Listbox, END
+from tkinter import messagebox
 from typing import Callable, List
 from src.models.persona import Persona
+from src.database.repositories.base import ConflictoVersion
 from src.services.acomodador_service import AcomodadorService
+from src.ui.ejecutor import EjecutorSegundoPlano
+from src.ui.components.listbox_incremental import ListboxIncremental
 from src.config.constants import COLORES, FUENTES
+from src.ui.perfilador import PERFILADOR
 
 class AcomodadoresPanel(tk.Frame):
     """Componente UI para gestionar acomodadores - Patrón MVC/Observer"""
     
 
     def __init__(self, parent, service: AcomodadorService = None, 
-                 on_seleccion_callback: Callable = None):
+                 on_seleccion_callback: Callable = None,
+                 ejecutor: EjecutorSegundoPlano = None):
         super().__init__(parent)
         self.service = service or AcomodadorService()
         self.on_seleccion_callback = on_seleccion_callback
         self.acomodadores_actuales: List[Persona] = []
+        self.ejecutor = ejecutor or EjecutorSegundoPlano(self)
         
         self._configurar_estilos()
         self._crear_widgets()
+        self.ejecutor.agregar_oyente_ocupado(self._mostrar_ocupado)
         self._cargar_datos_iniciales()
     
     def _configurar_estilos(self):
@@ -38,7 +45,7 @@ class AcomodadoresPanel(tk.Frame):
         self.titulo.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
         
         # Listbox
-        self.listbox = Listbox(
+        self.listbox = ListboxIncremental(
             self,
             relief="raised",
             font=FUENTES['listbox'],
@@ -54,6 +61,16 @@ class AcomodadoresPanel(tk.Frame):
         # Botones
         self._crear_botones(frame_botones)
         
+        # Indicador de actividad
+        self.label_estado = tk.Label(
+            self,
+            text="",
+            fg=COLORES['texto_claro'],
+            bg=COLORES['fondo_oscuro'],
+            font=FUENTES['listbox']
+        )
+        self.label_estado.grid(row=3, column=0, sticky="ew", padx=5)
+        
         # Configurar expansión
         self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -82,14 +99,27 @@ class AcomodadoresPanel(tk.Frame):
         """Carga los acomodadores iniciales"""
         self.actualizar_lista()
     
+    def _mostrar_ocupado(self, ocupado: bool):
+        """Muestra u oculta el indicador de actividad"""
+        self.label_estado.config(text="Cargando..." if ocupado else "")
+        self.config(cursor="watch" if ocupado else "")
+    
+    @PERFILADOR.manejador
     def actualizar_lista(self):
-        """Actualiza la lista de acomodadores desde la BD"""
-        self.listbox.delete(0, END)
-        self.acomodadores_actuales = self.service.obtener_acomodadores_activos()
-        
-        for persona in self.acomodadores_actuales:
-            self.listbox.insert(END, str(persona))
+        """Actualiza la lista de acomodadores desde la BD (en segundo plano)"""
+        self.ejecutor.ejecutar(
+            "lista",
+            self.service.obtener_acomodadores_activos,
+            on_exito=self._mostrar_lista,
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudo cargar la lista: {e}")
+        )
+    
+    def _mostrar_lista(self, acomodadores: List[Persona]):
+        """Aplica al listbox solo las diferencias con la lista obtenida"""
+        self.acomodadores_actuales = acomodadores
+        self.listbox.actualizar([(persona.id, str(persona)) for persona in acomodadores])
     
+    @PERFILADOR.manejador
     def _on_remover_click(self):
         """Maneja el click en remover"""
         seleccion = self.listbox.curselection()
@@ -107,35 +137,60 @@ class AcomodadoresPanel(tk.Frame):
         )
         
         if respuesta:
-            try:
-                self.service.desactivar_acomodador(persona.id)
-                self.actualizar_lista()
+            def remover():
+                self.service.desactivar_acomodador(persona.id, persona.revision)
+                return self.service.obtener_acomodadores_activos()
+            
+            def on_exito(acomodadores):
+                self._mostrar_lista(acomodadores)
                 messagebox.showinfo("Éxito", f"{persona} ha sido removido")
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudo remover: {e}")
+            
+            # Un refresco en curso quedaría desactualizado
+            self.ejecutor.cancelar("lista")
+            self.ejecutor.ejecutar_escritura(
+                remover,
+                on_exito=on_exito,
+                on_error=self._on_error_remover
+            )
+    
+    def _on_error_remover(self, error: Exception):
+        if isinstance(error, ConflictoVersion):
+            # Otro la cambió desde que se listó: se muestra como está ahora
+            messagebox.showwarning("Conflicto", "La persona fue modificada por otra edición; se actualizó la lista")
+            self.actualizar_lista()
+            return
+        messagebox.showerror("Error", f"No se pudo remover: {error}")
     
+    @PERFILADOR.manejador
     def _on_aleatorio_click(self):
         """Maneja el click en selección aleatoria"""
-        try:
-            # Validar cantidad mínima
-            es_valido, mensaje = self.service.validar_cantidad_minima(5)
-            if not es_valido:
-                messagebox.showerror("Error", mensaje)
-                return
-            
-            # Seleccionar
-            seleccionados, mensaje_formato = self.service.seleccionar_aleatorios(5)
-            
-            # Mostrar resultado
-            messagebox.showinfo("Seleccionados", mensaje_formato)
-            
-            # Notificar al callback si existe
-            if self.on_seleccion_callback:
-                self.on_seleccion_callback(seleccionados)
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en la selección: {e}")
+        self.ejecutor.ejecutar(
+            "aleatorio", self._seleccionar_aleatorios,
+            on_exito=self._mostrar_seleccion,
+            on_error=lambda e: messagebox.showerror("Error", f"Error en la selección: {e}")
+        )
+    
+    def _seleccionar_aleatorios(self):
+        """Valida y selecciona (se ejecuta en segundo plano)"""
+        # Validar cantidad mínima
+        es_valido, mensaje = self.service.validar_cantidad_minima(5)
+        if not es_valido:
+            raise ValueError(mensaje)
+        
+        return self.service.seleccionar_aleatorios(5)
+    
+    def _mostrar_seleccion(self, resultado):
+        """Muestra la selección y notifica al callback"""
+        seleccionados, mensaje_formato = resultado
+        
+        # Mostrar resultado
+        messagebox.showinfo("Seleccionados", mensaje_formato)
+        
+        # Notificar al callback si existe
+        if self.on_seleccion_callback:
+            self.on_seleccion_callback(seleccionados)
     
+    @PERFILADOR.manejador
     def _on_reiniciar_click(self):
         """Maneja el click en reiniciar"""
         respuesta = messagebox.askyesno(
@@ -144,12 +199,16 @@ class AcomodadoresPanel(tk.Frame):
         )
         
         if respuesta:
-            try:
-                self.service.reiniciar_todos()
-                self.actualizar_lista()
+            def on_exito(acomodadores):
+                self._mostrar_lista(acomodadores)
                 messagebox.showinfo("Éxito", "Todos los acomodadores han sido reactivados")
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudo reiniciar: {e}")
+            
+            self.ejecutor.cancelar("lista")
+            self.ejecutor.ejecutar_escritura(
+                self.service.reiniciar_todos,
+                on_exito=on_exito,
+                on_error=lambda e: messagebox.showerror("Error", f"No se pudo reiniciar: {e}")
+            )
     
     def obtener_seleccionados(self) -> List[Persona]:
         """Obtiene los acomodadores actualmente seleccionados"""
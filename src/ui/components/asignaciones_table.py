@@ -1,18 +1,35 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Tuple
 from src.models.asignacion import Asignacion
-from src.models.persona import Persona
+from src.models.edicion import Comando
+from src.models.persona import Persona, TipoPersona
 from src.services.asignacion_service import AsignacionService
 from src.services.acomodador_service import AcomodadorService
 from src.services.vigilancia_service import VigilanciaService
+from src.services.seleccion_service import SeleccionService
+from src.services.historial_service import HistorialService
+from src.services.reemplazo_service import Candidato, ReemplazoService
+from src.database.repositories.base import COLUMNAS_PERSONAS, ConflictoVersion
+from src.ui.components.selector_persona import SelectorPersona
+from src.utils.date_utils import DateUtils
+from src.ui.ejecutor import EjecutorSegundoPlano
+from src.ui.perfilador import PERFILADOR
 
 class AsignacionesTable(ttk.Treeview):
     """
     TreeView especializado para mostrar y editar asignaciones
-    Componente reutilizable con edición in-place
+    Componente reutilizable con edición in-place. Las filas guardadas usan
+    el id de la BD como id del item: sus ediciones se guardan y se pueden
+    deshacer (Ctrl+Z) y rehacer (Ctrl+Y), también después de reiniciar.
+    Cada edición lleva la revisión de la fila que se mostró; si otro la
+    cambió mientras tanto, no se pisa: se recarga solo esa fila. El clic
+    derecho sobre una persona ofrece sus mejores reemplazos.
     """
     
+    # Candidatos que se ofrecen en el menú de reemplazo
+    CANDIDATOS_MENU = 8
+    
     # Definición de columnas
     COLUMNAS = {
         'semana': {'texto': 'Semanas', 'ancho': 173, 'editable': False},
@@ -28,7 +45,11 @@ class AsignacionesTable(ttk.Treeview):
     def __init__(self, parent, 
                  asignacion_service: AsignacionService = None,
                  acomodador_service: AcomodadorService = None,
-                 vigilancia_service: VigilanciaService = None):
+                 vigilancia_service: VigilanciaService = None,
+                 seleccion_service: SeleccionService = None,
+                 historial_service: HistorialService = None,
+                 reemplazo_service: ReemplazoService = None,
+                 ejecutor: EjecutorSegundoPlano = None):
         
         # Configurar columnas
         columnas = list(self.COLUMNAS.keys())
@@ -37,6 +58,23 @@ class AsignacionesTable(ttk.Treeview):
         self.asignacion_service = asignacion_service or AsignacionService()
         self.acomodador_service = acomodador_service or AcomodadorService()
         self.vigilancia_service = vigilancia_service or VigilanciaService()
+        self.seleccion_service = seleccion_service or SeleccionService(
+            self.acomodador_service.repository,
+            self.asignacion_service.repository
+        )
+        self.historial_service = historial_service or HistorialService(self.asignacion_service.repository)
+        self.reemplazo_service = reemplazo_service or ReemplazoService(
+            self.acomodador_service.repository,
+            self.asignacion_service.repository,
+            self.vigilancia_service
+        )
+        self.ejecutor = ejecutor or EjecutorSegundoPlano(self)
+        self.ejecutor.agregar_oyente_ocupado(
+            lambda ocupado: self.config(cursor="watch" if ocupado else "")
+        )
+        
+        # item -> revisión de la fila mostrada (solo filas guardadas)
+        self._revisiones: Dict[str, int] = {}
         
         self._configurar_columnas()
         self._aplicar_estilos()
@@ -72,6 +110,9 @@ class AsignacionesTable(ttk.Treeview):
     def _configurar_eventos(self):
         """Configura eventos de edición"""
         self.bind("<Double-1>", self._on_doble_click)
+        self.bind("<Button-3>", self._on_clic_derecho)
+        self.bind("<Control-z>", lambda e: self.deshacer())
+        self.bind("<Control-y>", lambda e: self.rehacer())
     
     def agregar_asignacion(self, asignacion: Asignacion) -> str:
         """
@@ -87,6 +128,29 @@ class AsignacionesTable(ttk.Treeview):
         for asignacion_tuple in asignaciones:
             self.insert("", "end", values=asignacion_tuple)
     
+    def cargar_con_id(self, asignaciones: List[Tuple[int, int, tuple]]):
+        """Carga filas guardadas (id, revisión, tupla): quedan editables con historial"""
+        self.delete(*self.get_children())
+        self._revisiones.clear()
+        
+        for fila_id, revision, asignacion_tuple in asignaciones:
+            item_id = self.insert("", "end", iid=str(fila_id), values=asignacion_tuple)
+            self._revisiones[item_id] = revision
+    
+    @PERFILADOR.manejador
+    def recargar(self, numero_mes: Optional[int] = None):
+        """
+        Recarga las asignaciones guardadas (en segundo plano)
+        Args:
+            numero_mes: Si se especifica, carga solo ese mes
+        """
+        self.ejecutor.ejecutar(
+            "recargar", self.asignacion_service.obtener_asignaciones_con_id, numero_mes or None,
+            on_exito=self.cargar_con_id,
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudieron cargar las asignaciones: {e}")
+        )
+    
+    @PERFILADOR.manejador
     def _on_doble_click(self, event):
         """Maneja el doble click para editar"""
         region = self.identify("region", event.x, event.y)
@@ -125,6 +189,54 @@ class AsignacionesTable(ttk.Treeview):
         else:
             self._editar_con_lista(item_id, col_index, col_name)
     
+    @PERFILADOR.manejador
+    def _on_clic_derecho(self, event):
+        """Menú con los mejores reemplazos de cada persona de la celda"""
+        item_id = self.identify_row(event.y)
+        column_id = self.identify_column(event.x)
+        if not item_id or not column_id:
+            return
+        col_index = int(column_id.replace('#', '')) - 1
+        if not 1 <= col_index <= len(COLUMNAS_PERSONAS):
+            return
+        
+        valores = self.item(item_id, 'values')
+        lunes = DateUtils.parsear_semana(valores[0])
+        if lunes is None:
+            return
+        self.selection_set(item_id)
+        # En segundo plano: puede tener que poner al día los índices de turnos
+        self.ejecutor.ejecutar(
+            "reemplazos", self.reemplazo_service.sugerir_para_semana,
+            lunes, COLUMNAS_PERSONAS[col_index - 1], self.CANDIDATOS_MENU,
+            ReemplazoService.nombres_de(valores[1:7]),
+            on_exito=lambda candidatos: self._mostrar_reemplazos(
+                event, item_id, col_index, valores, candidatos
+            ),
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudieron buscar reemplazos: {e}")
+        )
+    
+    def _mostrar_reemplazos(self, event, item_id: str, col_index: int, valores: tuple,
+                           candidatos: List[Candidato]):
+        """Menú con los candidatos para cada persona de la celda"""
+        menu = tk.Menu(self, tearoff=0)
+        salientes = ReemplazoService.nombres_de([valores[col_index]]) or [""]
+        for saliente in salientes:
+            submenu = tk.Menu(menu, tearoff=0)
+            for candidato in candidatos:
+                submenu.add_command(
+                    label=str(candidato),
+                    command=lambda s=saliente, c=candidato: self._editar_celda(
+                        item_id, col_index,
+                        ReemplazoService.reemplazar_en(valores[col_index], s, str(c.persona)),
+                        f"Reemplazar a {s}" if s else f"Asignar a {c.persona}"
+                    )
+                )
+            if not candidatos:
+                submenu.add_command(label="(sin candidatos disponibles)", state=tk.DISABLED)
+            menu.add_cascade(label=f"Reemplazar a {saliente}" if saliente else "Asignar", menu=submenu)
+        menu.tk_popup(event.x_root, event.y_root)
+    
     def _editar_manual(self, item_id: str, col_index: int, col_name: str):
         """Edición manual con Entry"""
         # Obtener posición de la celda
@@ -152,9 +264,7 @@ class AsignacionesTable(ttk.Treeview):
             
             # Validar según el tipo de columna
             if self._validar_valor(col_name, nuevo_valor):
-                valores = list(self.item(item_id, 'values'))
-                valores[col_index] = nuevo_valor
-                self.item(item_id, values=valores)
+                self._editar_celda(item_id, col_index, nuevo_valor)
             else:
                 messagebox.showerror(
                     "Error",
@@ -168,104 +278,178 @@ class AsignacionesTable(ttk.Treeview):
         entry.bind('<FocusOut>', lambda e: entry.destroy())
     
     def _editar_con_lista(self, item_id: str, col_index: int, col_name: str):
-        """Edición con Listbox de opciones"""
+        """Edición con el selector de personas (búsqueda mientras se escribe)"""
         # Determinar qué mostrar según la columna
         if 'acomo' in col_name:
+            tipo = TipoPersona.ACOMODADOR
             if col_name == 'acomo_final':
                 # Un solo acomodador
-                self._mostrar_selector_simple(
-                    item_id, col_index,
-                    self.acomodador_service.obtener_acomodadores_activos(),
-                    "Seleccione un acomodador"
-                )
+                cantidad, titulo = 1, "Seleccione un acomodador"
             else:
                 # Pareja de acomodadores
-                self._mostrar_selector_pareja(
-                    item_id, col_index,
-                    self.acomodador_service.obtener_acomodadores_activos(),
-                    "Seleccione 2 acomodadores"
-                )
+                cantidad, titulo = 2, "Seleccione 2 acomodadores"
         
         elif 'vigil' in col_name:
             # Un vigilante
-            self._mostrar_selector_simple(
-                item_id, col_index,
-                self.vigilancia_service.obtener_vigilantes_activos(),
-                "Seleccione un vigilante"
+            tipo, cantidad, titulo = TipoPersona.VIGILANTE, 1, "Seleccione un vigilante"
+        
+        else:
+            return
+        
+        mostrar = lambda resultado=None: self._mostrar_selector(
+            item_id, col_index, tipo, cantidad, titulo
+        )
+        error = lambda e: messagebox.showerror("Error", f"No se pudieron cargar las opciones: {e}")
+        
+        if not self.seleccion_service.en_cache(tipo):
+            self.ejecutor.ejecutar("opciones", self.seleccion_service.precargar, tipo,
+                                   on_exito=mostrar, on_error=error)
+            return
+        
+        # Se abre con la instantánea que ya hay y se refresca si la BD cambió
+        selector = mostrar()
+        self.ejecutor.ejecutar(
+            "opciones", self.seleccion_service.precargar, tipo,
+            on_exito=lambda cambio: selector.refrescar() if cambio else None,
+            on_error=error
+        )
+    
+    def _mostrar_selector(self, item_id: str, col_index: int, tipo: TipoPersona,
+                          cantidad: int, titulo: str) -> SelectorPersona:
+        """Muestra el selector y escribe la elección en la celda"""
+        def confirmar(elegidos: List[Persona]):
+            self._editar_celda(
+                item_id, col_index, " / ".join(str(p) for p in elegidos),
+                "Elegir " + " / ".join(str(p) for p in elegidos)
             )
+        
+        return SelectorPersona(
+            self.master, self.seleccion_service, tipo, titulo,
+            cantidad=cantidad, on_confirmar=confirmar
+        )
     
-    def _mostrar_selector_simple(self, item_id: str, col_index: int,
-                                 opciones: List[Persona], titulo: str):
-        """Muestra un selector simple (una opción)"""
-        ventana = tk.Toplevel(self.master)
-        ventana.title(titulo)
-        ventana.geometry("300x400")
-        ventana.transient(self.master)
-        ventana.grab_set()
-        
-        # Listbox
-        listbox = tk.Listbox(ventana)
-        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        for persona in opciones:
-            listbox.insert(tk.END, str(persona))
-        
-        def confirmar(event=None):
-            seleccion = listbox.curselection()
-            if not seleccion:
-                messagebox.showwarning("Advertencia", "Seleccione una opción")
-                return
-            
-            valor = listbox.get(seleccion[0])
-            valores = list(self.item(item_id, 'values'))
-            valores[col_index] = valor
-            self.item(item_id, values=valores)
-            ventana.destroy()
+    def _editar_celda(self, item_id: str, col_index: int, valor: str,
+                      descripcion: Optional[str] = None):
+        """
+        Cambia una celda; si la fila está guardada, también en la BD (con historial)
+        La celda muestra el valor enseguida; la escritura va en segundo plano
+        y, si falla, la fila vuelve a mostrarse como está en la BD.
+        Args:
+            descripcion: Nombre del comando para deshacer (p.ej. "Reemplazar a ...");
+                lo que se escriba con él se deshace de una vez
+        """
+        valores = list(self.item(item_id, 'values'))
+        anterior = valores[col_index]
+        if valor == anterior:
+            return
+        valores[col_index] = valor
+        self.item(item_id, values=valores)
         
-        listbox.bind('<Return>', confirmar)
-        listbox.bind('<Double-1>', confirmar)
+        fila_id = self._fila_id(item_id)
+        if fila_id is None:
+            return
+        columna = COLUMNAS_PERSONAS[col_index - 1]
         
-        btn = tk.Button(ventana, text="Confirmar", command=confirmar)
-        btn.pack(pady=5)
-    
-    def _mostrar_selector_pareja(self, item_id: str, col_index: int,
-                                opciones: List[Persona], titulo: str):
-        """Muestra un selector de pareja (dos opciones)"""
-        ventana = tk.Toplevel(self.master)
-        ventana.title(titulo)
-        ventana.geometry("300x400")
-        ventana.transient(self.master)
-        ventana.grab_set()
-        
-        tk.Label(ventana, text="Seleccione 2 personas (Ctrl + Click)").pack(pady=5)
-        
-        # Listbox con selección múltiple
-        listbox = tk.Listbox(ventana, selectmode=tk.MULTIPLE)
-        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        for persona in opciones:
-            listbox.insert(tk.END, str(persona))
-        
-        def confirmar():
-            seleccion = listbox.curselection()
-            if len(seleccion) != 2:
-                messagebox.showwarning(
-                    "Advertencia",
-                    "Debe seleccionar exactamente 2 personas"
+        def guardar():
+            # La revisión se lee y se guarda en el hilo de trabajo: así la
+            # siguiente escritura de la misma fila ya ve la de esta
+            with self.historial_service.grupo(descripcion or f"Editar {columna}"):
+                self._revisiones[item_id] = self.historial_service.editar(
+                    fila_id, columna, anterior, valor, self._revisiones.get(item_id)
                 )
-                return
-            
-            persona1 = listbox.get(seleccion[0])
-            persona2 = listbox.get(seleccion[1])
-            valor = f"{persona1} / {persona2}"
-            
+        
+        self.ejecutor.ejecutar_escritura(
+            guardar, on_error=lambda e: self._on_error_escritura(item_id, e, "guardar el cambio")
+        )
+    
+    @PERFILADOR.manejador
+    def deshacer(self):
+        """Deshace la última edición guardada"""
+        self._aplicar_historial(self.historial_service.deshacer, usar_anterior=True)
+    
+    @PERFILADOR.manejador
+    def rehacer(self):
+        """Rehace la última edición deshecha"""
+        self._aplicar_historial(self.historial_service.rehacer, usar_anterior=False)
+    
+    def _aplicar_historial(self, accion: Callable, usar_anterior: bool):
+        self.ejecutor.ejecutar_escritura(
+            accion,
+            on_exito=lambda comando: self._mostrar_comando(comando, usar_anterior),
+            on_error=lambda e: self._on_error_escritura(
+                str(e.fila_id) if isinstance(e, ConflictoVersion) else None,
+                e, "deshacer" if usar_anterior else "rehacer"
+            )
+        )
+    
+    def _mostrar_comando(self, comando: Optional[Comando], usar_anterior: bool):
+        """Muestra en las filas visibles el resultado de deshacer o rehacer un comando"""
+        if comando is None:
+            return
+        
+        # Solo se actualizan las filas visibles (las demás se ven al recargar)
+        for edicion in comando.ediciones:
+            item_id = str(edicion.fila_id)
+            if not self.exists(item_id):
+                continue
             valores = list(self.item(item_id, 'values'))
-            valores[col_index] = valor
+            valores[COLUMNAS_PERSONAS.index(edicion.columna) + 1] = (
+                edicion.anterior if usar_anterior else edicion.nuevo
+            )
             self.item(item_id, values=valores)
-            ventana.destroy()
         
-        btn = tk.Button(ventana, text="Confirmar", command=confirmar)
-        btn.pack(pady=5)
+        # Las revisiones cambiaron: se leen de nuevo las de las filas tocadas
+        for item_id in {str(e.fila_id) for e in comando.ediciones}:
+            if self.exists(item_id):
+                self._recargar_fila(item_id)
+    
+    def _on_error_escritura(self, item_id: Optional[str], error: Exception, accion: str):
+        """Una escritura en segundo plano falló: la fila vuelve a mostrarse como está en la BD"""
+        if isinstance(error, ConflictoVersion):
+            self._mostrar_conflicto(item_id, error)
+            return
+        if item_id is not None and self.exists(item_id):
+            self._recargar_fila(item_id)
+        messagebox.showerror("Error", f"No se pudo {accion}: {error}")
+    
+    def _mostrar_conflicto(self, item_id: str, conflicto: ConflictoVersion):
+        """Muestra la fila como quedó en la BD y avisa que la edición no se guardó"""
+        self._mostrar_fila(item_id, conflicto.actual)
+        messagebox.showwarning(
+            "Conflicto",
+            "Otra persona modificó esta asignación mientras la editaba.\n"
+            "Se muestran sus datos actuales; vuelva a intentar el cambio."
+        )
+    
+    def _recargar_fila(self, item_id: str):
+        """Vuelve a leer una sola fila guardada (en segundo plano) y la muestra"""
+        self.ejecutor.ejecutar(
+            f"fila-{item_id}", self.asignacion_service.obtener_asignacion, int(item_id),
+            on_exito=lambda actual: self._mostrar_fila(item_id, actual),
+            # Si no se puede leer, queda como se ve (se corrige al recargar)
+            on_error=lambda e: None
+        )
+    
+    def _mostrar_fila(self, item_id: str, actual: Optional[Tuple[int, tuple]]):
+        """
+        Muestra una fila guardada como está en la BD
+        Args:
+            actual: (revisión, tupla) leídos; None si la fila se borró
+        """
+        if actual is None:
+            # Se borró: ya no se puede editar
+            self._revisiones.pop(item_id, None)
+            if self.exists(item_id):
+                self.delete(item_id)
+            return
+        self._revisiones[item_id] = actual[0]
+        if self.exists(item_id):
+            self.item(item_id, values=actual[1])
+    
+    @staticmethod
+    def _fila_id(item_id: str) -> Optional[int]:
+        """Id de la BD de un item (None si la fila no está guardada)"""
+        return int(item_id) if item_id.isdigit() else None
     
     def _validar_valor(self, col_name: str, valor: str) -> bool:
         """Valida el valor según el tipo de columna"""
@@ -289,4 +473,5 @@ class AsignacionesTable(ttk.Treeview):
     
     def limpiar(self):
         """Limpia todas las filas"""
-        self.delete(*self.get_children())
\ No newline at end of file
+        self.delete(*self.get_children())
+        self._revisiones.clear()
\ No newline at end of file
@@ -0,0 +1,169 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import date
+from typing import List, Optional, Tuple
+from src.services.estadisticas_service import Estadisticas, EstadisticasService
+from src.config.constants import COLORES, FUENTES
+from src.ui.ejecutor import EjecutorSegundoPlano
+from src.ui.perfilador import PERFILADOR
+
+class VentanaEstadisticas(tk.Toplevel):
+    """
+    Ventana con los turnos por puesto, grupo y persona de un rango de fechas
+    Los conteos se piden en segundo plano y llegan ya agregados por la BD.
+    """
+    
+    # Puestos en el orden de las columnas de la tabla de personas
+    PUESTOS = [
+        ('acomodadores_1hora', 'Acom. 1°'),
+        ('acomodadores_2hora', 'Acom. 2°'),
+        ('acomodador_final', 'Acom. final'),
+        ('vigilante_1hora', 'Vigil. 1°'),
+        ('vigilante_2hora', 'Vigil. 2°'),
+        ('vigilante_final', 'Vigil. final'),
+    ]
+    
+    def __init__(self, parent, service: EstadisticasService = None,
+                 ejecutor: EjecutorSegundoPlano = None):
+        super().__init__(parent)
+        self.service = service or EstadisticasService()
+        self.ejecutor = ejecutor or EjecutorSegundoPlano(self)
+        self.ejecutor.agregar_oyente_ocupado(
+            lambda ocupado: self.config(cursor="watch" if ocupado else "")
+        )
+        
+        self.title("Estadísticas de turnos")
+        self.geometry("760x520")
+        self.config(bg=COLORES['fondo_oscuro'])
+        self.protocol("WM_DELETE_WINDOW", self._on_cerrar)
+        
+        self._crear_widgets()
+        self._on_calcular_click()
+    
+    def _crear_widgets(self):
+        # Rango de fechas
+        frame_rango = tk.Frame(self, bg=COLORES['fondo_oscuro'])
+        frame_rango.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.entry_desde = self._crear_campo(frame_rango, "Desde (AAAA-MM-DD):")
+        self.entry_hasta = self._crear_campo(frame_rango, "Hasta:")
+        
+        tk.Button(
+            frame_rango,
+            text="Calcular",
+            command=self._on_calcular_click,
+            relief="groove",
+            bg=COLORES['boton'],
+            fg=COLORES['texto_boton']
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.label_total = tk.Label(
+            self, anchor="w",
+            fg=COLORES['texto_claro'],
+            bg=COLORES['fondo_oscuro'],
+            font=FUENTES['listbox']
+        )
+        self.label_total.pack(fill=tk.X, padx=10)
+        
+        # Una pestaña por agrupación
+        pestanas = ttk.Notebook(self)
+        pestanas.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.tabla_personas = self._crear_tabla(
+            pestanas, "Por persona",
+            [('nombre', 'Persona', 200), ('total', 'Total', 60)]
+            + [(columna, texto, 70) for columna, texto in self.PUESTOS]
+        )
+        self.tabla_puestos = self._crear_tabla(
+            pestanas, "Por puesto", [('puesto', 'Puesto', 250), ('turnos', 'Turnos', 100)]
+        )
+        self.tabla_grupos = self._crear_tabla(
+            pestanas, "Por grupo", [('grupo', 'Grupo de vigilancia', 250), ('turnos', 'Turnos', 100)]
+        )
+    
+    def _crear_campo(self, parent, texto: str) -> tk.Entry:
+        tk.Label(
+            parent, text=texto,
+            fg=COLORES['texto_claro'],
+            bg=COLORES['fondo_oscuro'],
+            font=FUENTES['listbox']
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        entry = tk.Entry(parent, width=12)
+        entry.pack(side=tk.LEFT, padx=(0, 10))
+        entry.bind('<Return>', lambda e: self._on_calcular_click())
+        return entry
+    
+    def _crear_tabla(self, pestanas: ttk.Notebook, titulo: str,
+                     columnas: List[Tuple[str, str, int]]) -> ttk.Treeview:
+        frame = tk.Frame(pestanas, bg=COLORES['fondo_oscuro'])
+        pestanas.add(frame, text=titulo)
+        
+        tabla = ttk.Treeview(frame, columns=[c[0] for c in columnas], show='headings')
+        for col_id, texto, ancho in columnas:
+            tabla.heading(col_id, text=texto)
+            tabla.column(col_id, width=ancho, minwidth=40, anchor="w" if col_id in ('nombre', 'puesto', 'grupo') else "e")
+        
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tabla.yview)
+        tabla.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tabla.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        return tabla
+    
+    def _leer_fecha(self, entry: tk.Entry) -> Optional[date]:
+        """Fecha del campo (vacío = sin límite); ValueError si no es válida"""
+        texto = entry.get().strip()
+        if not texto:
+            return None
+        try:
+            return date.fromisoformat(texto)
+        except ValueError:
+            raise ValueError(f"Fecha inválida: '{texto}' (formato AAAA-MM-DD)")
+    
+    @PERFILADOR.manejador
+    def _on_calcular_click(self):
+        """Pide las estadísticas del rango en segundo plano"""
+        try:
+            desde = self._leer_fecha(self.entry_desde)
+            hasta = self._leer_fecha(self.entry_hasta)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e), parent=self)
+            return
+        
+        self.ejecutor.ejecutar(
+            "calcular", self.service.calcular, desde, hasta,
+            on_exito=self._mostrar,
+            on_error=lambda e: messagebox.showerror(
+                "Error", f"No se pudieron calcular las estadísticas: {e}", parent=self
+            )
+        )
+    
+    def _mostrar(self, estadisticas: Estadisticas):
+        """Vuelca los conteos en las tablas"""
+        self.label_total.config(
+            text=f"{estadisticas.total_asignaciones} asignaciones, {len(estadisticas.por_persona)} personas"
+        )
+        
+        filas = []
+        for nombre, total in estadisticas.ranking():
+            roles = estadisticas.por_persona[nombre]
+            filas.append((nombre, total) + tuple(roles.get(columna, 0) for columna, _ in self.PUESTOS))
+        self._llenar(self.tabla_personas, filas)
+        
+        textos = dict(self.PUESTOS)
+        self._llenar(self.tabla_puestos, [
+            (textos.get(columna, columna), cantidad) for columna, cantidad in estadisticas.por_rol.items()
+        ])
+        self._llenar(self.tabla_grupos, [
+            ("Sin grupo" if grupo == 0 else f"Grupo {grupo}", cantidad)
+            for grupo, cantidad in sorted(estadisticas.por_grupo.items())
+        ])
+    
+    @staticmethod
+    def _llenar(tabla: ttk.Treeview, filas: List[tuple]):
+        tabla.delete(*tabla.get_children())
+        for fila in filas:
+            tabla.insert("", "end", values=fila)
+    
+    def _on_cerrar(self):
+        self.ejecutor.cerrar()
+        self.destroy()
@@ -4,6 +4,7 @@ from typing import Callable, List, Optional
 from src.models.semana import Semana
 from src.services.fecha_service import FechaService
 from src.config.constants import COLORES, FUENTES
+from src.ui.perfilador import PERFILADOR
 
 class FechasPanel(tk.Frame):
     """Panel para gestión de fechas y semanas"""
@@ -82,6 +83,7 @@ class FechasPanel(tk.Frame):
         for texto in textos:
             self.listbox.insert(END, texto)
     
+    @PERFILADOR.manejador
     def _on_mostrar_click(self):
         """Maneja el click en mostrar"""
         seleccion = self.listbox.curselection()
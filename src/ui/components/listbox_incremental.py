@@ -0,0 +1,53 @@
+from tkinter import Listbox, END
+from typing import Hashable, List, Tuple
+from src.utils.diff_utils import DiffUtils
+
+class ListboxIncremental(Listbox):
+    """
+    Listbox que se actualiza aplicando solo las diferencias
+    Conserva la selección y la posición del scroll entre refrescos
+    """
+    
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.filas: List[Tuple[Hashable, str]] = []
+    
+    def actualizar(self, filas: List[Tuple[Hashable, str]]):
+        """
+        Actualiza el contenido con inserciones, borrados y cambios puntuales
+        Args:
+            filas: Filas deseadas como (clave, texto), p.ej. (persona.id, str(persona))
+        """
+        operaciones = DiffUtils.operaciones_lista(self.filas, filas)
+        if not operaciones:
+            self.filas = list(filas)
+            return
+        
+        # Recordar selección y primera fila visible por clave
+        seleccion = {self.filas[i][0] for i in self.curselection() if i < len(self.filas)}
+        primera_visible = self.filas[self.nearest(0)][0] if self.filas else None
+        
+        for tipo, indice, texto in operaciones:
+            if tipo == "borrar":
+                self.delete(indice)
+            elif tipo == "insertar":
+                self.insert(indice, texto)
+            else:
+                self.delete(indice)
+                self.insert(indice, texto)
+        
+        self.filas = list(filas)
+        self._restaurar_estado(seleccion, primera_visible)
+    
+    def _restaurar_estado(self, seleccion: set, primera_visible):
+        """Vuelve a seleccionar las filas y a posicionar el scroll"""
+        for i, (clave, _) in enumerate(self.filas):
+            if clave in seleccion:
+                self.selection_set(i)
+            if clave == primera_visible:
+                self.yview(i)
+    
+    def limpiar(self):
+        """Elimina todas las filas"""
+        self.delete(0, END)
+        self.filas = []
@@ -0,0 +1,114 @@
+import tkinter as tk
+from tkinter import messagebox, END
+from typing import Callable, List
+from src.models.persona import Persona, TipoPersona
+from src.services.seleccion_service import SeleccionService
+from src.ui.perfilador import PERFILADOR
+
+class SelectorPersona(tk.Toplevel):
+    """
+    Ventana para elegir personas con búsqueda mientras se escribe
+    Filtra sobre la instantánea en memoria de SeleccionService (sin ir a
+    la BD) y muestra primero a quienes tienen menos turnos.
+    """
+    
+    def __init__(self, parent, service: SeleccionService, tipo: TipoPersona,
+                 titulo: str, cantidad: int = 1,
+                 on_confirmar: Callable[[List[Persona]], None] = None):
+        """
+        Args:
+            service: Servicio de selección (con el plantel ya en caché)
+            tipo: Tipo de persona a elegir
+            titulo: Título de la ventana
+            cantidad: Cuántas personas hay que elegir (1 o 2)
+            on_confirmar: Callback con la lista de personas elegidas
+        """
+        super().__init__(parent)
+        self.service = service
+        self.tipo = tipo
+        self.cantidad = cantidad
+        self.on_confirmar = on_confirmar
+        self.candidatos: List[Persona] = []
+        self.elegidos: List[Persona] = []
+        
+        self.title(titulo)
+        self.geometry("300x400")
+        self.transient(parent)
+        self.grab_set()
+        
+        self._crear_widgets()
+        self._filtrar()
+        self.entry.focus()
+    
+    def _crear_widgets(self):
+        """Crea los widgets de la ventana"""
+        texto_ayuda = (
+            "Escriba para buscar" if self.cantidad == 1
+            else f"Elija {self.cantidad} personas (Enter o doble click)"
+        )
+        tk.Label(self, text=texto_ayuda).pack(pady=5)
+        
+        self.var_busqueda = tk.StringVar()
+        self.entry = tk.Entry(self, textvariable=self.var_busqueda)
+        self.entry.pack(fill=tk.X, padx=10)
+        self.var_busqueda.trace_add("write", lambda *args: self._filtrar())
+        
+        self.listbox = tk.Listbox(self)
+        self.listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.label_elegidos = tk.Label(self, text="")
+        if self.cantidad > 1:
+            self.label_elegidos.pack()
+        
+        tk.Button(self, text="Confirmar", command=self._elegir).pack(pady=5)
+        
+        self.entry.bind('<Return>', self._elegir)
+        self.entry.bind('<Down>', self._foco_lista)
+        self.listbox.bind('<Return>', self._elegir)
+        self.listbox.bind('<Double-1>', self._elegir)
+        self.bind('<Escape>', lambda e: self.destroy())
+    
+    @PERFILADOR.manejador
+    def _filtrar(self):
+        """Actualiza la lista según el texto de búsqueda"""
+        encontrados = [
+            (p, turnos) for p, turnos in self.service.obtener_candidatos(self.tipo, self.var_busqueda.get())
+            if p not in self.elegidos
+        ]
+        self.candidatos = [p for p, _ in encontrados]
+        self.listbox.delete(0, END)
+        for persona, turnos in encontrados:
+            self.listbox.insert(END, f"{persona} ({turnos} turnos)")
+        if self.candidatos:
+            self.listbox.selection_set(0)
+    
+    def refrescar(self):
+        """Vuelve a filtrar con la instantánea recargada en segundo plano (si sigue abierta)"""
+        if self.winfo_exists():
+            self._filtrar()
+    
+    def _foco_lista(self, event=None):
+        """Pasa el foco del buscador a la lista"""
+        self.listbox.focus_set()
+        return "break"
+    
+    @PERFILADOR.manejador
+    def _elegir(self, event=None):
+        """Elige la persona seleccionada y confirma al completar la cantidad"""
+        seleccion = self.listbox.curselection()
+        if not seleccion:
+            messagebox.showwarning("Advertencia", "Seleccione una opción", parent=self)
+            return
+        
+        self.elegidos.append(self.candidatos[seleccion[0]])
+        if len(self.elegidos) < self.cantidad:
+            self.label_elegidos.config(
+                text="Elegidos: " + " / ".join(str(p) for p in self.elegidos)
+            )
+            self.var_busqueda.set("")
+            self.entry.focus()
+            return
+        
+        if self.on_confirmar:
+            self.on_confirmar(self.elegidos)
+        self.destroy()
@@ -1,9 +1,13 @@
 import tkinter as tk
-from tkinter import messagebox, Listbox, END, Menu
-from typing import Callable, List, Optional
+from tkinter import messagebox, END, Menu
+from typing import Callable, Dict, List, Optional
 from src.models.persona import Persona
+from src.database.repositories.base import ConflictoVersion
 from src.services.vigilancia_service import VigilanciaService
+from src.ui.ejecutor import EjecutorSegundoPlano
+from src.ui.components.listbox_incremental import ListboxIncremental
 from src.config.constants import COLORES, FUENTES
+from src.ui.perfilador import PERFILADOR
 
 class VigilanciaPanel(tk.Frame):
     """
@@ -13,16 +17,21 @@ class VigilanciaPanel(tk.Frame):
     
     def __init__(self, parent, service: VigilanciaService = None,
                  on_seleccion_callback: Callable = None,
-                 numero_grupo_limpieza: Optional[int] = None):
+                 numero_grupo_limpieza: Optional[int] = None,
+                 ejecutor: EjecutorSegundoPlano = None):
         super().__init__(parent)
         self.service = service or VigilanciaService()
         self.on_seleccion_callback = on_seleccion_callback
         self.numero_grupo_limpieza = numero_grupo_limpieza
         self.vigilantes_actuales: List[Persona] = []
+        # Grupo de cada vigilante listado (por id), para no consultar la BD en el hilo de Tk
+        self.grupos_actuales: Dict[int, int] = {}
+        self.ejecutor = ejecutor or EjecutorSegundoPlano(self)
         
         self._configurar_estilos()
         self._crear_widgets()
         self._crear_menu_contextual()
+        self.ejecutor.agregar_oyente_ocupado(self._mostrar_ocupado)
         self._cargar_datos_iniciales()
     
     def _configurar_estilos(self):
@@ -62,7 +71,7 @@ class VigilanciaPanel(tk.Frame):
         scrollbar = tk.Scrollbar(frame_list)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.listbox = Listbox(
+        self.listbox = ListboxIncremental(
             frame_list,
             relief="raised",
             font=FUENTES['listbox'],
@@ -82,6 +91,16 @@ class VigilanciaPanel(tk.Frame):
         
         self._crear_botones(frame_botones)
         
+        # Indicador de actividad
+        self.label_estado = tk.Label(
+            self,
+            text="",
+            fg=COLORES['texto_claro'],
+            bg=COLORES['fondo_oscuro'],
+            font=FUENTES['listbox']
+        )
+        self.label_estado.grid(row=4, column=0, sticky="ew", padx=5)
+        
         # Configurar expansión
         self.grid_rowconfigure(2, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -137,31 +156,56 @@ class VigilanciaPanel(tk.Frame):
         """Carga los vigilantes iniciales"""
         self.actualizar_lista()
     
+    def _mostrar_ocupado(self, ocupado: bool):
+        """Muestra u oculta el indicador de actividad"""
+        self.label_estado.config(text="Cargando..." if ocupado else "")
+        self.config(cursor="watch" if ocupado else "")
+    
+    @PERFILADOR.manejador
     def actualizar_lista(self, filtrar_por_grupo: int = None):
         """
-        Actualiza la lista de vigilantes desde la BD
+        Actualiza la lista de vigilantes desde la BD (en segundo plano)
         Args:
             filtrar_por_grupo: Si se especifica, muestra solo ese grupo
         """
-        self.listbox.delete(0, END)
-        
+        self.ejecutor.ejecutar(
+            "lista",
+            self._obtener_lista, filtrar_por_grupo,
+            on_exito=self._mostrar_lista,
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudo cargar la lista: {e}")
+        )
+    
+    def _obtener_lista(self, filtrar_por_grupo: int = None):
+        """
+        Consulta los vigilantes y su grupo (se ejecuta en segundo plano)
+        Returns: (vigilantes, grupos_por_id, texto_label)
+        """
         if filtrar_por_grupo:
             grupo = self.service.obtener_grupo_por_numero(filtrar_por_grupo)
-            self.vigilantes_actuales = grupo.miembros if grupo else []
-            self.label_grupo.config(text=f"Grupo {filtrar_por_grupo} de limpieza")
+            vigilantes = grupo.miembros if grupo else []
+            texto_label = f"Grupo {filtrar_por_grupo} de limpieza"
         else:
-            self.vigilantes_actuales = self.service.obtener_vigilantes_activos()
-            self.label_grupo.config(text="Todos los vigilantes")
+            vigilantes = self.service.obtener_vigilantes_activos()
+            texto_label = "Todos los vigilantes"
+        
+        return vigilantes, self.service.numeros_de_grupo(vigilantes), texto_label
+    
+    def _mostrar_lista(self, resultado):
+        """Aplica al listbox solo las diferencias con la lista obtenida"""
+        self.vigilantes_actuales, self.grupos_actuales, texto_label = resultado
+        self.label_grupo.config(text=texto_label)
         
-        for persona in self.vigilantes_actuales:
-            num_grupo = self.service.obtener_grupo_de_persona(persona)
-            self.listbox.insert(END, f"{persona} (Grupo {num_grupo})")
+        self.listbox.actualizar([
+            (persona.id, f"{persona} (Grupo {self.grupos_actuales.get(persona.id, 0)})")
+            for persona in self.vigilantes_actuales
+        ])
     
     def set_grupo_limpieza(self, numero_grupo: int):
         """Establece el grupo de limpieza y filtra la lista"""
         self.numero_grupo_limpieza = numero_grupo
         self.actualizar_lista(numero_grupo)
     
+    @PERFILADOR.manejador
     def _on_remover_click(self):
         """Maneja el click en remover"""
         seleccion = self.listbox.curselection()
@@ -174,41 +218,63 @@ class VigilanciaPanel(tk.Frame):
         
         respuesta = messagebox.askyesno(
             "Confirmar",
-            f"¿Desea remover a {persona} del grupo {self.service.obtener_grupo_de_persona(persona)}?"
+            f"¿Desea remover a {persona} del grupo {self.grupos_actuales.get(persona.id, 0)}?"
         )
         
         if respuesta:
-            try:
-                self.service.remover_vigilante_de_grupo(persona.id)
-                self.actualizar_lista()
+            def remover():
+                self.service.remover_vigilante_de_grupo(persona.id, revision=persona.revision)
+                return self._obtener_lista()
+            
+            def on_exito(resultado):
+                self._mostrar_lista(resultado)
                 messagebox.showinfo("Éxito", f"{persona} ha sido removido")
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudo remover: {e}")
+            
+            # Un refresco en curso quedaría desactualizado
+            self.ejecutor.cancelar("lista")
+            self.ejecutor.ejecutar_escritura(
+                remover,
+                on_exito=on_exito,
+                on_error=self._on_error_remover
+            )
     
+    def _on_error_remover(self, error: Exception):
+        if isinstance(error, ConflictoVersion):
+            # Otro la cambió desde que se listó: se muestra como está ahora
+            messagebox.showwarning("Conflicto", "La persona fue modificada por otra edición; se actualizó la lista")
+            self.actualizar_lista(self.numero_grupo_limpieza)
+            return
+        messagebox.showerror("Error", f"No se pudo remover: {error}")
+    
+    @PERFILADOR.manejador
     def _on_aleatorio_click(self):
         """Maneja el click en selección aleatoria"""
-        try:
-            es_valido, mensaje = self.service.validar_cantidad_minima(3)
-            if not es_valido:
-                messagebox.showerror("Error", mensaje)
-                return
-            
-            # Si hay grupo de limpieza, seleccionar de ese grupo
-            if self.numero_grupo_limpieza:
-                seleccionados, mensaje_formato = self.service.seleccionar_por_grupo(
-                    self.numero_grupo_limpieza
-                )
-            else:
-                seleccionados, mensaje_formato = self.service.seleccionar_aleatorios(3)
-            
-            messagebox.showinfo("Seleccionados", mensaje_formato)
-            
-            if self.on_seleccion_callback:
-                self.on_seleccion_callback(seleccionados)
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en la selección: {e}")
+        self.ejecutor.ejecutar(
+            "aleatorio", self._seleccionar_aleatorios, self.numero_grupo_limpieza,
+            on_exito=self._mostrar_seleccion,
+            on_error=lambda e: messagebox.showerror("Error", f"Error en la selección: {e}")
+        )
+    
+    def _seleccionar_aleatorios(self, numero_grupo_limpieza: Optional[int]):
+        """Valida y selecciona (se ejecuta en segundo plano)"""
+        es_valido, mensaje = self.service.validar_cantidad_minima(3)
+        if not es_valido:
+            raise ValueError(mensaje)
+        
+        # Si hay grupo de limpieza, seleccionar de ese grupo
+        if numero_grupo_limpieza:
+            return self.service.seleccionar_por_grupo(numero_grupo_limpieza)
+        return self.service.seleccionar_aleatorios(3)
     
+    def _mostrar_seleccion(self, resultado):
+        """Muestra la selección y notifica al callback"""
+        seleccionados, mensaje_formato = resultado
+        messagebox.showinfo("Seleccionados", mensaje_formato)
+        
+        if self.on_seleccion_callback:
+            self.on_seleccion_callback(seleccionados)
+    
+    @PERFILADOR.manejador
     def _on_reiniciar_click(self):
         """Maneja el click en reiniciar"""
         respuesta = messagebox.askyesno(
@@ -217,17 +283,32 @@ class VigilanciaPanel(tk.Frame):
         )
         
         if respuesta:
-            try:
+            def reiniciar():
                 self.service.reiniciar_todos()
-                self.actualizar_lista()
+                return self._obtener_lista()
+            
+            def on_exito(resultado):
+                self._mostrar_lista(resultado)
                 messagebox.showinfo("Éxito", "Todos los vigilantes han sido reactivados")
-            except Exception as e:
-                messagebox.showerror("Error", f"No se pudo reiniciar: {e}")
+            
+            self.ejecutor.cancelar("lista")
+            self.ejecutor.ejecutar_escritura(
+                reiniciar,
+                on_exito=on_exito,
+                on_error=lambda e: messagebox.showerror("Error", f"No se pudo reiniciar: {e}")
+            )
     
+    @PERFILADOR.manejador
     def _on_ver_grupos_click(self):
         """Muestra las estadísticas de todos los grupos"""
-        stats = self.service.obtener_estadisticas_grupos()
-        
+        self.ejecutor.ejecutar(
+            "estadisticas", self.service.obtener_estadisticas_grupos,
+            on_exito=self._mostrar_estadisticas,
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudieron obtener las estadísticas: {e}")
+        )
+    
+    def _mostrar_estadisticas(self, stats: Dict[int, Dict]):
+        """Muestra las estadísticas en una ventana con texto scrollable"""
         mensaje = "ESTADÍSTICAS DE GRUPOS DE VIGILANCIA\n\n"
         for num in sorted(stats.keys()):
             info = stats[num]
@@ -246,6 +327,7 @@ class VigilanciaPanel(tk.Frame):
         text.insert("1.0", mensaje)
         text.config(state=tk.DISABLED)
     
+    @PERFILADOR.manejador
     def _ver_grupo_de_seleccionado(self):
         """Muestra el grupo del vigilante seleccionado"""
         seleccion = self.listbox.curselection()
@@ -253,7 +335,7 @@ class VigilanciaPanel(tk.Frame):
             return
         
         persona = self.vigilantes_actuales[seleccion[0]]
-        num_grupo = self.service.obtener_grupo_de_persona(persona)
+        num_grupo = self.grupos_actuales.get(persona.id, 0)
         
         if num_grupo > 0:
             messagebox.showinfo(
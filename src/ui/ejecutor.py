@@ -0,0 +1,181 @@
+import contextvars
+import queue
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError
+from typing import Any, Callable, Dict, List, Optional
+from src.ui.perfilador import PERFILADOR
+
+class EjecutorSegundoPlano:
+    """
+    Ejecuta llamadas a servicios en un hilo de trabajo y entrega los
+    resultados en el hilo de Tk mediante after()
+    
+    Tk no es thread-safe: los hilos de trabajo solo dejan el resultado en
+    una cola y el hilo principal la sondea con after(). Las solicitudes se
+    identifican con una clave; una nueva solicitud con la misma clave
+    cancela (o descarta el resultado de) la anterior. Eso sirve para las
+    lecturas; las escrituras van por ejecutar_escritura, que nunca cancela.
+    """
+    
+    INTERVALO_SONDEO_MS = 30
+    
+    def __init__(self, widget, max_hilos: int = 1):
+        """
+        Args:
+            widget: Widget de Tk cuyo after() se usa para volver al hilo principal
+            max_hilos: Cantidad de hilos de trabajo
+        """
+        self.widget = widget
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos,
+                                        thread_name_prefix="ejecutor-ui")
+        self._resultados: "queue.Queue[tuple]" = queue.Queue()
+        self._generaciones: Dict[str, int] = {}
+        self._futuros: Dict[str, Future] = {}
+        self._escrituras = 0
+        self._pendientes = 0
+        self._sondeo_id: Optional[str] = None
+        self._oyentes_ocupado: List[Callable[[bool], None]] = []
+        self._cerrado = False
+    
+    @property
+    def ocupado(self) -> bool:
+        """Indica si hay solicitudes en curso"""
+        return self._pendientes > 0
+    
+    def agregar_oyente_ocupado(self, callback: Callable[[bool], None]):
+        """Registra un callback que recibe True/False al cambiar el estado ocupado"""
+        self._oyentes_ocupado.append(callback)
+    
+    def ejecutar(self, clave: str, funcion: Callable, *args,
+                 on_exito: Callable[[Any], None] = None,
+                 on_error: Callable[[Exception], None] = None, **kwargs) -> int:
+        """
+        Ejecuta una función en segundo plano
+        Args:
+            clave: Identificador de la solicitud (las anteriores con la misma clave se descartan)
+            funcion: Función a ejecutar en el hilo de trabajo
+            on_exito: Callback en el hilo de Tk con el resultado
+            on_error: Callback en el hilo de Tk con la excepción
+        Returns:
+            Número de generación de la solicitud
+        """
+        if self._cerrado:
+            raise RuntimeError("El ejecutor está cerrado")
+        
+        self.cancelar(clave)
+        generacion = self._generaciones.get(clave, 0)
+        self._futuros[clave] = self._enviar(clave, generacion, funcion, args, kwargs, on_exito, on_error)
+        return generacion
+    
+    def ejecutar_escritura(self, funcion: Callable, *args,
+                           on_exito: Callable[[Any], None] = None,
+                           on_error: Callable[[Exception], None] = None, **kwargs):
+        """
+        Ejecuta en segundo plano una función que modifica datos
+        No se cancela ni se reemplaza: cada escritura corre y entrega su
+        resultado o su error, aunque mientras tanto se pidan otras.
+        """
+        if self._cerrado:
+            raise RuntimeError("El ejecutor está cerrado")
+        
+        # Clave única: ninguna otra solicitud la cancela ni descarta su resultado
+        self._escrituras += 1
+        self._enviar(f"escritura-{self._escrituras}", 0, funcion, args, kwargs, on_exito, on_error)
+    
+    def _enviar(self, clave: str, generacion: int, funcion: Callable, args: tuple, kwargs: dict,
+                on_exito, on_error) -> Future:
+        """Envía la función al pool; el resultado vuelve por la cola de resultados"""
+        # Si hay un clic en perfilado, el pedido y sus callbacks son parte de su traza
+        traza = PERFILADOR.traza_actual()
+        if traza is not None:
+            PERFILADOR.abrir(traza)
+            funcion = PERFILADOR.en_fondo(traza, funcion)
+            on_exito = PERFILADOR.en_tk(traza, on_exito)
+            on_error = PERFILADOR.en_tk(traza, on_error)
+        
+        # El hilo de trabajo hereda las variables de contexto (acción, traza)
+        contexto = contextvars.copy_context()
+        futuro = self._pool.submit(contexto.run, funcion, *args, **kwargs)
+        self._cambiar_pendientes(+1)
+        
+        futuro.add_done_callback(
+            lambda f: self._resultados.put((clave, generacion, f, on_exito, on_error, traza))
+        )
+        self._programar_sondeo()
+        return futuro
+    
+    def cancelar(self, clave: str):
+        """Cancela la solicitud en curso con esa clave (su resultado se descarta)"""
+        self._generaciones[clave] = self._generaciones.get(clave, 0) + 1
+        futuro = self._futuros.pop(clave, None)
+        if futuro is not None:
+            futuro.cancel()
+    
+    def cerrar(self):
+        """Cancela las lecturas pendientes y libera los hilos (las escrituras terminan)"""
+        self._cerrado = True
+        for clave in list(self._futuros):
+            self.cancelar(clave)
+        if self._sondeo_id is not None:
+            try:
+                self.widget.after_cancel(self._sondeo_id)
+            except Exception:
+                pass
+            self._sondeo_id = None
+        self._pool.shutdown(wait=False)
+    
+    def _programar_sondeo(self):
+        """Programa el próximo sondeo de la cola si no hay uno pendiente"""
+        if self._sondeo_id is None and not self._cerrado:
+            try:
+                self._sondeo_id = self.widget.after(self.INTERVALO_SONDEO_MS, self._sondear)
+            except Exception:
+                # El widget ya fue destruido
+                self._sondeo_id = None
+    
+    def _sondear(self):
+        """Entrega en el hilo de Tk los resultados terminados"""
+        self._sondeo_id = None
+        while True:
+            try:
+                clave, generacion, futuro, on_exito, on_error, traza = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            
+            self._cambiar_pendientes(-1)
+            if self._futuros.get(clave) is futuro:
+                del self._futuros[clave]
+            
+            try:
+                # Solicitud reemplazada por otra más nueva: se descarta
+                if generacion != self._generaciones.get(clave, 0) or futuro.cancelled():
+                    continue
+                
+                self._entregar(futuro, on_exito, on_error)
+            finally:
+                if traza is not None:
+                    PERFILADOR.cerrar(traza)
+        
+        if self._pendientes > 0:
+            self._programar_sondeo()
+    
+    def _entregar(self, futuro: Future, on_exito, on_error):
+        """Invoca el callback correspondiente al resultado"""
+        try:
+            resultado = futuro.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            return
+        
+        if on_exito:
+            on_exito(resultado)
+    
+    def _cambiar_pendientes(self, delta: int):
+        """Actualiza el contador y notifica cambios del estado ocupado"""
+        antes = self.ocupado
+        self._pendientes += delta
+        if antes != self.ocupado:
+            for callback in self._oyentes_ocupado:
+                callback(self.ocupado)
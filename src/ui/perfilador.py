@@ -0,0 +1,295 @@
+"""
+Perfilador de los manejadores de eventos de la interfaz
+
+Cada manejador decorado con @PERFILADOR.manejador abre una traza que sigue
+al clic hasta que la interfaz termina de actualizarse: la parte que corre en
+el hilo de Tk, los pedidos que lanza al EjecutorSegundoPlano y los callbacks
+que muestran sus resultados. Por manejador se acumulan histogramas de:
+
+    respuesta   desde el clic hasta el último callback (sin los diálogos)
+    servicios   tiempo dentro de los servicios (en segundo plano o no)
+    widgets     tiempo del hilo de Tk fuera de los servicios
+    espera      el resto: cola del ejecutor y sondeo con after()
+
+El tiempo que un diálogo modal (messagebox) espera al usuario se descuenta:
+es tiempo de lectura, no de la aplicación. Desactivado no cuesta nada: el
+decorador solo consulta un atributo. Las consultas SQL de cada manejador se
+agrupan además bajo su nombre en la instrumentación de la BD.
+"""
+import contextvars
+import functools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from src.database.instrumentacion import INSTRUMENTACION
+
+# Límites superiores de las barras del histograma (ms); la última es "más"
+BORDES_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_DIALOGOS = ("showinfo", "showwarning", "showerror", "askquestion",
+             "askokcancel", "askyesno", "askyesnocancel", "askretrycancel")
+
+_TRAZA: contextvars.ContextVar = contextvars.ContextVar("traza_ui", default=None)
+_EN_SERVICIO: contextvars.ContextVar = contextvars.ContextVar("en_servicio", default=False)
+
+class Histograma:
+    """Histograma de tiempos en ms con barras de ancho creciente"""
+    
+    def __init__(self, bordes: Tuple[float, ...] = BORDES_MS):
+        self.bordes = bordes
+        self.cuentas = [0] * (len(bordes) + 1)
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+    
+    def agregar(self, ms: float):
+        indice = next((i for i, borde in enumerate(self.bordes) if ms <= borde), len(self.bordes))
+        self.cuentas[indice] += 1
+        self.total += 1
+        self.suma += ms
+        self.maximo = max(self.maximo, ms)
+    
+    @property
+    def promedio(self) -> float:
+        return self.suma / self.total if self.total else 0.0
+    
+    def percentil(self, p: float) -> float:
+        """Percentil aproximado (límite superior de la barra que lo contiene)"""
+        if not self.total:
+            return 0.0
+        acumulado = 0
+        for indice, cuenta in enumerate(self.cuentas):
+            acumulado += cuenta
+            if acumulado >= self.total * p:
+                return min(self.bordes[indice], self.maximo) if indice < len(self.bordes) else self.maximo
+        return self.maximo
+    
+    def barras(self, ancho: int = 30) -> List[str]:
+        """Una línea por barra con datos: rango, cantidad y barra proporcional"""
+        lineas = []
+        mayor = max(self.cuentas) or 1
+        for indice, cuenta in enumerate(self.cuentas):
+            if not cuenta:
+                continue
+            etiqueta = f"<= {self.bordes[indice]} ms" if indice < len(self.bordes) else f"> {self.bordes[-1]} ms"
+            lineas.append(f"{etiqueta:>11} {cuenta:6} {'#' * max(1, cuenta * ancho // mayor)}")
+        return lineas
+
+@dataclass
+class EstadisticaManejador:
+    """Histogramas de un manejador"""
+    nombre: str
+    respuesta: Histograma = field(default_factory=Histograma)
+    servicios: Histograma = field(default_factory=Histograma)
+    widgets: Histograma = field(default_factory=Histograma)
+    espera: Histograma = field(default_factory=Histograma)
+    
+    def __str__(self) -> str:
+        r = self.respuesta
+        return (
+            f"{self.nombre}: {r.total} veces - respuesta p50 {r.percentil(0.5):.0f} ms, "
+            f"p95 {r.percentil(0.95):.0f} ms, máx {r.maximo:.1f} ms | promedios: "
+            f"servicios {self.servicios.promedio:.1f} ms, widgets {self.widgets.promedio:.1f} ms, "
+            f"espera {self.espera.promedio:.1f} ms"
+        )
+
+class Traza:
+    """Un clic (o evento) seguido hasta que la interfaz terminó de responder"""
+    
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.inicio = time.perf_counter()
+        self.tk = 0.0                # Hilo de Tk: manejador y callbacks
+        self.servicios_tk = 0.0      # Servicios llamados desde el hilo de Tk
+        self.servicios_fondo = 0.0   # Pedidos del ejecutor (hilos de trabajo)
+        self.dialogos = 0.0          # Diálogos modales esperando al usuario
+        self.pendientes = 1          # El propio manejador + pedidos en curso
+
+class PerfiladorUI:
+    """Estado del perfilador (una instancia por proceso: PERFILADOR)"""
+    
+    def __init__(self):
+        self.activo = False
+        self._lock = threading.Lock()
+        self._estadisticas: Dict[str, EstadisticaManejador] = {}
+        self._dialogos_originales: Dict[str, Callable] = {}
+    
+    def activar(self):
+        """Empieza a medir (también mide cuánto esperan los diálogos al usuario)"""
+        from tkinter import messagebox
+        if not self._dialogos_originales:
+            for nombre in _DIALOGOS:
+                original = getattr(messagebox, nombre)
+                self._dialogos_originales[nombre] = original
+                setattr(messagebox, nombre, self._medir_dialogo(original))
+        self.activo = True
+    
+    def desactivar(self):
+        from tkinter import messagebox
+        for nombre, original in self._dialogos_originales.items():
+            setattr(messagebox, nombre, original)
+        self._dialogos_originales.clear()
+        self.activo = False
+    
+    def reiniciar(self):
+        with self._lock:
+            self._estadisticas.clear()
+    
+    # ------------------------------------------------------------------
+    # Decorador de manejadores
+    # ------------------------------------------------------------------
+    
+    def manejador(self, funcion: Callable) -> Callable:
+        """Decorador para los manejadores de eventos (botones, binds, menús)"""
+        nombre = funcion.__qualname__
+        
+        @functools.wraps(funcion)
+        def envuelta(*args, **kwargs):
+            # Un manejador llamado desde otro es parte de la misma traza
+            if not self.activo or _TRAZA.get() is not None:
+                return funcion(*args, **kwargs)
+            
+            traza = Traza(nombre)
+            token = _TRAZA.set(traza)
+            inicio = time.perf_counter()
+            try:
+                with INSTRUMENTACION.accion(nombre):
+                    return funcion(*args, **kwargs)
+            finally:
+                traza.tk += time.perf_counter() - inicio
+                _TRAZA.reset(token)
+                self.cerrar(traza)
+        
+        return envuelta
+    
+    # ------------------------------------------------------------------
+    # Enganches para el ejecutor y los servicios
+    # ------------------------------------------------------------------
+    
+    def traza_actual(self) -> Optional[Traza]:
+        return _TRAZA.get() if self.activo else None
+    
+    def abrir(self, traza: Traza):
+        """Un pedido más en curso para esta traza"""
+        with self._lock:
+            traza.pendientes += 1
+    
+    def cerrar(self, traza: Traza):
+        """Terminó una parte de la traza; con la última se registra"""
+        with self._lock:
+            traza.pendientes -= 1
+            if traza.pendientes > 0:
+                return
+            respuesta = time.perf_counter() - traza.inicio - traza.dialogos
+            servicios = traza.servicios_tk + traza.servicios_fondo
+            widgets = max(traza.tk - traza.servicios_tk - traza.dialogos, 0.0)
+            espera = max(respuesta - servicios - widgets, 0.0)
+            
+            estadistica = self._estadisticas.get(traza.nombre)
+            if estadistica is None:
+                estadistica = self._estadisticas[traza.nombre] = EstadisticaManejador(traza.nombre)
+            estadistica.respuesta.agregar(respuesta * 1000)
+            estadistica.servicios.agregar(servicios * 1000)
+            estadistica.widgets.agregar(widgets * 1000)
+            estadistica.espera.agregar(espera * 1000)
+    
+    def en_fondo(self, traza: Traza, funcion: Callable) -> Callable:
+        """Envuelve una función del ejecutor: su tiempo cuenta como servicios"""
+        @functools.wraps(funcion)
+        def envuelta(*args, **kwargs):
+            token = _EN_SERVICIO.set(True)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                duracion = time.perf_counter() - inicio
+                # Corre en los hilos de trabajo: varios pedidos de la traza pueden terminar a la vez
+                with self._lock:
+                    traza.servicios_fondo += duracion
+                _EN_SERVICIO.reset(token)
+        return envuelta
+    
+    def en_tk(self, traza: Traza, callback: Optional[Callable]) -> Optional[Callable]:
+        """Envuelve un callback del ejecutor: corre en el hilo de Tk dentro de la traza"""
+        if callback is None:
+            return None
+        # Contexto del manejador (traza y acción de la BD) para correr el callback
+        contexto = contextvars.copy_context()
+        
+        def medir(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                traza.tk += time.perf_counter() - inicio
+        
+        @functools.wraps(callback)
+        def envuelta(*args, **kwargs):
+            return contexto.run(medir, *args, **kwargs)
+        return envuelta
+    
+    def servicio(self, objeto):
+        """
+        Devuelve el servicio envuelto para medir las llamadas hechas desde el
+        hilo de Tk (o el mismo objeto si el perfilador está desactivado)
+        """
+        return _ServicioMedido(objeto) if self.activo else objeto
+    
+    def _medir_dialogo(self, original: Callable) -> Callable:
+        @functools.wraps(original)
+        def envuelta(*args, **kwargs):
+            traza = _TRAZA.get()
+            inicio = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                if traza is not None:
+                    traza.dialogos += time.perf_counter() - inicio
+        return envuelta
+    
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    
+    def estadisticas(self) -> Dict[str, EstadisticaManejador]:
+        with self._lock:
+            return dict(self._estadisticas)
+    
+    def reporte(self, histogramas: bool = True) -> str:
+        """Resumen por manejador (del más lento al más rápido, por p95)"""
+        lineas = ["Manejadores de la interfaz:"]
+        estadisticas = sorted(self.estadisticas().values(), key=lambda e: -e.respuesta.percentil(0.95))
+        for estadistica in estadisticas:
+            lineas.append(f"  {estadistica}")
+            if histogramas:
+                lineas.extend(f"      {barra}" for barra in estadistica.respuesta.barras())
+        return "\n".join(lineas)
+
+PERFILADOR = PerfiladorUI()
+
+class _ServicioMedido:
+    """Envoltura de un servicio que suma a la traza el tiempo de cada llamada"""
+    
+    def __init__(self, servicio):
+        self._servicio = servicio
+    
+    def __getattr__(self, nombre: str):
+        atributo = getattr(self._servicio, nombre)
+        if not callable(atributo):
+            return atributo
+        
+        @functools.wraps(atributo)
+        def envuelta(*args, **kwargs):
+            traza = _TRAZA.get()
+            # En segundo plano ya lo cuenta el ejecutor; anidadas, la externa
+            if traza is None or _EN_SERVICIO.get():
+                return atributo(*args, **kwargs)
+            token = _EN_SERVICIO.set(True)
+            inicio = time.perf_counter()
+            try:
+                return atributo(*args, **kwargs)
+            finally:
+                traza.servicios_tk += time.perf_counter() - inicio
+                _EN_SERVICIO.reset(token)
+        return envuelta
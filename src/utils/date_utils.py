@@ -1,13 +1,26 @@
 from datetime import date, timedelta
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import locale
+import re
 
 class DateUtils:
     """Utilidades para manejo de fechas"""
     
+    _locale_configurado = False
+    
+    MESES = ["", "enero", "febrero", "marzo", "abril", "mayo", "junio",
+             "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
+    
+    # '6-12 enero 2025' o '27 enero - 2 febrero 2025' (ver Semana.texto_completo)
+    _PATRON_SEMANA = re.compile(r"^\s*(\d{1,2})(?:\s+(\w+))?\s*-\s*(\d{1,2})\s+(\w+)\s+(\d{4})")
+    
     @staticmethod
     def configurar_locale_espanol():
-        """Configura el locale en español"""
+        """Configura el locale en español (solo la primera vez)"""
+        if DateUtils._locale_configurado:
+            return
+        DateUtils._locale_configurado = True
+        
         try:
             locale.setlocale(locale.LC_TIME, 'es_ES.utf8')
         except:
@@ -28,6 +41,17 @@ class DateUtils:
         dias_desde_lunes = fecha.weekday()  # 0=Lunes, 6=Domingo
         return fecha - timedelta(days=dias_desde_lunes)
     
+    @staticmethod
+    def limite_semanas_desde(fecha: date) -> date:
+        """
+        Menor lunes posible de una semana que llega a una fecha
+        Args:
+            fecha: Primer día de un rango
+        Returns:
+            Seis días antes de la fecha (sin bajar de date.min)
+        """
+        return fecha - min(timedelta(days=6), fecha - date.min)
+    
     @staticmethod
     def obtener_dia_semana(fecha: date, dia_target: int) -> date:
         """
@@ -72,4 +96,23 @@ class DateUtils:
         """
         lunes1 = DateUtils.buscar_lunes(fecha1)
         lunes2 = DateUtils.buscar_lunes(fecha2)
-        return lunes1 == lunes2
\ No newline at end of file
+        return lunes1 == lunes2
+    
+    @staticmethod
+    def parsear_semana(texto: str) -> Optional[date]:
+        """
+        Obtiene el lunes a partir del texto de una semana
+        Args:
+            texto: Texto con el formato de Semana.texto_completo
+        Returns:
+            Fecha del lunes, o None si el texto no tiene ese formato
+        """
+        coincidencia = DateUtils._PATRON_SEMANA.match(texto.lower())
+        if not coincidencia:
+            return None
+        dia, mes_inicio, _, mes_fin, anio = coincidencia.groups()
+        try:
+            mes = DateUtils.MESES.index(mes_inicio or mes_fin)
+            return date(int(anio), mes, int(dia))
+        except ValueError:
+            return None
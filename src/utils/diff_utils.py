@@ -0,0 +1,50 @@
+from difflib import SequenceMatcher
+from typing import Hashable, List, Sequence, Tuple
+
+# Operaciones: ("borrar", indice, None) | ("insertar", indice, texto) | ("actualizar", indice, texto)
+Operacion = Tuple[str, int, object]
+
+class DiffUtils:
+    """Utilidades para calcular diferencias entre listas"""
+    
+    @staticmethod
+    def operaciones_lista(anteriores: Sequence[Tuple[Hashable, str]],
+                          nuevos: Sequence[Tuple[Hashable, str]]) -> List[Operacion]:
+        """
+        Calcula las operaciones mínimas para pasar de una lista a otra
+        Args:
+            anteriores: Filas actuales como (clave, texto)
+            nuevos: Filas deseadas como (clave, texto)
+        Returns:
+            Lista de operaciones en orden de aplicación. Se generan de atrás
+            hacia adelante, así cada índice sigue siendo válido al aplicarlas
+            una tras otra sobre la lista anterior.
+        """
+        claves_ant = [clave for clave, _ in anteriores]
+        claves_nue = [clave for clave, _ in nuevos]
+        
+        # Caso habitual: misma secuencia de claves, solo cambian textos
+        if claves_ant == claves_nue:
+            return [
+                ("actualizar", i, nuevos[i][1])
+                for i in range(len(nuevos) - 1, -1, -1)
+                if anteriores[i][1] != nuevos[i][1]
+            ]
+        
+        matcher = SequenceMatcher(None, claves_ant, claves_nue, autojunk=False)
+        operaciones: List[Operacion] = []
+        
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == "equal":
+                for k in range(i2 - i1 - 1, -1, -1):
+                    if anteriores[i1 + k][1] != nuevos[j1 + k][1]:
+                        operaciones.append(("actualizar", i1 + k, nuevos[j1 + k][1]))
+                continue
+            
+            # delete / insert / replace
+            for i in range(i2 - 1, i1 - 1, -1):
+                operaciones.append(("borrar", i, None))
+            for j in range(j2 - 1, j1 - 1, -1):
+                operaciones.append(("insertar", i1, nuevos[j][1]))
+        
+        return operaciones
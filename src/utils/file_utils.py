@@ -0,0 +1,133 @@
+import csv
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+class FileUtils:
+    """Utilidades para lectura de archivos"""
+    
+    @staticmethod
+    def en_lotes(elementos: Iterable[T], tamano: int) -> Iterator[List[T]]:
+        """
+        Agrupa un iterable en listas de hasta 'tamano' elementos
+        Solo mantiene en memoria un lote a la vez
+        """
+        iterador = iter(elementos)
+        while True:
+            lote = list(islice(iterador, tamano))
+            if not lote:
+                return
+            yield lote
+    
+    @staticmethod
+    def leer_filas(ruta: str) -> Iterator[List[str]]:
+        """
+        Lee un archivo CSV o XLSX fila por fila
+        Args:
+            ruta: Archivo .csv o .xlsx (se lee la primera hoja)
+        Returns:
+            Iterador de filas (listas de textos)
+        """
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension == ".csv":
+            return FileUtils._leer_csv(ruta)
+        if extension == ".xlsx":
+            return FileUtils._leer_xlsx(ruta)
+        raise ValueError(f"Formato de archivo no soportado: '{extension}' (use .csv o .xlsx)")
+    
+    @staticmethod
+    def _leer_csv(ruta: str) -> Iterator[List[str]]:
+        """Lee un CSV detectando el separador (coma o punto y coma)"""
+        with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+            muestra = archivo.read(4096)
+            archivo.seek(0)
+            try:
+                dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+            except csv.Error:
+                dialecto = csv.excel
+            for fila in csv.reader(archivo, dialecto):
+                yield [valor.strip() for valor in fila]
+    
+    @staticmethod
+    def _leer_xlsx(ruta: str) -> Iterator[List[str]]:
+        """Lee la primera hoja de un XLSX con iterparse (sin cargar la hoja entera)"""
+        with zipfile.ZipFile(ruta) as libro:
+            compartidas = FileUtils._cadenas_compartidas(libro)
+            nombre_hoja = FileUtils._primera_hoja(libro)
+            
+            with libro.open(nombre_hoja) as hoja:
+                datos = None
+                for evento, elemento in ET.iterparse(hoja, events=("start", "end")):
+                    if evento == "start":
+                        if elemento.tag == f"{_NS}sheetData":
+                            datos = elemento
+                        continue
+                    if elemento.tag != f"{_NS}row":
+                        continue
+                    
+                    fila: List[str] = []
+                    for celda in elemento.iter(f"{_NS}c"):
+                        columna = FileUtils._indice_columna(celda.get("r", ""))
+                        if columna is not None:
+                            fila.extend([""] * (columna - len(fila)))
+                        fila.append(FileUtils._valor_celda(celda, compartidas).strip())
+                    # Descartar las filas ya leídas para no acumularlas en memoria
+                    if datos is not None:
+                        datos.clear()
+                    yield fila
+    
+    @staticmethod
+    def _cadenas_compartidas(libro: zipfile.ZipFile) -> List[str]:
+        """Carga la tabla de cadenas compartidas (si existe)"""
+        if "xl/sharedStrings.xml" not in libro.namelist():
+            return []
+        cadenas = []
+        with libro.open("xl/sharedStrings.xml") as archivo:
+            for _, elemento in ET.iterparse(archivo, events=("end",)):
+                if elemento.tag == f"{_NS}si":
+                    cadenas.append("".join(t.text or "" for t in elemento.iter(f"{_NS}t")))
+                    elemento.clear()
+        return cadenas
+    
+    @staticmethod
+    def _primera_hoja(libro: zipfile.ZipFile) -> str:
+        """Devuelve la ruta interna de la primera hoja"""
+        hojas = sorted(n for n in libro.namelist() if n.startswith("xl/worksheets/sheet"))
+        if not hojas:
+            raise ValueError("El archivo XLSX no tiene hojas")
+        return "xl/worksheets/sheet1.xml" if "xl/worksheets/sheet1.xml" in hojas else hojas[0]
+    
+    @staticmethod
+    def _indice_columna(referencia: str):
+        """Convierte 'C7' en 2 (índice 0-based de la columna)"""
+        letras = re.match(r"[A-Z]+", referencia)
+        if not letras:
+            return None
+        indice = 0
+        for letra in letras.group(0):
+            indice = indice * 26 + (ord(letra) - 64)
+        return indice - 1
+    
+    @staticmethod
+    def _valor_celda(celda, compartidas: List[str]) -> str:
+        """Obtiene el texto de una celda según su tipo"""
+        tipo = celda.get("t")
+        if tipo == "inlineStr":
+            return "".join(t.text or "" for t in celda.iter(f"{_NS}t"))
+        
+        valor = celda.find(f"{_NS}v")
+        if valor is None or valor.text is None:
+            return ""
+        if tipo == "s":
+            return compartidas[int(valor.text)]
+        if tipo is None and valor.text.endswith(".0"):
+            # Números enteros guardados como float (p.ej. número de grupo)
+            return valor.text[:-2]
+        return valor.text
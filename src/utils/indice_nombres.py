@@ -0,0 +1,71 @@
+import unicodedata
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+class IndiceNombres:
+    """
+    Índice en memoria para buscar nombres mientras se escribe
+    Combina un índice de prefijos por palabra (búsqueda directa) con una
+    búsqueda por subcadena sobre los textos ya normalizados.
+    """
+    
+    def __init__(self, entradas: Iterable[Tuple[Hashable, str]]):
+        """
+        Args:
+            entradas: Pares (clave, texto), p.ej. (persona.id, "Gomez Yanina")
+        """
+        self._orden: List[Hashable] = []
+        self._normalizados: Dict[Hashable, str] = {}
+        self._prefijos: Dict[str, Set[Hashable]] = {}
+        
+        for clave, texto in entradas:
+            normalizado = self.normalizar(texto)
+            self._orden.append(clave)
+            self._normalizados[clave] = normalizado
+            for palabra in normalizado.split():
+                for i in range(1, len(palabra) + 1):
+                    self._prefijos.setdefault(palabra[:i], set()).add(clave)
+    
+    @staticmethod
+    def normalizar(texto: str) -> str:
+        """Pasa a minúsculas y quita acentos ("Fátima" -> "fatima")"""
+        descompuesto = unicodedata.normalize("NFKD", texto.lower())
+        return "".join(c for c in descompuesto if not unicodedata.combining(c))
+    
+    def buscar(self, texto: str) -> List[Hashable]:
+        """
+        Busca las claves cuyo texto coincide con la consulta
+        Returns: Primero las coincidencias por prefijo, luego por subcadena
+        """
+        por_prefijo, por_subcadena = self.buscar_agrupado(texto)
+        return por_prefijo + por_subcadena
+    
+    def buscar_agrupado(self, texto: str) -> Tuple[List[Hashable], List[Hashable]]:
+        """
+        Busca las claves cuyo texto coincide con la consulta
+        Returns:
+            (por_prefijo, por_subcadena): las que tienen palabras que empiezan
+            con cada término de la consulta, y las que solo la contienen.
+            Cada lista respeta el orden de carga.
+        """
+        consulta = self.normalizar(texto).strip()
+        if not consulta:
+            return list(self._orden), []
+        
+        # Coincidencias por prefijo: intersección de los términos
+        coincidencias = None
+        for termino in consulta.split():
+            claves = self._prefijos.get(termino, set())
+            coincidencias = claves if coincidencias is None else coincidencias & claves
+            if not coincidencias:
+                break
+        coincidencias = coincidencias or set()
+        
+        por_prefijo = [c for c in self._orden if c in coincidencias]
+        por_subcadena = [
+            c for c in self._orden
+            if c not in coincidencias and consulta in self._normalizados[c]
+        ]
+        return por_prefijo, por_subcadena
+    
+    def __len__(self) -> int:
+        return len(self._orden)
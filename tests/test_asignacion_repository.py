@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.database.repositories.base import ConflictoVersion
+from src.database.repositories.historial_repository import HistorialRepository
+from src.services.historial_service import HistorialService
+
+class RevisionVencidaTest(unittest.TestCase):
+    """actualizar con una revisión que ya no es la de la fila"""
+    
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "asignaciones.db")
+        self.repo = AsignacionRepository(self.db_path)
+        self.repo.guardar_lote([("6-12 enero 2025", "a / b", "c / d", "e", "f", "g", "h", "Jueves 9")])
+    
+    def test_lanza_conflicto_con_la_fila_actual(self):
+        self.assertEqual(self.repo.actualizar(1, "vigilante_final", "primera", revision=0), 1)
+        with self.assertRaises(ConflictoVersion) as contexto:
+            self.repo.actualizar(1, "vigilante_final", "segunda", revision=0)
+        
+        conflicto = contexto.exception
+        self.assertEqual((conflicto.tabla, conflicto.fila_id), ("asignaciones", 1))
+        self.assertEqual(conflicto.actual[0], 1)
+        self.assertEqual(conflicto.actual[1][6], "primera")
+        self.assertEqual(self.repo.obtener_fila(1), conflicto.actual)
+    
+    def test_el_conflicto_no_queda_en_el_historial(self):
+        historial = HistorialService(self.repo, HistorialRepository(self.db_path))
+        self.repo.actualizar(1, "vigilante_final", "de otro")
+        with self.assertRaises(ConflictoVersion):
+            historial.editar(1, "vigilante_final", "h", "mía", revision=0)
+        
+        self.assertFalse(historial.puede_deshacer)
+        self.assertEqual(HistorialRepository(self.db_path).cargar(10), ([], []))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from src.database.escritor import EscritorUnico
+
+class LoteConUnPedidoFallidoTest(unittest.TestCase):
+    """Un pedido que falla dentro de un lote no arrastra a los demás"""
+    
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "escritor.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE valores (valor TEXT NOT NULL)")
+        conn.close()
+        self.escritor = EscritorUnico(self.db_path)
+        self.addCleanup(self.escritor.cerrar)
+    
+    def insertar(self, valor):
+        return lambda conn: conn.execute("INSERT INTO valores VALUES (?)", (valor,)).lastrowid
+    
+    def test_savepoint_deshace_solo_el_pedido_fallido(self):
+        # Mientras el primero bloquea el hilo, los siguientes se juntan en un solo lote
+        empezo, liberar = threading.Event(), threading.Event()
+        bloqueo = self.escritor.enviar(lambda conn: (empezo.set(), liberar.wait(5)))
+        self.assertTrue(empezo.wait(5))
+        
+        def fallar(conn):
+            conn.execute("INSERT INTO valores VALUES ('a medias')")
+            raise ValueError("falla a propósito")
+        
+        antes = self.escritor.enviar(self.insertar("antes"))
+        fallido = self.escritor.enviar(fallar)
+        despues = self.escritor.enviar(self.insertar("después"))
+        liberar.set()
+        
+        bloqueo.result(5)
+        self.assertIsNotNone(antes.result(5))
+        with self.assertRaises(ValueError):
+            fallido.result(5)
+        self.assertIsNotNone(despues.result(5))
+        # El bloqueo en una transacción y los otros tres en otra
+        self.assertEqual(self.escritor.confirmaciones, 2)
+        self.assertEqual(self.escritor.escrituras, 4)
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            valores = [fila[0] for fila in conn.execute("SELECT valor FROM valores ORDER BY rowid")]
+        finally:
+            conn.close()
+        self.assertEqual(valores, ["antes", "después"])
+    
+    def test_sigue_escribiendo_despues_del_fallo(self):
+        with self.assertRaises(ValueError):
+            self.escritor.escribir(lambda conn: int("no es un número"))
+        self.assertEqual(self.escritor.escribir(self.insertar("x")), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from src.database.migraciones import Migrador, ULTIMA_VERSION
+
+# La BD que se distribuye con el repositorio (esquema anterior a las migraciones)
+BD_BASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "asignaciones.db")
+
+class MigracionDeLaBDBaseTest(unittest.TestCase):
+    """Una copia de asignaciones.db (user_version 0) llega a la última versión"""
+    
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "asignaciones.db")
+        shutil.copyfile(BD_BASE, self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany(
+                "INSERT INTO personas (nombre, apellido, tipo, activo, grupo) VALUES (?, ?, ?, ?, ?)",
+                [("Ana", "Pérez", "vigilante", 1, 2), ("Luis", "Gómez", "acomodador", 0, None)]
+            )
+            conn.execute(
+                "INSERT INTO asignaciones (semana, acomodadores_1hora, acomodadores_2hora, acomodador_final,"
+                " vigilante_1hora, vigilante_2hora, vigilante_final, dia_reunion)"
+                " VALUES ('6-12 enero 2025', 'A / B', 'C / D', 'E', 'Pérez Ana', 'F', 'G', 'Jueves 9')"
+            )
+        conn.close()
+    
+    def test_migra_hasta_la_version_9(self):
+        self.assertEqual(ULTIMA_VERSION, 9)
+        self.assertEqual(Migrador(self.db_path, tamano_lote=1).migrar(), 9)
+        self.assertEqual(Migrador(self.db_path).version_actual(), 9)
+        self.assertEqual(Migrador(self.db_path).migrar(), 0)
+    
+    def test_completa_los_datos_existentes(self):
+        Migrador(self.db_path, tamano_lote=1).migrar()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(conn.execute("SELECT semana_lunes FROM asignaciones").fetchone(), ("2025-01-06",))
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM turnos").fetchone(), (8,))
+            # Solo la persona activa tiene un período abierto, con su grupo
+            self.assertEqual(
+                conn.execute("SELECT persona_id, hasta, grupo FROM membresias").fetchall(), [(1, None, 2)]
+            )
+            # Los triggers de UPDATE del registro de cambios solo miran las columnas sincronizadas
+            sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'asignaciones_actualizar_cambios'"
+            ).fetchone()[0]
+            self.assertIn("UPDATE OF", sql)
+            conn.execute("UPDATE asignaciones SET semana_lunes = semana_lunes")
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM cambios").fetchone(), (0,))
+        finally:
+            conn.close()
+
+if __name__ == "__main__":
+    unittest.main()
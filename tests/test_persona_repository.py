@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.database.repositories.persona_repository import PersonaRepository
+from src.models.persona import Persona, TipoPersona
+
+class PlantelEnUnaFechaTest(unittest.TestCase):
+    """obtener_todos(as_of=...) antes y después de desactivar o cambiar de grupo"""
+    
+    ANTES = date(2024, 6, 1)
+    
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "asignaciones.db")
+        self.repo = PersonaRepository(self.db_path)
+        self.ana = self.repo.agregar(Persona(None, "Ana", "Pérez", TipoPersona.VIGILANTE, grupo=1))
+        self.eva = self.repo.agregar(Persona(None, "Eva", "Gómez", TipoPersona.VIGILANTE, grupo=2))
+        # Los períodos se abren hoy: se corren al pasado para tener un "antes"
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("UPDATE membresias SET desde = '2024-01-01'")
+        conn.close()
+    
+    def plantel(self, as_of):
+        return {p.id: p.grupo for p in self.repo.obtener_todos(TipoPersona.VIGILANTE, as_of=as_of)}
+    
+    def test_desactivar(self):
+        self.repo.desactivar(self.ana)
+        
+        self.assertEqual(self.plantel(self.ANTES), {self.ana: 1, self.eva: 2})
+        self.assertEqual(self.plantel(date.today()), {self.eva: 2})
+        self.assertEqual(self.plantel(None), {self.eva: 2})
+        inactivos = self.repo.obtener_todos(TipoPersona.VIGILANTE, incluir_inactivos=True, as_of=date.today())
+        self.assertIn(self.ana, [p.id for p in inactivos if not p.activo])
+    
+    def test_cambiar_grupo(self):
+        self.repo.cambiar_grupo(self.ana, 5)
+        
+        self.assertEqual(self.plantel(self.ANTES), {self.ana: 1, self.eva: 2})
+        self.assertEqual(self.plantel(date.today()), {self.ana: 5, self.eva: 2})
+        self.assertEqual(
+            [(m.desde, m.hasta, m.grupo) for m in self.repo.obtener_membresias(self.ana)],
+            [(date(2024, 1, 1), date.today(), 1), (date.today(), None, 5)]
+        )
+    
+    def test_antes_de_empezar(self):
+        self.assertEqual(self.plantel(date(2023, 12, 31)), {})
+        self.assertEqual(self.plantel(date.today() + timedelta(days=1)), {self.ana: 1, self.eva: 2})
+
+if __name__ == "__main__":
+    unittest.main()
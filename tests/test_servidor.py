@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from src.api.servidor import ServidorConsulta
+from src.database.repositories.asignacion_repository import AsignacionRepository
+from src.services.asignacion_service import AsignacionService
+
+class RangoDeAsignacionesTest(unittest.TestCase):
+    """Pedidos a /asignaciones con uno solo de los límites del rango"""
+    
+    def setUp(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "asignaciones.db")
+        repo = AsignacionRepository(db_path)
+        repo.guardar_lote([
+            (semana, "a", "b", "c", "d", "e", "f", "Jueves")
+            for semana in ("6-12 enero 2025", "13-19 enero 2025", "20-26 enero 2025")
+        ])
+        self.servidor = ServidorConsulta(AsignacionService(repo), db_path=db_path)
+    
+    def pedir(self, destino):
+        estado, cuerpo, _ = asyncio.run(self.servidor.procesar("GET", destino, {}))
+        return estado, json.loads(cuerpo)
+    
+    def test_solo_desde(self):
+        estado, filas = self.pedir("/asignaciones?desde=2025-01-15")
+        self.assertEqual(estado, 200)
+        self.assertEqual([fila["semana"] for fila in filas], ["13-19 enero 2025", "20-26 enero 2025"])
+    
+    def test_solo_hasta(self):
+        estado, filas = self.pedir("/asignaciones?hasta=2025-01-13")
+        self.assertEqual(estado, 200)
+        self.assertEqual([fila["semana"] for fila in filas], ["6-12 enero 2025", "13-19 enero 2025"])
+    
+    def test_desde_en_el_minimo(self):
+        estado, filas = self.pedir("/asignaciones?desde=0001-01-01")
+        self.assertEqual(estado, 200)
+        self.assertEqual(len(filas), 3)
+
+class TurnosTest(unittest.TestCase):
+    """/turnos lee la tabla turnos sin distinguir mayúsculas ni acentos"""
+    
+    def setUp(self):
+        db_path = os.path.join(tempfile.mkdtemp(), "asignaciones.db")
+        repo = AsignacionRepository(db_path)
+        repo.guardar_lote([
+            ("6-12 enero 2025", "Pérez Ana / Gómez Luis", "x", "y", "z", "w", "v", "Jueves"),
+            ("13-19 enero 2025", "x / y", "z", "perez ana", "w", "v", "Perez Ana", "Domingo"),
+        ])
+        self.servidor = ServidorConsulta(AsignacionService(repo), db_path=db_path)
+    
+    def pedir(self, destino):
+        estado, cuerpo, _ = asyncio.run(self.servidor.procesar("GET", destino, {}))
+        return estado, json.loads(cuerpo)
+    
+    def test_turnos_desde(self):
+        estado, turnos = self.pedir("/turnos?persona=PEREZ%20ANA&desde=2025-01-01")
+        self.assertEqual(estado, 200)
+        self.assertEqual(
+            [(turno["semana"], turno["dia_reunion"]) for turno in turnos],
+            [("6-12 enero 2025", "Jueves"), ("13-19 enero 2025", "Domingo"), ("13-19 enero 2025", "Domingo")]
+        )
+        self.assertEqual(turnos[1]["puesto"], "Acomodador final")
+    
+    def test_omite_semanas_anteriores(self):
+        _, turnos = self.pedir("/turnos?persona=Perez%20Ana&desde=2025-01-13")
+        self.assertEqual(len(turnos), 2)
+
+if __name__ == "__main__":
+    unittest.main()
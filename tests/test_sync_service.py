@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from src.api.central import CentralSync
+from src.services.sync_service import ResultadoSync, SyncService
+from src.database.repositories.asignacion_repository import AsignacionRepository
+
+class RecepcionPorLotesTest(unittest.TestCase):
+    """Una fila que cambia en la central durante una recepción de varios lotes"""
+    
+    def setUp(self):
+        directorio = tempfile.mkdtemp()
+        self.central = CentralSync(os.path.join(directorio, "central.db"))
+        db_a, db_b = os.path.join(directorio, "a.db"), os.path.join(directorio, "b.db")
+        self.repo_a, self.repo_b = AsignacionRepository(db_a), AsignacionRepository(db_b)
+        self.repo_a.guardar_lote([
+            (f"Semana del {dia:02d}/01/2024", "a", "b", "c", "d", "e", "v1", "Jueves")
+            for dia in (1, 8, 15)
+        ])
+        # Lotes de una fila: cada fila recibida es una vuelta del bucle
+        self.sync_a = SyncService(self.central, db_a, tamano_lote=1)
+        self.sync_b = SyncService(self.central, db_b, tamano_lote=1)
+        self.sync_a.sincronizar()
+        self.sync_b.sincronizar()
+    
+    def test_no_se_pierde_la_version_nueva(self):
+        self.repo_a.actualizar(1, "vigilante_final", "v2")
+        self.repo_a.actualizar(2, "vigilante_final", "v2")
+        self.sync_a.sincronizar()
+        
+        recibir = self.central.recibir
+        llamadas = []
+        
+        def recibir_con_edicion(version, limite):
+            # Después del primer lote (que ya aplicó la fila 1), A vuelve a editarla
+            llamadas.append(version)
+            if len(llamadas) == 2:
+                self.repo_a.actualizar(1, "vigilante_final", "EDITADO")
+                self.sync_a.sincronizar()
+            return recibir(version, limite)
+        
+        self.central.recibir = recibir_con_edicion
+        self.sync_b.sincronizar()
+        self.central.recibir = recibir
+        self.sync_b.sincronizar()
+        
+        self.assertEqual(
+            [fila[6] for fila in self.repo_b.iterar_todas()],
+            [fila[6] for fila in self.repo_a.iterar_todas()]
+        )
+        self.assertEqual(self.repo_b.obtener_fila(1)[1][6], "EDITADO")
+    
+    def test_no_pisa_una_edicion_local_sin_enviar(self):
+        self.repo_a.actualizar(1, "vigilante_final", "central")
+        self.sync_a.sincronizar()
+        self.repo_b.actualizar(1, "vigilante_final", "local")
+        
+        self.sync_b._recibir(ResultadoSync())
+        self.assertEqual(self.repo_b.obtener_fila(1)[1][6], "local")
+
+if __name__ == "__main__":
+    unittest.main()